@@ -53,6 +53,57 @@ function printMetric(name, current, baseline, unit = '') {
   console.log(`  ${name.padEnd(30)} ${String(current).padStart(10)} ${unit.padEnd(8)} ${status.padEnd(15)} (${change} / ${percent}%)`);
 }
 
+// Counts that identify a scenario row rather than measure it
+const SCENARIO_SIZE_KEYS = ['tasks', 'items'];
+
+function flattenScenarios(scenarios, prefix = '') {
+  const metrics = {};
+  for (const [key, value] of Object.entries(scenarios || {})) {
+    if (Array.isArray(value)) {
+      // Rows of a scaling run, named by their size
+      value.forEach((row, index) => {
+        Object.assign(metrics, flattenScenarios(row, `${prefix}${key}[${row.tasks ?? index}].`));
+      });
+    } else if (value && typeof value === 'object') {
+      Object.assign(metrics, flattenScenarios(value, `${prefix}${key}.`));
+    } else if (typeof value === 'number' && !SCENARIO_SIZE_KEYS.includes(key)) {
+      metrics[`${prefix}${key}`] = value;
+    }
+  }
+  return metrics;
+}
+
+function scenarioChanges(current, baseline) {
+  // Written by the Python SDK's benchmarks/load.py
+  const curr = flattenScenarios(current.scenarios);
+  const base = flattenScenarios(baseline.scenario_results);
+
+  return Object.keys(curr)
+    .filter(name => name in base)
+    .map(name => {
+      const higherIsBetter = name.endsWith('per_second');
+      const unit = name.endsWith('_mb') ? 'MB' : higherIsBetter ? 'tasks/sec' : 's';
+      const percent = base[name] !== 0 ? ((curr[name] - base[name]) / base[name]) * 100 : 0;
+      // Positive is better, whichever way the metric points
+      const gain = higherIsBetter ? percent : -percent;
+      return { name, current: curr[name], baseline: base[name], unit, percent, gain };
+    });
+}
+
+function printScenarioMetric({ name, current, baseline, unit, percent, gain }) {
+  let status = colorize('→', 'dim');
+  if (gain > 5) {
+    status = colorize('↓', 'green') + ' IMPROVED';
+  } else if (gain < -5) {
+    status = colorize('↑', 'red') + ' DEGRADED';
+  }
+
+  const diff = +(current - baseline).toFixed(2);
+  const change = diff >= 0 ? `+${diff}` : `${diff}`;
+
+  console.log(`  ${name.padEnd(45)} ${String(current).padStart(10)} ${unit.padEnd(9)} ${status.padEnd(15)} (${change} / ${percent.toFixed(1)}%)`);
+}
+
 function loadJSON(filePath) {
   try {
     const data = fs.readFileSync(filePath, 'utf-8');
@@ -124,6 +175,12 @@ function compareResults(current, baseline) {
       printMetric('CPU Usage', current.cpu, 80, '%');
     }
   }
+
+  const scenarios = scenarioChanges(current, baseline);
+  if (scenarios.length > 0) {
+    printHeader('SDK Scenarios');
+    scenarios.forEach(printScenarioMetric);
+  }
 }
 
 function generateSummary(current, baseline) {
@@ -173,6 +230,16 @@ function generateSummary(current, baseline) {
     summary.degradations.push(`Throughput degraded by ${(baselineThroughput - currentThroughput).toFixed(0)} req/sec`);
   }
 
+  // Check SDK scenarios against the baseline run
+  for (const { name, percent, gain } of scenarioChanges(current, baseline)) {
+    const change = `${Math.abs(percent).toFixed(1)}%`;
+    if (gain < -10) {
+      summary.degradations.push(`${name} degraded by ${change}`);
+    } else if (gain > 10) {
+      summary.improvements.push(`${name} improved by ${change}`);
+    }
+  }
+
   return summary;
 }
 
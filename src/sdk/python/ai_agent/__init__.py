@@ -1,48 +1,160 @@
 """
 AI Agent Orchestrator SDK for Python
+
+Exports are imported on first access (PEP 562), so ``import ai_agent``
+doesn't pay for aiohttp and the client until they're used.
 """
 
-from .client import AgentClient
-from .errors import (
-    AgentClientError,
-    ValidationError,
-    AuthenticationError,
-    AuthorizationError,
-    NotFoundError,
-    TimeoutError,
-    RateLimitError,
-    ServerError,
-    NetworkError,
-    ConnectionError,
-)
-from .types import (
-    Agent,
-    AgentCreateParams,
-    Task,
-    TaskResult,
-    TaskError,
-    TaskSubmitParams,
-    AgentType,
-    AgentStatus,
-    TaskStatus,
-    TaskPriority,
-)
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+
+# Eager, the ``deadline`` submodule would otherwise shadow the function
+from .deadline import deadline
+
+if TYPE_CHECKING:
+    from .client import AgentClient
+    from .errors import (
+        AgentClientError,
+        ValidationError,
+        AuthenticationError,
+        AuthorizationError,
+        NotFoundError,
+        TimeoutError,
+        PoolTimeoutError,
+        OverloadedError,
+        CircuitOpenError,
+        DeadlineExceededError,
+        RateLimitError,
+        ServerError,
+        NetworkError,
+        ConnectionError,
+        StreamError,
+    )
+    from .pool import ConnectionPool, PoolConfig
+    from .polling import PollConfig
+    from .limiter import ConcurrencyLimiter, LimiterConfig
+    from .ratelimit import RateLimiter, RateLimitConfig
+    from .circuit import CircuitBreakers, CircuitBreakerConfig
+    from .histogram import LatencyHistogram
+    from .exporter import MetricsExporter
+    from .serializer import Serializer, get_serializer
+    from .cache import CacheConfig
+    from .hedging import HedgeConfig
+    from .balancer import BalancerConfig
+    from .compression import CompressionConfig
+    from .tracing import TraceHooks, RequestTrace, OpenTelemetryHooks
+    from .streaming import ResultBuffer
+    from .sync import SyncAgentClient
+    from .types import (
+        Agent,
+        AgentCreateParams,
+        Task,
+        TaskResult,
+        TaskError,
+        TaskSubmitParams,
+        AgentType,
+        AgentStatus,
+        TaskStatus,
+        TaskPriority,
+        RequestPriority,
+    )
+
+_EXPORTS: Dict[str, Tuple[str, ...]] = {
+    "client": ("AgentClient",),
+    "sync": ("SyncAgentClient",),
+    "errors": (
+        "AgentClientError",
+        "ValidationError",
+        "AuthenticationError",
+        "AuthorizationError",
+        "NotFoundError",
+        "TimeoutError",
+        "PoolTimeoutError",
+        "OverloadedError",
+        "CircuitOpenError",
+        "DeadlineExceededError",
+        "RateLimitError",
+        "ServerError",
+        "NetworkError",
+        "ConnectionError",
+        "StreamError",
+    ),
+    "pool": ("ConnectionPool", "PoolConfig"),
+    "polling": ("PollConfig",),
+    "limiter": ("ConcurrencyLimiter", "LimiterConfig"),
+    "ratelimit": ("RateLimiter", "RateLimitConfig"),
+    "circuit": ("CircuitBreakers", "CircuitBreakerConfig"),
+    "histogram": ("LatencyHistogram",),
+    "exporter": ("MetricsExporter",),
+    "serializer": ("Serializer", "get_serializer"),
+    "cache": ("CacheConfig",),
+    "hedging": ("HedgeConfig",),
+    "balancer": ("BalancerConfig",),
+    "compression": ("CompressionConfig",),
+    "tracing": ("TraceHooks", "RequestTrace", "OpenTelemetryHooks"),
+    "streaming": ("ResultBuffer",),
+    "types": (
+        "Agent",
+        "AgentCreateParams",
+        "Task",
+        "TaskResult",
+        "TaskError",
+        "TaskSubmitParams",
+        "AgentType",
+        "AgentStatus",
+        "TaskStatus",
+        "TaskPriority",
+        "RequestPriority",
+    ),
+}
+
+_LAZY: Dict[str, str] = {
+    name: module for module, names in _EXPORTS.items() for name in names
+}
 
 __version__ = "1.0.0"
 __author__ = "AI Agent Team"
 
 __all__ = [
     "AgentClient",
+    "SyncAgentClient",
+    "ConnectionPool",
+    "PoolConfig",
+    "PollConfig",
+    "ConcurrencyLimiter",
+    "LimiterConfig",
+    "RateLimiter",
+    "RateLimitConfig",
+    "CircuitBreakers",
+    "CircuitBreakerConfig",
+    "LatencyHistogram",
+    "MetricsExporter",
+    "Serializer",
+    "get_serializer",
+    "CacheConfig",
+    "HedgeConfig",
+    "BalancerConfig",
+    "CompressionConfig",
+    "TraceHooks",
+    "RequestTrace",
+    "OpenTelemetryHooks",
+    "ResultBuffer",
+    "deadline",
     "AgentClientError",
     "ValidationError",
     "AuthenticationError",
     "AuthorizationError",
     "NotFoundError",
     "TimeoutError",
+    "PoolTimeoutError",
+    "OverloadedError",
+    "CircuitOpenError",
+    "DeadlineExceededError",
     "RateLimitError",
     "ServerError",
     "NetworkError",
     "ConnectionError",
+    "StreamError",
     "Agent",
     "AgentCreateParams",
     "Task",
@@ -53,4 +165,19 @@ __all__ = [
     "AgentStatus",
     "TaskStatus",
     "TaskPriority",
+    "RequestPriority",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    # Cache it, later lookups don't come back here
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,309 @@
+"""
+Client-side load balancing across API replicas
+"""
+
+import asyncio
+import logging
+import math
+import random
+import time
+from typing import Callable, Dict, List, Literal, Optional, Sequence
+from urllib.parse import urlsplit
+
+from .circuit import is_circuit_failure
+from .histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+BalancerStrategy = Literal["round_robin", "least_outstanding", "p2c"]
+
+STRATEGIES = ("round_robin", "least_outstanding", "p2c")
+
+
+class BalancerConfig:
+    """Load balancer configuration"""
+
+    def __init__(
+        self,
+        strategy: BalancerStrategy = "p2c",
+        failure_threshold: int = 5,
+        ejection_duration: int = 30000,
+        max_ejection_duration: int = 300000,
+        max_ejected_fraction: float = 0.5,
+        latency_decay: int = 10000,
+        on_ejection: Optional[Callable[[str, bool], None]] = None,
+    ):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown balancer strategy {strategy!r}")
+        # round_robin, least_outstanding or p2c (power of two choices,
+        # weighing in-flight requests by latency)
+        self.strategy = strategy
+        # Consecutive failed attempts that eject a backend
+        self.failure_threshold = failure_threshold
+        # Time (ms) a backend stays ejected, multiplied by its ejections in a
+        # row and capped at max_ejection_duration
+        self.ejection_duration = ejection_duration
+        self.max_ejection_duration = max_ejection_duration
+        # Share of backends that may be ejected at once
+        self.max_ejected_fraction = max_ejected_fraction
+        # Time (ms) over which a backend's latency estimate fades, so ones
+        # that were slow get probed again
+        self.latency_decay = latency_decay
+        # Called with (backend URL, ejected) on ejection and re-admission
+        self.on_ejection = on_ejection
+
+
+class Backend:
+    """One API replica and its observed health"""
+
+    __slots__ = (
+        "url",
+        "host",
+        "outstanding",
+        "requests",
+        "failures",
+        "ejections",
+        "ejected_until",
+        "consecutive_failures",
+        "latency",
+        "latency_estimate",
+        "_estimated_at",
+        "_streak",
+        "_probation",
+    )
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.host = urlsplit(url).netloc
+        self.outstanding = 0
+        # Attempts that got an answer or failed the backend's health check
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+        # time.monotonic() at which an ejected backend is re-admitted
+        self.ejected_until = 0.0
+        self.consecutive_failures = 0
+        # Attempt latency (ms) samples and their peak-sensitive moving
+        # average (0 until the first answer), as of time.monotonic()
+        # _estimated_at
+        self.latency = LatencyHistogram()
+        self.latency_estimate = 0.0
+        self._estimated_at = 0.0
+        # Ejections since the backend last answered, and whether it is back
+        # from one without having answered yet
+        self._streak = 0
+        self._probation = False
+
+    @property
+    def ejected(self) -> bool:
+        return self.ejected_until > time.monotonic()
+
+    def __repr__(self) -> str:
+        state = "ejected" if self.ejected else "healthy"
+        return (
+            f"Backend({self.url}, {state}, outstanding={self.outstanding}, "
+            f"latency={self.latency_estimate:.2f}ms)"
+        )
+
+
+class BackendAttempt:
+    """One attempt on a backend, timed from ``sent()`` to ``answered()``"""
+
+    __slots__ = ("backend", "sent_at", "latency")
+
+    def __init__(self, backend: Backend) -> None:
+        self.backend = backend
+        self.sent_at = 0.0
+        self.latency: Optional[float] = None
+
+    def sent(self) -> None:
+        """Start the clock once the attempt has a connection slot"""
+        self.sent_at = time.perf_counter()
+
+    def answered(self) -> None:
+        """Stop the clock, e.g. once response headers arrive"""
+        if self.sent_at and self.latency is None:
+            self.latency = (time.perf_counter() - self.sent_at) * 1000
+
+
+class LoadBalancer:
+    """Spread attempts over backends, ejecting ones that keep failing
+
+    Health is judged passively from the attempts themselves: a backend
+    failing ``failure_threshold`` attempts in a row (network errors,
+    timeouts and 5xx, like the circuit breaker) sits out for the ejection
+    duration, then gets traffic again on probation, where a single failure
+    ejects it for longer. If every backend is ejected they are all used
+    rather than failing locally.
+    """
+
+    def __init__(self, urls: Sequence[str], config: Optional[BalancerConfig] = None):
+        if not urls:
+            raise ValueError("LoadBalancer needs at least one backend")
+        self.config = config or BalancerConfig()
+        self.backends = [Backend(url) for url in urls]
+        self._next = 0
+        self._choose = {
+            "round_robin": self._round_robin,
+            "least_outstanding": self._least_outstanding,
+            "p2c": self._power_of_two,
+        }[self.config.strategy]
+
+    def pick(
+        self,
+        exclude: Optional[Backend] = None,
+        avoid: Optional[Callable[[Backend], bool]] = None,
+    ) -> Backend:
+        """Choose a backend, avoiding ``exclude`` (e.g. the one that just failed)
+
+        Backends for which ``avoid`` returns True, e.g. because their circuit
+        is open, are only chosen when there are no others.
+        """
+        now = time.monotonic()
+        candidates = [
+            backend
+            for backend in self.backends
+            if backend is not exclude and self._admitted(backend, now)
+        ]
+        if avoid is not None:
+            preferred = [backend for backend in candidates if not avoid(backend)]
+            candidates = preferred or candidates
+        if not candidates:
+            # Panic mode, a backend that may be down beats no backend
+            candidates = [
+                backend for backend in self.backends if backend is not exclude
+            ] or self.backends
+        if len(candidates) == 1:
+            return candidates[0]
+        return self._choose(candidates)
+
+    def acquire(
+        self,
+        exclude: Optional[Backend] = None,
+        avoid: Optional[Callable[[Backend], bool]] = None,
+    ) -> BackendAttempt:
+        """Pick a backend and count an attempt as outstanding on it"""
+        backend = self.pick(exclude, avoid)
+        backend.outstanding += 1
+        return BackendAttempt(backend)
+
+    def release(
+        self, attempt: BackendAttempt, error: Optional[BaseException] = None
+    ) -> None:
+        """Finish an attempt, with its error if it failed"""
+        backend = attempt.backend
+        backend.outstanding -= 1
+        if isinstance(error, asyncio.CancelledError):
+            return
+        if error is not None and is_circuit_failure(error):
+            backend.requests += 1
+            backend.failures += 1
+            backend.consecutive_failures += 1
+            if (
+                backend._probation
+                or backend.consecutive_failures >= self.config.failure_threshold
+            ):
+                self._eject(backend)
+            return
+        attempt.answered()
+        latency = attempt.latency
+        # Any answer, including a 4xx, shows the backend is up, local
+        # failures such as a pool timeout say nothing about it
+        if latency is None or (
+            error is not None and getattr(error, "status_code", None) is None
+        ):
+            return
+        backend.requests += 1
+        backend.consecutive_failures = 0
+        backend._streak = 0
+        backend._probation = False
+        backend.latency.record(latency)
+        now = time.monotonic()
+        # Jump to spikes right away, let improvements in gradually
+        if latency >= backend.latency_estimate:
+            backend.latency_estimate = latency
+        else:
+            weight = self._decay(backend, now)
+            backend.latency_estimate = (
+                backend.latency_estimate * weight + latency * (1 - weight)
+            )
+        backend._estimated_at = now
+
+    def _admitted(self, backend: Backend, now: float) -> bool:
+        """Check whether a backend takes traffic, re-admitting expired ejections"""
+        if not backend.ejected_until:
+            return True
+        if backend.ejected_until > now:
+            return False
+        backend.ejected_until = 0.0
+        backend._probation = True
+        logger.info(f"Backend {backend.url} re-admitted")
+        self._notify(backend, False)
+        return True
+
+    def _eject(self, backend: Backend) -> None:
+        now = time.monotonic()
+        if backend.ejected_until > now:
+            return
+        ejected = sum(1 for other in self.backends if other.ejected_until > now)
+        if ejected + 1 > len(self.backends) * self.config.max_ejected_fraction:
+            return
+        backend._streak += 1
+        backend._probation = False
+        backend.ejections += 1
+        backend.consecutive_failures = 0
+        duration = min(
+            self.config.ejection_duration * backend._streak,
+            self.config.max_ejection_duration,
+        )
+        backend.ejected_until = now + duration / 1000.0
+        logger.warning(f"Backend {backend.url} ejected for {duration}ms")
+        self._notify(backend, True)
+
+    def _notify(self, backend: Backend, ejected: bool) -> None:
+        if self.config.on_ejection is None:
+            return
+        try:
+            self.config.on_ejection(backend.url, ejected)
+        except Exception:
+            logger.exception("Backend ejection listener failed")
+
+    def _round_robin(self, candidates: List[Backend]) -> Backend:
+        self._next += 1
+        return candidates[self._next % len(candidates)]
+
+    @staticmethod
+    def _least_outstanding(candidates: List[Backend]) -> Backend:
+        fewest = min(backend.outstanding for backend in candidates)
+        # Random among ties, so idle backends share the load
+        return random.choice(
+            [backend for backend in candidates if backend.outstanding == fewest]
+        )
+
+    def _power_of_two(self, candidates: List[Backend]) -> Backend:
+        first, second = random.sample(candidates, 2)
+        now = time.monotonic()
+        # Unmeasured backends count as average until their first answer
+        measured = [
+            backend.latency_estimate * self._decay(backend, now)
+            for backend in candidates
+            if backend.latency_estimate
+        ]
+        default = sum(measured) / len(measured) if measured else 1.0
+
+        def cost(backend: Backend) -> float:
+            latency = default
+            if backend.latency_estimate:
+                latency = backend.latency_estimate * self._decay(backend, now)
+            return latency * (backend.outstanding + 1)
+
+        return first if cost(first) <= cost(second) else second
+
+    def _decay(self, backend: Backend, now: float) -> float:
+        """Weight left on a latency estimate after the time since it was made"""
+        elapsed = (now - backend._estimated_at) * 1000
+        return math.exp(-elapsed / self.config.latency_decay)
+
+    def get_stats(self) -> Dict[str, Backend]:
+        """Get every backend by URL"""
+        return {backend.url: backend for backend in self.backends}
@@ -0,0 +1,177 @@
+"""
+Read-through LRU/TTL cache for agent records
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+from .deadline import clear_deadline, remaining
+from .errors import DeadlineExceededError
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+# Returned by a revalidating fetch when the server answered 304
+NOT_MODIFIED = object()
+
+
+class CacheConfig:
+    """Agent cache configuration"""
+
+    def __init__(
+        self,
+        max_size: int = 1000,
+        ttl: int = 30000,
+        revalidate: bool = False,
+    ):
+        self.max_size = max_size
+        # Time (ms) an entry is served without asking the server
+        self.ttl = ttl
+        # Revalidate expired entries with If-None-Match instead of refetching
+        self.revalidate = revalidate
+
+
+class _CacheEntry:
+    __slots__ = ("value", "etag", "expires_at")
+
+    def __init__(self, value: Any, etag: Optional[str], expires_at: float):
+        self.value = value
+        self.etag = etag
+        self.expires_at = expires_at
+
+
+class TTLCache(Generic[V]):
+    """Size-bounded LRU cache with per-entry expiry and single-flight loads
+
+    Concurrent misses for a key share one fetch, which runs outside any
+    caller's deadline while each caller waits only until its own.
+    Invalidating a key while its fetch is in flight keeps the (possibly
+    stale) result out of the cache. Expired entries with an ETag are kept
+    for revalidation.
+    """
+
+    def __init__(self, config: Optional[CacheConfig] = None):
+        self.config = config or CacheConfig()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.revalidations = 0
+        self.not_modified = 0
+        self.evictions = 0
+
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def get(
+        self,
+        key: str,
+        fetch: Callable[[Optional[str]], Awaitable[Tuple[Any, Optional[str]]]],
+    ) -> V:
+        """Get a cached value or load it with ``fetch(etag)``
+
+        ``fetch`` returns ``(value, etag)``, or ``(NOT_MODIFIED, etag)``
+        when it was given an ETag and the server confirmed it.
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at > now:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            self.hits += 1
+            return await self._wait(inflight)
+
+        self.misses += 1
+        # A task of its own, so a cancelled caller doesn't fail the others
+        task = asyncio.ensure_future(self._load(key, entry, fetch))
+        self._inflight[key] = task
+        task.add_done_callback(lambda done: self._finish(key, done))
+        return await self._wait(task)
+
+    @staticmethod
+    async def _wait(task: asyncio.Future) -> Any:
+        """Await a shared fetch until the caller's deadline, if any"""
+        left = remaining()
+        if left is None:
+            return await asyncio.shield(task)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), max(left, 0.0))
+        except asyncio.TimeoutError:
+            if task.done():
+                return task.result()
+            raise DeadlineExceededError(timeout=int(left * 1000)) from None
+
+    async def _load(
+        self,
+        key: str,
+        stale: Optional[_CacheEntry],
+        fetch: Callable[[Optional[str]], Awaitable[Tuple[Any, Optional[str]]]],
+    ) -> Any:
+        # Shared by every caller, so the first one's deadline mustn't cut it
+        clear_deadline()
+        etag = stale.etag if stale is not None and self.config.revalidate else None
+        if etag is not None:
+            self.revalidations += 1
+
+        value, new_etag = await fetch(etag)
+        if value is NOT_MODIFIED:
+            self.not_modified += 1
+            value = stale.value
+            new_etag = new_etag or etag
+
+        # Invalidation detaches the in-flight fetch, its result may be stale
+        if self._inflight.get(key) is asyncio.current_task():
+            self.put(key, value, new_etag)
+        return value
+
+    def _finish(self, key: str, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Retrieved so a fetch every caller abandoned doesn't warn
+            task.exception()
+
+    def put(self, key: str, value: V, etag: Optional[str] = None) -> None:
+        """Store a value, evicting the least recently used entries"""
+        expires_at = time.monotonic() + self.config.ttl / 1000.0
+        self._entries[key] = _CacheEntry(value, etag, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.config.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        """Drop a key, including any result of a fetch already in flight"""
+        self._entries.pop(key, None)
+        self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._inflight.clear()
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        return {
+            "size": len(self._entries),
+            "max_size": self.config.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "revalidations": self.revalidations,
+            "not_modified": self.not_modified,
+            "evictions": self.evictions,
+            "hit_ratio": self.hit_ratio,
+        }
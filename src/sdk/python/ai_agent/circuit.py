@@ -0,0 +1,276 @@
+"""
+Per-endpoint circuit breakers
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .errors import (
+    AgentClientError,
+    CircuitOpenError,
+    DeadlineExceededError,
+    NetworkError,
+    PoolTimeoutError,
+    TimeoutError,
+)
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "CLOSED"
+OPEN = "OPEN"
+HALF_OPEN = "HALF_OPEN"
+
+# Joins the endpoint and backend in the key of a per-backend breaker
+BACKEND_SEPARATOR = " @ "
+
+# Path segments of the API's routes; any other segment past the first is
+# taken as an identifier, since ids can look like words too
+_ROUTE_SEGMENTS = frozenset(
+    {
+        "achievements",
+        "agents",
+        "api",
+        "batch",
+        "cancel",
+        "capabilities",
+        "claim",
+        "events",
+        "health",
+        "leaderboard",
+        "metrics",
+        "ready",
+        "result",
+        "results",
+        "retry",
+        "sessions",
+        "status",
+        "tasks",
+        "v1",
+        "vote",
+        "voting",
+    }
+)
+
+
+def endpoint_key(method: str, path: str) -> str:
+    """Build a bounded key like ``GET /tasks/{id}`` from a request path"""
+    segments = path.split("?", 1)[0].split("/")
+    for index, segment in enumerate(segments):
+        # The first named segment is the resource, whatever it is called
+        if segment and index > 1 and segment not in _ROUTE_SEGMENTS:
+            segments[index] = "{id}"
+    return f"{method.upper()} {'/'.join(segments)}"
+
+
+def is_circuit_failure(error: Exception) -> bool:
+    """Check if an error says the backend is unhealthy"""
+    # Local waits and client errors say nothing about the backend
+    if isinstance(error, (PoolTimeoutError, DeadlineExceededError)):
+        return False
+    if isinstance(error, (TimeoutError, NetworkError)):
+        return True
+    if isinstance(error, AgentClientError):
+        if error.status_code is not None:
+            return error.status_code >= 500
+        return error.code == "HTTP_ERROR"
+    return False
+
+
+class CircuitBreakerConfig:
+    """Circuit breaker configuration"""
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        minimum_requests: int = 20,
+        window: int = 10000,
+        window_buckets: int = 10,
+        open_duration: int = 30000,
+        half_open_max_calls: int = 1,
+        on_state_change: Optional[Callable[[str, str, str], None]] = None,
+    ):
+        # Fraction of failed calls in the window that opens the circuit
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_requests = minimum_requests
+        # Sliding window length (ms), split into window_buckets buckets
+        self.window = window
+        self.window_buckets = window_buckets
+        # Time (ms) to stay open before letting probe calls through
+        self.open_duration = open_duration
+        self.half_open_max_calls = half_open_max_calls
+        # Called with (endpoint key, old state, new state)
+        self.on_state_change = on_state_change
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker for one endpoint"""
+
+    def __init__(
+        self,
+        key: str,
+        config: CircuitBreakerConfig,
+        on_transition: Callable[[str, str, str], None],
+    ):
+        self.key = key
+        self.config = config
+        self.state = CLOSED
+        self._on_transition = on_transition
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_successes = 0
+        # [bucket start, successes, failures]
+        self._buckets: Deque[List[float]] = deque()
+
+    def allow(self) -> bool:
+        """Admit a call or raise CircuitOpenError, returning True for probes"""
+        now = time.monotonic()
+
+        if self.state == OPEN:
+            remaining = self._opened_at + self.config.open_duration / 1000.0 - now
+            if remaining > 0:
+                raise CircuitOpenError(self.key, remaining)
+            self._transition(HALF_OPEN)
+
+        if self.state == HALF_OPEN:
+            if self._probes >= self.config.half_open_max_calls:
+                raise CircuitOpenError(self.key)
+            self._probes += 1
+            return True
+
+        return False
+
+    @property
+    def rejecting(self) -> bool:
+        """Check whether ``allow()`` would raise right now, without admitting"""
+        if self.state == OPEN:
+            open_until = self._opened_at + self.config.open_duration / 1000.0
+            return open_until > time.monotonic()
+        if self.state == HALF_OPEN:
+            return self._probes >= self.config.half_open_max_calls
+        return False
+
+    def record_success(self, probe: bool = False) -> None:
+        if probe:
+            if self.state != HALF_OPEN:
+                return
+            self._probes -= 1
+            self._probe_successes += 1
+            if self._probe_successes >= self.config.half_open_max_calls:
+                self._transition(CLOSED)
+        elif self.state == CLOSED:
+            self._record(success=True)
+
+    def record_failure(self, probe: bool = False) -> None:
+        if probe:
+            if self.state == HALF_OPEN:
+                self._probes -= 1
+                self._transition(OPEN)
+        elif self.state == CLOSED:
+            self._record(success=False)
+            successes, failures = self._totals()
+            total = successes + failures
+            if (
+                total >= self.config.minimum_requests
+                and failures / total >= self.config.failure_rate_threshold
+            ):
+                self._transition(OPEN)
+
+    def record_cancelled(self, probe: bool = False) -> None:
+        """Free a probe slot without judging the backend"""
+        if probe and self.state == HALF_OPEN:
+            self._probes -= 1
+
+    def _record(self, success: bool) -> None:
+        """Count a call in the current window bucket"""
+        now = time.monotonic()
+        width = self.config.window / 1000.0 / self.config.window_buckets
+        start = now - now % width
+
+        if not self._buckets or self._buckets[-1][0] != start:
+            self._buckets.append([start, 0, 0])
+        self._buckets[-1][1 if success else 2] += 1
+
+        horizon = now - self.config.window / 1000.0
+        while self._buckets and self._buckets[0][0] + width <= horizon:
+            self._buckets.popleft()
+
+    def _totals(self) -> Tuple[int, int]:
+        successes = sum(int(bucket[1]) for bucket in self._buckets)
+        failures = sum(int(bucket[2]) for bucket in self._buckets)
+        return successes, failures
+
+    def _transition(self, state: str) -> None:
+        old_state = self.state
+        self.state = state
+        self._probes = 0
+        self._probe_successes = 0
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        elif state == CLOSED:
+            self._buckets.clear()
+        self._on_transition(self.key, old_state, state)
+
+    def get_stats(self) -> Dict[str, Any]:
+        successes, failures = self._totals()
+        return {"state": self.state, "successes": successes, "failures": failures}
+
+
+class CircuitBreakers:
+    """Registry of circuit breakers keyed by method and path template
+
+    Behind a load balancer each backend gets its own breaker per endpoint,
+    keyed like ``GET /tasks/{id} @ http://replica-1:3000``, so one failing
+    replica doesn't cut the endpoint off on the healthy ones.
+    """
+
+    def __init__(self, config: Optional[CircuitBreakerConfig] = None):
+        self.config = config or CircuitBreakerConfig()
+        self.transitions = 0
+        self.rejections = 0
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._listeners: List[Callable[[str, str, str], None]] = []
+        if self.config.on_state_change:
+            self._listeners.append(self.config.on_state_change)
+
+    def get(
+        self, method: str, path: str, backend: Optional[str] = None
+    ) -> CircuitBreaker:
+        """Get the breaker for a request, or for its attempts on ``backend``"""
+        key = endpoint_key(method, path)
+        if backend is not None:
+            key = f"{key}{BACKEND_SEPARATOR}{backend}"
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            breaker = CircuitBreaker(key, self.config, self._on_transition)
+            self._breakers[key] = breaker
+        return breaker
+
+    def add_listener(self, listener: Callable[[str, str, str], None]) -> None:
+        """Register a state change callback"""
+        self._listeners.append(listener)
+
+    def _on_transition(self, key: str, old_state: str, new_state: str) -> None:
+        self.transitions += 1
+        log = logger.warning if new_state == OPEN else logger.info
+        log(f"Circuit for {key} {old_state} -> {new_state}")
+        for listener in self._listeners:
+            try:
+                listener(key, old_state, new_state)
+            except Exception:
+                logger.exception("Circuit state listener failed")
+
+    def get_states(self) -> Dict[str, str]:
+        """Get the state of every known endpoint"""
+        return {key: breaker.state for key, breaker in self._breakers.items()}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get circuit breaker statistics"""
+        return {
+            "transitions": self.transitions,
+            "rejections": self.rejections,
+            "endpoints": {
+                key: breaker.get_stats() for key, breaker in self._breakers.items()
+            },
+        }
@@ -3,55 +3,142 @@ Main Agent Client for Python
 """
 
 import asyncio
+import copy
 import logging
 import time
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
 from datetime import datetime
 
 import aiohttp
 
 from .errors import (
     AgentClientError,
+    CircuitOpenError,
+    DeadlineExceededError,
     ValidationError,
+    NetworkError,
     NotFoundError,
+    RateLimitError,
+    ServerError,
     TimeoutError as ClientTimeoutError,
 )
-from .types import Agent, AgentCreateParams, Task, TaskSubmitParams, ClientMetrics, HealthStatus
-from .pool import ConnectionPool, PoolConfig
-from .retry import retry, RetryPresets, RetryConfig
+from .types import (
+    Agent,
+    AgentCreateParams,
+    Task,
+    TaskSubmitParams,
+    ClientMetrics,
+    HealthStatus,
+    RequestPriority,
+)
+from .pool import ConnectionPool, PoolConfig, PoolSlot
+from .limiter import ConcurrencyLimiter, LimiterConfig
+from .ratelimit import RateLimiter, RateLimitConfig, parse_retry_after
+from .circuit import (
+    CircuitBreaker,
+    CircuitBreakers,
+    CircuitBreakerConfig,
+    endpoint_key,
+    is_circuit_failure,
+)
+from .histogram import LatencyHistogram
+from .retry import is_unprocessed_error, retry, RetryPresets, RetryConfig
 from .managers import AgentsManager, TasksManager
+from .cache import CacheConfig
+from .coalesce import SingleFlight
+from .compression import CompressionConfig, CompressionStats, Compressor
+from .deadline import DEADLINE_HEADER, get_deadline, remaining
+from .tracing import RequestTrace, TraceHooks, Tracer
+from .hedging import Hedger, HedgeConfig
+from .balancer import Backend, BackendAttempt, BalancerConfig, LoadBalancer
+from .polling import PollConfig
+from .serializer import Serializer, get_serializer
+from .streaming import DEFAULT_CHUNK_SIZE
+from .exporter import MetricsExporter
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 class AgentClient:
     """Main Agent Client"""
 
     def __init__(
         self,
-        api_url: str,
+        api_url: Union[str, Sequence[str]],
         api_key: str,
         timeout: int = 30,
         max_retries: int = 3,
         retry_config: Optional[RetryConfig] = None,
         pool_config: Optional[PoolConfig] = None,
+        poll_config: Optional[PollConfig] = None,
+        limiter_config: Optional[LimiterConfig] = None,
+        rate_limit_config: Optional[RateLimitConfig] = None,
+        circuit_breaker_config: Optional[CircuitBreakerConfig] = None,
+        serializer: Union[str, Serializer] = "auto",
+        agent_cache_config: Optional[CacheConfig] = None,
+        coalesce_requests: bool = True,
+        hedge_config: Optional[HedgeConfig] = None,
+        compression_config: Optional[CompressionConfig] = None,
+        trace_hooks: Optional[Sequence[TraceHooks]] = None,
+        balancer_config: Optional[BalancerConfig] = None,
     ) -> None:
-        self.api_url = self._validate_url(api_url)
+        urls = [api_url] if isinstance(api_url, str) else list(api_url)
+        if not urls:
+            raise ValidationError("api_url is required")
+        urls = list(dict.fromkeys(self._validate_url(url) for url in urls))
+        # With several replicas api_url is the first, requests go to the
+        # backend the balancer picks
+        self.api_url = urls[0]
+        self.balancer = LoadBalancer(urls, balancer_config) if len(urls) > 1 else None
         self.api_key = self._validate_key(api_key)
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_config = retry_config or RetryPresets.MODERATE
         self.pool_config = pool_config or PoolConfig()
+        self.serializer = get_serializer(serializer)
+        self.compressor = Compressor(compression_config)
 
+        self.limiter = ConcurrencyLimiter(limiter_config)
+        self.rate_limiter = RateLimiter(rate_limit_config)
+        self.circuits = CircuitBreakers(circuit_breaker_config)
+        self.metrics = ClientMetrics(serializer=self.serializer.name)
+        # Untraced requests skip all timing work
+        self.tracer = Tracer(trace_hooks) if trace_hooks else None
+        trace_configs = [self._build_trace_config()]
+        if self.tracer is not None:
+            trace_configs.append(self.tracer.trace_config())
         self.pool = ConnectionPool(
-            self.api_url, self._get_headers(), self.pool_config
+            self.api_url,
+            self._get_headers(),
+            self.pool_config,
+            trace_configs=trace_configs,
+            # Bodies are decompressed by the client so their sizes can be measured
+            auto_decompress=False,
         )
 
-        self.metrics = ClientMetrics()
         self.request_id = 0
+        self.coalesce_requests = coalesce_requests
+        self.single_flight = SingleFlight()
+        self.hedger = Hedger(hedge_config) if hedge_config else None
+        self.exporter: Optional[MetricsExporter] = None
 
-        self.agents = AgentsManager(self)
-        self.tasks = TasksManager(self)
+        self.agents = AgentsManager(self, agent_cache_config)
+        self.tasks = TasksManager(self, poll_config)
 
     @staticmethod
     def _validate_url(url: str) -> str:
@@ -75,6 +162,7 @@ class AgentClient:
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}",
             "User-Agent": "ai-agent-sdk-python/1.0.0",
+            "Accept-Encoding": self.compressor.accept_header,
         }
 
     def _generate_request_id(self) -> str:
@@ -82,8 +170,37 @@ class AgentClient:
         self.request_id += 1
         return f"{self.request_id}-{datetime.utcnow().isoformat()}"
 
-    def _update_metrics(self, success: bool, latency: float) -> None:
-        """Update request metrics"""
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        """Build the trace config feeding connection metrics"""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_connection_create_end(session, context, params) -> None:
+            self.metrics.connections_created += 1
+            self._update_connection_metrics()
+
+        async def on_connection_reuseconn(session, context, params) -> None:
+            self.metrics.connections_reused += 1
+            self._update_connection_metrics()
+
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace_config
+
+    def _update_connection_metrics(self) -> None:
+        """Update socket reuse rate"""
+        total = self.metrics.connections_created + self.metrics.connections_reused
+        self.metrics.connection_reuse_rate = (
+            self.metrics.connections_reused / total
+        ) * 100
+
+    def _update_metrics(
+        self,
+        success: bool,
+        latency: float,
+        endpoint: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> None:
+        """Update request metrics, latency in ms"""
         self.metrics.total_requests += 1
 
         if success:
@@ -92,6 +209,12 @@ class AgentClient:
             self.metrics.failed_requests += 1
             self.metrics.total_errors += 1
 
+        self.metrics.latency.record(latency)
+        if endpoint is not None:
+            self._histogram(self.metrics.endpoint_latency, endpoint).record(latency)
+        if status is not None:
+            self._histogram(self.metrics.status_latency, status).record(latency)
+
         avg = self.metrics.average_latency
         self.metrics.average_latency = (
             avg * (self.metrics.total_requests - 1) + latency
@@ -104,6 +227,15 @@ class AgentClient:
             self.metrics.failed_requests / self.metrics.total_requests
         ) * 100
 
+    @staticmethod
+    def _histogram(
+        histograms: Dict[str, LatencyHistogram], key: str
+    ) -> LatencyHistogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = LatencyHistogram()
+        return histogram
+
     async def initialize(self) -> None:
         """Initialize the client"""
         await self.pool.initialize()
@@ -116,29 +248,235 @@ class AgentClient:
         data: Optional[Any] = None,
         timeout: Optional[int] = None,
         retries: Optional[int] = None,
+        priority: RequestPriority = "NORMAL",
+        lazy: Tuple[str, ...] = (),
+        headers: Optional[Mapping[str, str]] = None,
+        response_info: Optional[Dict[str, Any]] = None,
+        coalesce: Optional[bool] = None,
+        hedge: Optional[bool] = None,
+        envelope: bool = False,
+        idempotent: bool = True,
+    ) -> Any:
+        """Make HTTP request
+
+        At most ``LimiterConfig.max_concurrency`` calls (including their
+        retries) run at once; the rest queue by ``priority``. ``lazy`` keys
+        of the returned records are left as LazyJSON if the serializer
+        supports it. ``response_info``, if given, receives the final
+        response's ``status`` and ``headers``. ``retries`` overrides
+        ``RetryConfig.max_retries`` for this call, 0 sends it once, and
+        ``idempotent=False`` only retries responses that show the server
+        didn't process the request (429, or a 5xx with Retry-After). The
+        response's ``data`` is returned, or with ``envelope`` the whole body,
+        e.g. to read its ``pagination``.
+
+        Concurrent identical GETs share one request unless ``coalesce``
+        (default ``coalesce_requests``) is off, each getting its own copy of
+        the result.
+        With a ``HedgeConfig``, slow attempts of ``HedgeConfig.methods``
+        requests (or any request with ``hedge=True``) race a duplicate.
+
+        Inside a ``deadline()`` block the whole call, retries included, is
+        bounded by the deadline and each attempt tells the server how long
+        is left in the ``X-Request-Timeout-Ms`` header.
+        """
+        if coalesce is None:
+            coalesce = self.coalesce_requests
+        if (
+            coalesce
+            and method.upper() == "GET"
+            and headers is None
+            and response_info is None
+            and retries is None
+        ):
+            try:
+                return await self._within_deadline(
+                    self.single_flight.do(
+                        (path, lazy, envelope),
+                        lambda: self._request(
+                            method,
+                            path,
+                            None,
+                            timeout,
+                            priority,
+                            lazy,
+                            hedge=hedge,
+                            envelope=envelope,
+                        ),
+                        copy.deepcopy,
+                    )
+                )
+            except DeadlineExceededError:
+                # The shared call ran under the first caller's deadline
+                left = remaining()
+                if left is not None and left <= 0:
+                    raise
+
+        return await self._request(
+            method,
+            path,
+            data,
+            timeout,
+            priority,
+            lazy,
+            headers,
+            response_info,
+            hedge,
+            retries,
+            envelope,
+            idempotent,
+        )
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        data: Optional[Any] = None,
+        timeout: Optional[int] = None,
+        priority: RequestPriority = "NORMAL",
+        lazy: Tuple[str, ...] = (),
+        headers: Optional[Mapping[str, str]] = None,
+        response_info: Optional[Dict[str, Any]] = None,
+        hedge: Optional[bool] = None,
+        retries: Optional[int] = None,
+        envelope: bool = False,
+        idempotent: bool = True,
     ) -> Any:
-        """Make HTTP request"""
+        """Send a request through the limiter, circuit breaker and retries"""
         if not self.pool.session:
             await self.initialize()
 
         request_id = self._generate_request_id()
-        start_time = time.time()
+        start_time = time.monotonic()
+        response_status: Optional[int] = None
+
+        body_bytes = None if data is None else self._encode(data)
+        endpoint = endpoint_key(method, path)
+        trace: Optional[RequestTrace] = None
+        if self.tracer is not None:
+            trace = await self.tracer.start(method, path, endpoint, request_id)
+        if body_bytes is not None:
+            compressed = self._compress(body_bytes, endpoint)
+            if compressed is not None:
+                body_bytes, encoding = compressed
+                headers = {**(headers or {}), "Content-Encoding": encoding}
+
+        hedge_delay: Optional[float] = None
+        if self.hedger is not None:
+            if hedge is None:
+                hedge = method.upper() in self.hedger.config.methods
+            if hedge:
+                hedge_delay = self.hedger.delay_for(
+                    self.metrics.attempt_latency.get(endpoint)
+                )
 
         async def make_request() -> Any:
+            if self.balancer is None:
+                return await self._guarded(self.circuits.get(method, path), race)
+            # Each backend's breaker judges the attempts sent to it
+            return await race()
+
+        async def race() -> Any:
+            if hedge_delay is not None:
+                return await self.hedger.run(send, hedge_delay)
+            return await send()
+
+        last_backend: Optional[Backend] = None
+
+        async def send() -> Any:
+            nonlocal last_backend
+            if self.balancer is None:
+                return await attempt(None)
+            # Retries and hedges go to another backend than the last attempt
+            lease, breaker = self._acquire_backend(method, path, last_backend)
+            last_backend = lease.backend
             try:
-                session = await self.pool.acquire()
-                url = f"{self.api_url}{path}"
+                result = await self._guarded(breaker, lambda: attempt(lease))
+            except BaseException as error:
+                self.balancer.release(lease, error)
+                raise
+            self.balancer.release(lease)
+            return result
+
+        async def attempt(lease: Optional[BackendAttempt]) -> Any:
+            nonlocal response_status
+            attempt_timeout = timeout or self.timeout
+            attempt_headers = headers
+            left = remaining()
+            if left is not None:
+                if left <= 0:
+                    raise DeadlineExceededError()
+                # Don't start an attempt the caller can't wait for
+                attempt_timeout = min(attempt_timeout, left)
+                attempt_headers = {
+                    **(headers or {}),
+                    DEADLINE_HEADER: str(int(left * 1000)),
+                }
+            if trace is not None and trace.headers:
+                attempt_headers = {**(attempt_headers or {}), **trace.headers}
 
-                async with session.request(
+            mark = time.perf_counter() if trace is not None else 0.0
+            await self.rate_limiter.acquire()
+            if trace is not None:
+                trace.since("rate_limit", mark)
+                mark = time.perf_counter()
+            connection = await self.pool.acquire(
+                None if lease is None else lease.backend.host
+            )
+            if trace is not None:
+                trace.since("pool", mark)
+            if lease is not None:
+                lease.sent()
+            sent_at = time.perf_counter()
+            discard = False
+            try:
+                base_url = self.api_url if lease is None else lease.backend.url
+                url = f"{base_url}{path}"
+
+                async with connection.session.request(
                     method,
                     url,
-                    json=data,
-                    timeout=aiohttp.ClientTimeout(total=timeout or self.timeout),
+                    data=body_bytes,
+                    headers=attempt_headers,
+                    timeout=aiohttp.ClientTimeout(total=attempt_timeout),
+                    trace_request_ctx=None if trace is None else Tracer.attempt(trace),
                 ) as response:
-                    body = await response.json()
+                    response_status = response.status
+                    if response_info is not None:
+                        response_info["status"] = response.status
+                        response_info["headers"] = response.headers
+                    mark = time.perf_counter() if trace is not None else 0.0
+                    raw = await response.read()
+                    self._histogram(self.metrics.attempt_latency, endpoint).record(
+                        (time.perf_counter() - sent_at) * 1000
+                    )
+                    if trace is not None:
+                        trace.since("read", mark)
+                        mark = time.perf_counter()
+                    encoding = response.headers.get("Content-Encoding")
+                    if encoding:
+                        raw = self._decompress(raw, encoding, endpoint, response.status)
+                        if trace is not None:
+                            trace.since("decompress", mark)
+                            mark = time.perf_counter()
+                    try:
+                        body = self._decode(raw, lazy)
+                        if trace is not None:
+                            trace.since("decode", mark)
+                    except ValueError:
+                        # Proxies and routers answer missing routes with plain text
+                        if response.status < 400:
+                            raise AgentClientError(
+                                "Invalid JSON response", "INVALID_RESPONSE", response.status
+                            )
+                        body = {}
 
                     if response.status >= 400:
-                        self._handle_error_response(response.status, body)
+                        self._handle_error_response(
+                            response.status,
+                            body if isinstance(body, dict) else {},
+                            response.headers,
+                        )
 
                     if isinstance(body, dict) and not body.get("success", True):
                         error = body.get("error", {})
@@ -149,26 +487,476 @@ class AgentClient:
                             error.get("details"),
                         )
 
-                    return body.get("data", body)
+                    self.rate_limiter.on_success()
+                    if isinstance(body, dict) and not envelope:
+                        return body.get("data", body)
+                    return body
+            except aiohttp.ClientConnectionError as error:
+                # The connector drops the broken socket, count the slot as discarded
+                discard = True
+                raise NetworkError(str(error) or "Connection failed", error) from error
+            except asyncio.TimeoutError as error:
+                discard = True
+                effective_timeout = timeout or self.timeout
+                if attempt_timeout < effective_timeout:
+                    raise DeadlineExceededError(
+                        timeout=int(attempt_timeout * 1000)
+                    ) from error
+                raise ClientTimeoutError(
+                    f"Request timed out after {effective_timeout}s",
+                    int(effective_timeout * 1000),
+                ) from error
             except aiohttp.ClientError as error:
                 raise AgentClientError(str(error), "HTTP_ERROR") from error
+            finally:
+                self.pool.release(connection, discard=discard)
+
+        def on_retry(attempt: int, delay: int, error: Exception) -> None:
+            self._record_retry(attempt, delay, error)
+            if trace is not None:
+                trace.add("backoff", delay)
+
+        retry_config = self.retry_config
+        if retries is not None:
+            retry_config = copy.copy(retry_config)
+            retry_config.max_retries = retries
+
+        async def run() -> Any:
+            mark = time.perf_counter()
+            async with self.limiter.slot(priority):
+                if trace is not None:
+                    trace.since("queue", mark)
+                return await retry(
+                    make_request,
+                    retry_config,
+                    on_retry,
+                    should_retry=None if idempotent else is_unprocessed_error,
+                    deadline=get_deadline(),
+                )
 
         try:
-            result = await retry(
-                make_request,
-                self.retry_config,
+            result = await self._within_deadline(run())
+            self._update_metrics(
+                True,
+                (time.monotonic() - start_time) * 1000,
+                endpoint,
+                str(response_status),
             )
-            self._update_metrics(True, time.time() - start_time)
             return result
+        except asyncio.CancelledError as error:
+            if trace is not None:
+                trace.error = error
+            raise
+        except Exception as error:
+            if trace is not None:
+                trace.error = error
+            status = getattr(error, "status_code", None) or response_status
+            self._update_metrics(
+                False,
+                (time.monotonic() - start_time) * 1000,
+                endpoint,
+                str(status) if status else "error",
+            )
+            self.metrics.last_error = {
+                "message": str(error),
+                "timestamp": datetime.utcnow().isoformat(),
+            }
+            raise
+        finally:
+            if trace is not None:
+                if trace.status is None:
+                    trace.status = response_status
+                await self.tracer.end(trace)
+
+    async def stream(
+        self,
+        method: str,
+        path: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        timeout: Optional[int] = None,
+        priority: RequestPriority = "NORMAL",
+        headers: Optional[Mapping[str, str]] = None,
+        response_info: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[bytes]:
+        """Stream a response body in decompressed chunks
+
+        Goes through the limiter, rate limiter, circuit breaker and pool like
+        ``request``, retrying until a successful response's headers arrive;
+        the body is never retried and breaking off mid-way raises
+        NetworkError. ``timeout`` bounds connecting and each read rather
+        than the whole body, which a ``deadline()`` still bounds. The limiter
+        and pool slots are held until the body is read or the generator is
+        closed.
+        """
+        if not self.pool.session:
+            await self.initialize()
+
+        request_id = self._generate_request_id()
+        start_time = time.monotonic()
+        read_timeout = timeout or self.timeout
+        response_status: Optional[int] = None
+
+        endpoint = endpoint_key(method, path)
+        trace: Optional[RequestTrace] = None
+        if self.tracer is not None:
+            trace = await self.tracer.start(method, path, endpoint, request_id)
+
+        async def open_response() -> Tuple[PoolSlot, aiohttp.ClientResponse]:
+            if self.balancer is None:
+                return await self._guarded(self.circuits.get(method, path), send)
+            return await send()
+
+        # Attempt on the backend the body is read from, released once read
+        opened_lease: Optional[BackendAttempt] = None
+        last_backend: Optional[Backend] = None
+
+        async def send() -> Tuple[PoolSlot, aiohttp.ClientResponse]:
+            nonlocal opened_lease, last_backend
+            if self.balancer is None:
+                return await attempt(None)
+            lease, breaker = self._acquire_backend(method, path, last_backend)
+            last_backend = lease.backend
+            try:
+                opened = await self._guarded(breaker, lambda: attempt(lease))
+            except BaseException as error:
+                self.balancer.release(lease, error)
+                raise
+            # Timed to the headers, outstanding until the body has been read
+            lease.answered()
+            opened_lease = lease
+            return opened
+
+        async def attempt(
+            lease: Optional[BackendAttempt],
+        ) -> Tuple[PoolSlot, aiohttp.ClientResponse]:
+            nonlocal response_status
+            client_timeout = aiohttp.ClientTimeout(
+                sock_connect=read_timeout, sock_read=read_timeout
+            )
+            attempt_headers = headers
+            left = remaining()
+            if left is not None:
+                if left <= 0:
+                    raise DeadlineExceededError()
+                client_timeout = aiohttp.ClientTimeout(
+                    total=left, sock_connect=read_timeout, sock_read=read_timeout
+                )
+                attempt_headers = {
+                    **(headers or {}),
+                    DEADLINE_HEADER: str(int(left * 1000)),
+                }
+            if trace is not None and trace.headers:
+                attempt_headers = {**(attempt_headers or {}), **trace.headers}
+
+            mark = time.perf_counter() if trace is not None else 0.0
+            await self.rate_limiter.acquire()
+            if trace is not None:
+                trace.since("rate_limit", mark)
+                mark = time.perf_counter()
+            connection = await self.pool.acquire(
+                None if lease is None else lease.backend.host
+            )
+            if trace is not None:
+                trace.since("pool", mark)
+            if lease is not None:
+                lease.sent()
+            opened = discard = False
+            try:
+                base_url = self.api_url if lease is None else lease.backend.url
+                response = await connection.session.request(
+                    method,
+                    f"{base_url}{path}",
+                    headers=attempt_headers,
+                    timeout=client_timeout,
+                    trace_request_ctx=None if trace is None else Tracer.attempt(trace),
+                )
+                response_status = response.status
+                if response.status < 400:
+                    opened = True
+                    return connection, response
+
+                # Error bodies are small, read them like ``request`` does
+                try:
+                    raw = await response.read()
+                    encoding = response.headers.get("Content-Encoding")
+                    if encoding:
+                        raw = self._decompress(
+                            raw, encoding, endpoint, response.status
+                        )
+                    try:
+                        body = self._decode(raw)
+                    except ValueError:
+                        body = {}
+                finally:
+                    response.release()
+                self._handle_error_response(
+                    response.status,
+                    body if isinstance(body, dict) else {},
+                    response.headers,
+                )
+                raise AgentClientError("Request failed", "HTTP_ERROR", response.status)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+                discard = True
+                raise self._stream_error(error, read_timeout) from error
+            finally:
+                if not opened:
+                    self.pool.release(connection, discard=discard)
+
+        def on_retry(attempt: int, delay: int, error: Exception) -> None:
+            self._record_retry(attempt, delay, error)
+            if trace is not None:
+                trace.add("backoff", delay)
+
+        connection: Optional[PoolSlot] = None
+        response: Optional[aiohttp.ClientResponse] = None
+        complete = False
+        failure: Optional[BaseException] = None
+        try:
+            mark = time.perf_counter()
+            async with self.limiter.slot(priority):
+                if trace is not None:
+                    trace.since("queue", mark)
+                connection, response = await retry(
+                    open_response,
+                    self.retry_config,
+                    on_retry,
+                    deadline=get_deadline(),
+                )
+                if response_info is not None:
+                    response_info["status"] = response.status
+                    response_info["headers"] = response.headers
+
+                encoding = response.headers.get("Content-Encoding")
+                decoder = self.compressor.stream_decoder(encoding) if encoding else None
+                wire_bytes = body_bytes = 0
+                decompress_time = 0.0
+                while True:
+                    mark = time.perf_counter()
+                    try:
+                        chunk = await response.content.read(chunk_size)
+                    except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+                        raise self._stream_error(error, read_timeout) from error
+                    if trace is not None:
+                        trace.since("read", mark)
+                    if decoder is not None:
+                        wire_bytes += len(chunk)
+                        mark = time.perf_counter()
+                        try:
+                            data = decoder.decompress(chunk) if chunk else decoder.flush()
+                        except ValueError as error:
+                            raise AgentClientError(
+                                str(error), "INVALID_RESPONSE", response.status
+                            ) from error
+                        elapsed = (time.perf_counter() - mark) * 1000
+                        decompress_time += elapsed
+                        if trace is not None:
+                            trace.add("decompress", elapsed)
+                    else:
+                        data = chunk
+                    body_bytes += len(data)
+                    # A decompressed chunk can be many times ``chunk_size``
+                    for start in range(0, len(data), chunk_size):
+                        yield data[start : start + chunk_size]
+                    if not chunk:
+                        break
+
+                complete = True
+                if decoder is not None and encoding.strip().lower() != "identity":
+                    stats = self._compression_stats(endpoint)
+                    stats.compressed_responses += 1
+                    stats.response_bytes += body_bytes
+                    stats.response_wire_bytes += wire_bytes
+                    stats.decompress_time += decompress_time
+                self.rate_limiter.on_success()
+            self._update_metrics(
+                True,
+                (time.monotonic() - start_time) * 1000,
+                endpoint,
+                str(response_status),
+            )
+        except asyncio.CancelledError as error:
+            failure = error
+            if trace is not None:
+                trace.error = error
+            raise
         except Exception as error:
-            self._update_metrics(False, time.time() - start_time)
+            failure = error
+            if trace is not None:
+                trace.error = error
+            status = getattr(error, "status_code", None) or response_status
+            self._update_metrics(
+                False,
+                (time.monotonic() - start_time) * 1000,
+                endpoint,
+                str(status) if status else "error",
+            )
             self.metrics.last_error = {
                 "message": str(error),
                 "timestamp": datetime.utcnow().isoformat(),
             }
             raise
+        finally:
+            if opened_lease is not None:
+                # A body cut off mid-way counts against the backend
+                self.balancer.release(opened_lease, None if complete else failure)
+            if response is not None:
+                # An unread body can't be reused, closing drops the connection
+                if complete:
+                    response.release()
+                else:
+                    response.close()
+            if connection is not None:
+                self.pool.release(connection, discard=not complete)
+            if trace is not None:
+                if trace.status is None:
+                    trace.status = response_status
+                await self.tracer.end(trace)
 
-    def _handle_error_response(self, status: int, body: Dict[str, Any]) -> None:
+    @staticmethod
+    def _stream_error(error: Exception, timeout: float) -> AgentClientError:
+        """Map a transport error while streaming to the SDK's errors"""
+        # Read timeouts are connection errors too, check them first
+        if isinstance(error, asyncio.TimeoutError):
+            left = remaining()
+            if left is not None and left <= 0:
+                return DeadlineExceededError()
+            return ClientTimeoutError(
+                f"No data received for {timeout}s", int(timeout * 1000)
+            )
+        if isinstance(error, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)):
+            return NetworkError(str(error) or "Connection failed", error)
+        return AgentClientError(str(error), "HTTP_ERROR")
+
+    async def _guarded(
+        self, breaker: CircuitBreaker, call: Callable[[], Awaitable[T]]
+    ) -> T:
+        """Run ``call`` if ``breaker`` admits it, recording the outcome"""
+        try:
+            probe = breaker.allow()
+        except CircuitOpenError:
+            self.circuits.rejections += 1
+            raise
+
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            breaker.record_cancelled(probe)
+            raise
+        except Exception as error:
+            if is_circuit_failure(error):
+                breaker.record_failure(probe)
+            else:
+                breaker.record_success(probe)
+            raise
+        breaker.record_success(probe)
+        return result
+
+    def _acquire_backend(
+        self, method: str, path: str, exclude: Optional[Backend]
+    ) -> Tuple[BackendAttempt, CircuitBreaker]:
+        """Pick a backend, passing over ones whose circuit is open"""
+        circuits = self.circuits
+        lease = self.balancer.acquire(
+            exclude,
+            avoid=lambda backend: circuits.get(method, path, backend.url).rejecting,
+        )
+        return lease, self.circuits.get(method, path, lease.backend.url)
+
+    @staticmethod
+    async def _within_deadline(awaitable: Awaitable[T]) -> T:
+        """Await ``awaitable``, giving up when the current deadline passes"""
+        left = remaining()
+        if left is None:
+            return await awaitable
+        if left <= 0:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            raise DeadlineExceededError()
+        task = asyncio.ensure_future(awaitable)
+        try:
+            done, _ = await asyncio.wait((task,), timeout=left)
+        finally:
+            if not task.done():
+                task.cancel()
+                # A request cut off mid-flight can still end in an error
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        if not done:
+            raise DeadlineExceededError(timeout=int(left * 1000))
+        return task.result()
+
+    def _encode(self, data: Any) -> bytes:
+        """Serialize a request body, recording codec metrics"""
+        start = time.perf_counter()
+        try:
+            encoded = self.serializer.dumps(data)
+        except (TypeError, ValueError) as error:
+            raise AgentClientError(
+                f"Request body is not JSON serializable: {error}", "INVALID_REQUEST"
+            ) from error
+        self.metrics.encode_time += (time.perf_counter() - start) * 1000
+        self.metrics.encoded_bytes += len(encoded)
+        return encoded
+
+    def _compression_stats(self, endpoint: str) -> CompressionStats:
+        stats = self.metrics.endpoint_compression.get(endpoint)
+        if stats is None:
+            stats = self.metrics.endpoint_compression[endpoint] = CompressionStats()
+        return stats
+
+    def _compress(self, body: bytes, endpoint: str) -> Optional[Tuple[bytes, str]]:
+        """Compress a request body if configured and worthwhile, recording metrics"""
+        if self.compressor.config.request_encoding is None:
+            return None
+        start = time.perf_counter()
+        compressed = self.compressor.compress(body)
+        elapsed = (time.perf_counter() - start) * 1000
+        if compressed is not None:
+            stats = self._compression_stats(endpoint)
+            stats.compressed_requests += 1
+            stats.request_bytes += len(body)
+            stats.request_wire_bytes += len(compressed[0])
+            stats.compress_time += elapsed
+        return compressed
+
+    def _decompress(self, raw: bytes, encoding: str, endpoint: str, status: int) -> bytes:
+        """Decode a compressed response body, recording metrics"""
+        start = time.perf_counter()
+        try:
+            decoded = self.compressor.decompress(raw, encoding)
+        except ValueError as error:
+            raise AgentClientError(str(error), "INVALID_RESPONSE", status) from error
+        if decoded is not raw:
+            stats = self._compression_stats(endpoint)
+            stats.compressed_responses += 1
+            stats.response_bytes += len(decoded)
+            stats.response_wire_bytes += len(raw)
+            stats.decompress_time += (time.perf_counter() - start) * 1000
+        return decoded
+
+    def _decode(self, raw: bytes, lazy: Tuple[str, ...] = ()) -> Any:
+        """Parse a response body straight from its bytes, recording codec metrics"""
+        if not raw:
+            return None
+        start = time.perf_counter()
+        try:
+            if lazy:
+                return self.serializer.loads_lazy(raw, lazy)
+            return self.serializer.loads(raw)
+        finally:
+            self.metrics.decode_time += (time.perf_counter() - start) * 1000
+            self.metrics.decoded_bytes += len(raw)
+
+    def _record_retry(self, attempt: int, delay: int, error: Exception) -> None:
+        """Record a scheduled retry"""
+        self.metrics.retry_attempts += 1
+        self.metrics.total_backoff_time += delay
+
+    def _handle_error_response(
+        self,
+        status: int,
+        body: Dict[str, Any],
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> None:
         """Handle error responses"""
         error = body.get("error", {})
         message = error.get("message", "Unknown error")
@@ -184,9 +972,17 @@ class AgentClient:
         elif status == 404:
             raise NotFoundError(message)
         elif status == 429:
-            raise AgentClientError(message, "RATE_LIMIT", status)
+            retry_after = parse_retry_after(headers or {})
+            if retry_after is None and isinstance(details, dict):
+                # Same formats as the header, anything else is ignored
+                value = details.get("retryAfter")
+                if value is not None and not isinstance(value, bool):
+                    retry_after = parse_retry_after({"Retry-After": str(value)})
+            # Pause every outgoing request, not just this one's retries
+            self.rate_limiter.on_rate_limited(retry_after)
+            raise RateLimitError(message, retry_after)
         elif status >= 500:
-            raise AgentClientError(message, "SERVER_ERROR", status)
+            raise ServerError(message, status, parse_retry_after(headers or {}))
         else:
             raise AgentClientError(message, code, status, details)
 
@@ -196,10 +992,50 @@ class AgentClient:
 
     def get_metrics(self) -> ClientMetrics:
         """Get client metrics"""
+        limiter = self.limiter.get_stats()
+        self.metrics.in_flight_requests = limiter["in_flight"]
+        self.metrics.queued_requests = limiter["queued"]
+        self.metrics.peak_queued_requests = limiter["peak_queued"]
+        self.metrics.rejected_requests = limiter["rejected"]
+        self.metrics.average_queue_time = limiter["average_queue_time"]
+        self.metrics.current_rate_limit = self.rate_limiter.rate
+        self.metrics.rate_limited_requests = self.rate_limiter.rate_limited
+        self.metrics.circuit_transitions = self.circuits.transitions
+        self.metrics.circuit_rejections = self.circuits.rejections
+        self.metrics.circuit_states = self.circuits.get_states()
+        self.metrics.coalesced_requests = self.single_flight.coalesced
+        if self.balancer is not None:
+            self.metrics.backends = self.balancer.get_stats()
+        if self.hedger is not None:
+            self.metrics.hedged_requests = self.hedger.hedged
+            self.metrics.hedge_wins = self.hedger.wins
+            self.metrics.hedges_cancelled = self.hedger.cancelled
+        if self.agents.cache is not None:
+            self.metrics.agent_cache_hits = self.agents.cache.hits
+            self.metrics.agent_cache_misses = self.agents.cache.misses
+            self.metrics.agent_cache_hit_ratio = self.agents.cache.hit_ratio * 100
+        self.metrics.latency_p50 = self.metrics.latency.percentile(50)
+        self.metrics.latency_p90 = self.metrics.latency.percentile(90)
+        self.metrics.latency_p99 = self.metrics.latency.percentile(99)
+        self.metrics.latency_p999 = self.metrics.latency.percentile(99.9)
         return self.metrics
 
+    async def serve_metrics(
+        self, host: str = "127.0.0.1", port: int = 9464, path: str = "/metrics"
+    ) -> MetricsExporter:
+        """Expose metrics for Prometheus scraping until the client closes"""
+        if self.exporter is None:
+            exporter = MetricsExporter(self)
+            await exporter.start(host, port, path)
+            self.exporter = exporter
+        return self.exporter
+
     async def close(self) -> None:
         """Close the client"""
+        if self.exporter is not None:
+            await self.exporter.stop()
+            self.exporter = None
+        await self.tasks.close()
         await self.pool.close()
         logger.info("Agent client closed")
 
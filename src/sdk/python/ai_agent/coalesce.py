@@ -0,0 +1,86 @@
+"""
+Single-flight coalescing of identical concurrent calls
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("task", "waiters", "joined")
+
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+        self.joined = False
+
+
+class SingleFlight:
+    """Share one in-flight call among concurrent callers with the same key
+
+    The call runs in its own task, so one caller being cancelled doesn't
+    fail the others; it is only cancelled once every caller has gone.
+    Given a ``copy`` function, every caller of a call that was joined gets
+    its own ``copy(result)``, so none sees another's changes; otherwise
+    they all get the same object.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.coalesced = 0
+        self._inflight: Dict[Hashable, _Call] = {}
+
+    async def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Awaitable[T]],
+        copy: Optional[Callable[[T], T]] = None,
+    ) -> T:
+        """Run ``fn`` or join the identical call already in flight"""
+        call = self._inflight.get(key)
+        if call is None:
+            self.calls += 1
+            call = _Call(asyncio.ensure_future(fn()))
+            self._inflight[key] = call
+            call.task.add_done_callback(lambda task: self._finish(key, call))
+        else:
+            self.coalesced += 1
+            call.joined = True
+
+        call.waiters += 1
+        try:
+            result = await asyncio.shield(call.task)
+            # Nobody can join once the call is done, so this is settled
+            return copy(result) if call.joined and copy is not None else result
+        finally:
+            call.waiters -= 1
+            if not call.waiters and not call.task.done():
+                # Forget it now, a caller arriving before the cancellation
+                # lands must start a new call rather than join this one
+                if self._inflight.get(key) is call:
+                    del self._inflight[key]
+                call.task.cancel()
+
+    def _finish(self, key: Hashable, call: _Call) -> None:
+        if self._inflight.get(key) is call:
+            del self._inflight[key]
+        if not call.task.cancelled():
+            # Retrieved so a call every caller abandoned doesn't warn
+            call.task.exception()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics"""
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": self.in_flight,
+        }
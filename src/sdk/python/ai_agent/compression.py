@@ -0,0 +1,291 @@
+"""
+HTTP body compression and Content-Encoding negotiation
+"""
+
+import logging
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Preference order for Accept-Encoding, zstd only when zstandard is installed
+ENCODINGS = ("zstd", "gzip", "deflate")
+
+# Encodings request bodies can be sent with
+REQUEST_ENCODINGS = ("gzip", "zstd")
+
+
+class CompressionConfig:
+    """Request and response compression configuration"""
+
+    def __init__(
+        self,
+        request_encoding: Optional[str] = None,
+        min_size: int = 1024,
+        level: Optional[int] = None,
+        accept_encoding: Optional[Tuple[str, ...]] = None,
+    ):
+        # Content-Encoding for request bodies, None sends them uncompressed
+        self.request_encoding = request_encoding
+        # Bodies smaller than this (bytes) aren't worth the CPU
+        self.min_size = min_size
+        # Codec level, None uses the codec default (gzip 6, zstd 3)
+        self.level = level
+        # Response encodings to offer, None offers every supported one
+        self.accept_encoding = accept_encoding
+
+
+class CompressionStats:
+    """Compression bytes and CPU time (ms) for one endpoint"""
+
+    __slots__ = (
+        "compressed_requests",
+        "request_bytes",
+        "request_wire_bytes",
+        "compress_time",
+        "compressed_responses",
+        "response_bytes",
+        "response_wire_bytes",
+        "decompress_time",
+    )
+
+    def __init__(self) -> None:
+        self.compressed_requests = 0
+        self.request_bytes = 0
+        self.request_wire_bytes = 0
+        self.compress_time = 0.0
+        self.compressed_responses = 0
+        self.response_bytes = 0
+        self.response_wire_bytes = 0
+        self.decompress_time = 0.0
+
+    @property
+    def request_ratio(self) -> float:
+        """Uncompressed / sent size of compressed request bodies"""
+        return _ratio(self.request_bytes, self.request_wire_bytes)
+
+    @property
+    def response_ratio(self) -> float:
+        """Decompressed / received size of compressed response bodies"""
+        return _ratio(self.response_bytes, self.response_wire_bytes)
+
+    @classmethod
+    def merged(cls, stats: Iterable["CompressionStats"]) -> "CompressionStats":
+        total = cls()
+        for item in stats:
+            for name in cls.__slots__:
+                setattr(total, name, getattr(total, name) + getattr(item, name))
+        return total
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {name: getattr(self, name) for name in self.__slots__}
+        data["request_ratio"] = self.request_ratio
+        data["response_ratio"] = self.response_ratio
+        return data
+
+
+def _ratio(raw: int, wire: int) -> float:
+    return raw / wire if wire else 0.0
+
+
+def _load_zstd() -> Optional[Any]:
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+class Compressor:
+    """Compress request bodies and decompress responses by Content-Encoding"""
+
+    def __init__(self, config: Optional[CompressionConfig] = None):
+        self.config = config or CompressionConfig()
+        self._zstd = _load_zstd()
+
+        supported = tuple(
+            encoding for encoding in ENCODINGS
+            if encoding != "zstd" or self._zstd is not None
+        )
+        offered = self.config.accept_encoding
+        if offered is None:
+            offered = supported
+        unknown = [encoding for encoding in offered if encoding not in ENCODINGS]
+        if unknown:
+            raise ValueError(f"accept_encoding must be among {', '.join(ENCODINGS)}")
+        self.accept_encoding = tuple(
+            encoding for encoding in offered if encoding in supported
+        )
+
+        encoding = self.config.request_encoding
+        if encoding is not None:
+            if encoding not in REQUEST_ENCODINGS:
+                raise ValueError(
+                    f"request_encoding must be one of {', '.join(REQUEST_ENCODINGS)}"
+                )
+            if encoding == "zstd" and self._zstd is None:
+                raise ImportError(
+                    "zstd compression requested but zstandard is not installed"
+                )
+
+        self._compress = self._compressor(encoding)
+
+    @property
+    def accept_header(self) -> str:
+        """Accept-Encoding header value, identity when nothing is offered"""
+        return ", ".join(self.accept_encoding) or "identity"
+
+    def _compressor(self, encoding: Optional[str]) -> Optional[Callable[[bytes], bytes]]:
+        level = self.config.level
+        if encoding == "gzip":
+            gzip_level = 6 if level is None else level
+
+            def compress_gzip(data: bytes) -> bytes:
+                # wbits 31 writes a gzip header, zlib is faster than the gzip module
+                compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+                return compressor.compress(data) + compressor.flush()
+
+            return compress_gzip
+        if encoding == "zstd":
+            return self._zstd.ZstdCompressor(level=3 if level is None else level).compress
+        return None
+
+    def compress(self, data: bytes) -> Optional[Tuple[bytes, str]]:
+        """Compress a request body, None when it should be sent as-is"""
+        if self._compress is None or len(data) < self.config.min_size:
+            return None
+        compressed = self._compress(data)
+        if len(compressed) >= len(data):
+            return None
+        return compressed, self.config.request_encoding
+
+    def decompress(self, data: bytes, encoding: str) -> bytes:
+        """Decode a response body sent with ``Content-Encoding: encoding``"""
+        try:
+            # Codings are listed in the order they were applied
+            for coding in reversed(encoding.split(",")):
+                data = self._decode(data, coding.strip().lower())
+        except zlib.error as error:
+            raise ValueError(f"Invalid {encoding} body: {error}") from error
+        except Exception as error:
+            if self._zstd is not None and isinstance(error, self._zstd.ZstdError):
+                raise ValueError(f"Invalid {encoding} body: {error}") from error
+            raise
+        return data
+
+    def stream_decoder(self, encoding: str) -> "StreamDecoder":
+        """Incremental ``decompress`` for bodies read in chunks"""
+        return StreamDecoder(encoding, self._zstd)
+
+    def _decode(self, data: bytes, encoding: str) -> bytes:
+        if encoding in ("", "identity"):
+            return data
+        if encoding in ("gzip", "x-gzip"):
+            # wbits 47 accepts gzip and zlib headers
+            return zlib.decompress(data, 47)
+        if encoding == "deflate":
+            try:
+                return zlib.decompress(data)
+            except zlib.error:
+                # Some servers send raw deflate without the zlib header
+                return zlib.decompress(data, -15)
+        if encoding == "zstd" and self._zstd is not None:
+            # Streaming frames don't record their size, decompressobj copes
+            return self._zstd.ZstdDecompressor().decompressobj().decompress(data)
+        raise ValueError(f"Unsupported Content-Encoding: {encoding}")
+
+
+_ZLIB_DECODER = type(zlib.decompressobj())
+
+
+class _DeflateDecoder:
+    """Deflate with or without the zlib header, told apart by the first bytes"""
+
+    def __init__(self) -> None:
+        self._decoder: Optional[Any] = None
+        self._head = b""
+
+    def decompress(self, data: bytes) -> bytes:
+        if self._decoder is None:
+            self._head += data
+            if len(self._head) < 2:
+                return b""
+            first, second = self._head[0], self._head[1]
+            zlib_header = first & 0x0F == 8 and (first << 8 | second) % 31 == 0
+            self._decoder = zlib.decompressobj(15 if zlib_header else -15)
+            data, self._head = self._head, b""
+        return self._decoder.decompress(data)
+
+    @property
+    def eof(self) -> bool:
+        return self._decoder is not None and self._decoder.eof
+
+    def flush(self) -> bytes:
+        if self._decoder is None:
+            self._decoder = zlib.decompressobj(-15)
+            return self._decoder.decompress(self._head) + self._decoder.flush()
+        return self._decoder.flush()
+
+
+class _IdentityDecoder:
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class StreamDecoder:
+    """Decode a ``Content-Encoding`` body chunk by chunk
+
+    Raises ValueError for unsupported codings and corrupt data, like
+    ``Compressor.decompress``.
+    """
+
+    def __init__(self, encoding: str, zstd: Optional[Any] = None):
+        self.encoding = encoding
+        self._zstd = zstd
+        # Codings are listed in the order they were applied
+        self._decoders: List[Any] = [
+            self._decoder(coding.strip().lower())
+            for coding in reversed(encoding.split(","))
+        ]
+
+    def _decoder(self, encoding: str) -> Any:
+        if encoding in ("", "identity"):
+            return _IdentityDecoder()
+        if encoding in ("gzip", "x-gzip"):
+            return zlib.decompressobj(47)
+        if encoding == "deflate":
+            return _DeflateDecoder()
+        if encoding == "zstd" and self._zstd is not None:
+            return self._zstd.ZstdDecompressor().decompressobj()
+        raise ValueError(f"Unsupported Content-Encoding: {encoding}")
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decode the next chunk, returning whatever output it completes"""
+        return self._run(data, flush=False)
+
+    def flush(self) -> bytes:
+        """Decode what is left once the body has been read"""
+        return self._run(b"", flush=True)
+
+    def _run(self, data: bytes, flush: bool) -> bytes:
+        try:
+            for decoder in self._decoders:
+                # zstd refuses input, even empty, once its frame has ended
+                if data:
+                    data = decoder.decompress(data)
+                if flush:
+                    data += decoder.flush()
+                    # zlib leaves truncation to the caller to notice
+                    zlib_based = isinstance(decoder, (_ZLIB_DECODER, _DeflateDecoder))
+                    if zlib_based and not decoder.eof:
+                        raise ValueError(f"Invalid {self.encoding} body: truncated")
+        except zlib.error as error:
+            raise ValueError(f"Invalid {self.encoding} body: {error}") from error
+        except Exception as error:
+            if self._zstd is not None and isinstance(error, self._zstd.ZstdError):
+                raise ValueError(f"Invalid {self.encoding} body: {error}") from error
+            raise
+        return data
@@ -0,0 +1,52 @@
+"""
+End-to-end deadlines carried across SDK calls
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# Tells the server how long (ms) the caller will still wait for the response
+DEADLINE_HEADER = "X-Request-Timeout-Ms"
+
+_deadline: "contextvars.ContextVar[Optional[float]]" = contextvars.ContextVar(
+    "ai_agent_deadline", default=None
+)
+
+
+@contextmanager
+def deadline(timeout: float) -> Iterator[float]:
+    """Bound every SDK call made inside the block to ``timeout`` seconds
+
+    Requests, their retries and backoff, queueing and task waits all share
+    the one budget. Nested blocks can only shorten the outer deadline.
+    Tasks started inside the block inherit it.
+    """
+    at = time.monotonic() + timeout
+    current = _deadline.get()
+    if current is not None:
+        at = min(at, current)
+    token = _deadline.set(at)
+    try:
+        yield at
+    finally:
+        _deadline.reset(token)
+
+
+def get_deadline() -> Optional[float]:
+    """Get the current absolute deadline (``time.monotonic()``), if any"""
+    return _deadline.get()
+
+
+def remaining() -> Optional[float]:
+    """Get the seconds left before the current deadline, if any"""
+    at = _deadline.get()
+    if at is None:
+        return None
+    return at - time.monotonic()
+
+
+def clear_deadline() -> None:
+    """Detach the current task from any deadline, for background work"""
+    _deadline.set(None)
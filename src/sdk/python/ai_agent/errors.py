@@ -75,21 +75,73 @@ class TimeoutError(AgentClientError):
         super().__init__(message, "TIMEOUT", 408)
 
 
+class PoolTimeoutError(TimeoutError):
+    """Timed out waiting for a pooled connection"""
+
+    def __init__(
+        self,
+        message: str = "Timed out waiting for a connection",
+        timeout: Optional[int] = None,
+    ) -> None:
+        super().__init__(message, timeout)
+        self.code = "POOL_TIMEOUT"
+        self.status_code = None
+
+
+class DeadlineExceededError(TimeoutError):
+    """The caller's end-to-end deadline passed"""
+
+    def __init__(
+        self,
+        message: str = "Deadline exceeded",
+        timeout: Optional[int] = None,
+    ) -> None:
+        super().__init__(message, timeout)
+        self.code = "DEADLINE_EXCEEDED"
+        self.status_code = None
+
+
 class RateLimitError(AgentClientError):
     """Rate limit error"""
 
     def __init__(
-        self, message: str = "Rate limit exceeded", retry_after: Optional[int] = None
+        self, message: str = "Rate limit exceeded", retry_after: Optional[float] = None
     ) -> None:
         self.retry_after = retry_after
         super().__init__(message, "RATE_LIMIT", 429)
 
 
+class OverloadedError(AgentClientError):
+    """Client-side request queue is overloaded"""
+
+    def __init__(
+        self, message: str = "Client overloaded", queue_depth: Optional[int] = None
+    ) -> None:
+        self.queue_depth = queue_depth
+        super().__init__(message, "CLIENT_OVERLOADED")
+
+
+class CircuitOpenError(AgentClientError):
+    """Circuit breaker is open for the endpoint"""
+
+    def __init__(self, endpoint: str, retry_after: Optional[float] = None) -> None:
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+        super().__init__(f"Circuit open for {endpoint}", "CIRCUIT_OPEN")
+
+
 class ServerError(AgentClientError):
     """Server error"""
 
-    def __init__(self, message: str, status_code: int = 500) -> None:
+    def __init__(
+        self,
+        message: str,
+        status_code: int = 500,
+        retry_after: Optional[float] = None,
+    ) -> None:
         super().__init__(message, "SERVER_ERROR", status_code)
+        # Seconds from a Retry-After header, sent with e.g. a 503
+        self.retry_after = retry_after
 
 
 class NetworkError(AgentClientError):
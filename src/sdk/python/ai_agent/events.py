@@ -0,0 +1,265 @@
+"""
+Server-sent task events for push-based completion
+"""
+
+import asyncio
+import logging
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import aiohttp
+
+from .balancer import Backend
+from .errors import StreamError
+from .types import TERMINAL_TASK_STATUSES
+
+logger = logging.getLogger(__name__)
+
+
+# SSE lines end in CRLF, LF or CR
+_LINE_BREAK = re.compile(rb"\r\n|\r|\n")
+
+
+async def _read_lines(content: aiohttp.StreamReader) -> AsyncIterator[str]:
+    """Split a response body into lines of any length"""
+    pending = bytearray()
+    scan = 0
+    async for chunk in content.iter_any():
+        pending += chunk
+        start = 0
+        for match in _LINE_BREAK.finditer(pending, scan):
+            if match.end() == len(pending) and match.group() == b"\r":
+                # May be the first half of a CRLF split across chunks
+                break
+            yield pending[start : match.start()].decode("utf-8")
+            start = match.end()
+        del pending[:start]
+        # Only the new bytes and a held back CR can hold a line break
+        scan = max(len(pending) - 1, 0)
+
+
+class TaskEventStream:
+    """Shared task event subscription
+
+    A single ``GET /tasks/events`` server-sent event stream is opened on the
+    client's session while at least one waiter is subscribed. Terminal task
+    events resolve every future registered for that task id. When the
+    stream drops, pending futures resolve with ``None`` so waiters re-check
+    the task instead of missing events sent while disconnected.
+    """
+
+    def __init__(
+        self,
+        client,
+        path: str = "/tasks/events",
+        reconnect_delay: int = 1000,
+        linger: int = 5000,
+        max_retry_delay: int = 60000,
+    ):
+        self.client = client
+        self.path = path
+        self.reconnect_delay = reconnect_delay
+        self.linger = linger
+        # Cap on the wait before connecting again after failed connects
+        self.max_retry_delay = max_retry_delay
+        # None until the first connect tells us whether the route exists
+        self.available: Optional[bool] = None
+
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._reader: Optional[asyncio.Task] = None
+        self._settled: Optional[asyncio.Event] = None
+        self._connected = False
+        self._failure: Optional[Exception] = None
+        # Failed connects in a row and the loop time before which another
+        # connect fails fast instead of hitting the server
+        self._failed_connects = 0
+        self._retry_at = 0.0
+        self._stop_handle: Optional[asyncio.TimerHandle] = None
+        # Load balanced backend the stream last connected to
+        self._backend: Optional[Backend] = None
+
+    def subscribe(self, task_id: str) -> asyncio.Future:
+        """Register interest in a task's terminal event"""
+        future = asyncio.get_event_loop().create_future()
+        self._waiters.setdefault(task_id, []).append(future)
+        if self._stop_handle:
+            self._stop_handle.cancel()
+            self._stop_handle = None
+        return future
+
+    def unsubscribe(self, task_id: str, future: asyncio.Future) -> None:
+        """Drop a waiter, stopping the stream after ``linger`` when idle"""
+        futures = self._waiters.get(task_id)
+        if futures and future in futures:
+            futures.remove(future)
+            if not futures:
+                del self._waiters[task_id]
+
+        if not self._waiters and self._reader and not self._stop_handle:
+            self._stop_handle = asyncio.get_event_loop().call_later(
+                self.linger / 1000.0, self._stop_if_idle
+            )
+
+    async def connect(self) -> None:
+        """Ensure the stream is running and wait until it is connected"""
+        if self.available is False:
+            raise StreamError("Task event stream is not available")
+
+        if self._reader is None or self._reader.done():
+            if self._failure is not None and (
+                asyncio.get_event_loop().time() < self._retry_at
+            ):
+                raise self._failure
+            self._settled = asyncio.Event()
+            self._failure = None
+            self._reader = asyncio.ensure_future(self._run())
+
+        await self._settled.wait()
+        if self._failure is not None:
+            raise self._failure
+
+    async def _run(self) -> None:
+        """Read the stream, reconnecting once per drop until stopped"""
+        failures = 0
+        connected_once = False
+        while True:
+            try:
+                await self._read_stream()
+                failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                failures += 1
+                connected_once = connected_once or self._connected
+                # Give up on a failed first connect or a failed reconnect
+                if self.available is False or failures > 1 or not connected_once:
+                    self._fail(
+                        error
+                        if isinstance(error, StreamError)
+                        else StreamError(f"Task event stream failed: {error}")
+                    )
+                    return
+                logger.debug(f"Task event stream dropped: {error}")
+
+            connected_once = True
+            self._connected = False
+            self._settled.clear()
+            self._release_waiters()
+            await asyncio.sleep(self.reconnect_delay / 1000.0)
+
+    async def _read_stream(self) -> None:
+        """Open the stream and dispatch events until it ends"""
+        if self.client.pool.session is None:
+            await self.client.pool.initialize()
+
+        base_url = self.client.api_url
+        if self.client.balancer is not None:
+            # Reconnect through another replica than the one that dropped
+            self._backend = self.client.balancer.pick(exclude=self._backend)
+            base_url = self._backend.url
+        # The stream is long-lived, so it bypasses pool slots and only
+        # occupies a connector socket
+        async with self.client.pool.session.get(
+            f"{base_url}{self.path}",
+            # Uncompressed, the session leaves decompression to the client
+            headers={"Accept": "text/event-stream", "Accept-Encoding": "identity"},
+            timeout=aiohttp.ClientTimeout(total=None, sock_connect=self.client.timeout),
+        ) as response:
+            # A JSON answer usually means /tasks/{id} matched "events", and a
+            # 400/401/403 won't change without new credentials or config
+            if response.status in (400, 401, 403, 404, 405, 501) or (
+                response.status < 400
+                and response.content_type != "text/event-stream"
+            ):
+                self.available = False
+                raise StreamError("Task event stream is not available")
+            if response.status >= 400:
+                raise StreamError(f"Task event stream returned {response.status}")
+
+            self.available = True
+            self._connected = True
+            self._failed_connects = 0
+            self._settled.set()
+            logger.debug("Task event stream connected")
+
+            data: List[str] = []
+            async for line in _read_lines(response.content):
+                if not line:
+                    if data:
+                        self._dispatch("\n".join(data))
+                        data = []
+                    continue
+                field, _, value = line.partition(":")
+                if field == "data":
+                    # Only the one space after the colon is not part of the value
+                    data.append(value[1:] if value.startswith(" ") else value)
+                # Comments (heartbeats), event names and ids are ignored
+
+    def _dispatch(self, raw: str) -> None:
+        """Resolve waiters for a terminal task event"""
+        try:
+            message = self.client.serializer.loads(raw)
+        except ValueError:
+            logger.debug(f"Ignoring malformed task event: {raw!r}")
+            return
+        if not isinstance(message, dict):
+            return
+
+        task = message.get("task") or message.get("data") or message
+        if not isinstance(task, dict):
+            return
+        task_id = task.get("id") or task.get("taskId")
+        if task.get("status") not in TERMINAL_TASK_STATUSES:
+            return
+
+        for future in self._waiters.pop(task_id, []):
+            if not future.done():
+                future.set_result(task)
+
+    def _release_waiters(self) -> None:
+        """Wake waiters so they re-check tasks after a disconnect"""
+        for futures in self._waiters.values():
+            for future in futures:
+                if not future.done():
+                    future.set_result(None)
+
+    def _fail(self, error: Exception) -> None:
+        # Back off exponentially so waiters fall back to polling instead of
+        # reconnecting on every call while the server keeps refusing
+        self._failed_connects += 1
+        delay = min(
+            self.reconnect_delay * 2 ** (self._failed_connects - 1),
+            self.max_retry_delay,
+        )
+        self._retry_at = asyncio.get_event_loop().time() + delay / 1000.0
+        self._failure = error
+        self._connected = False
+        self._settled.set()
+        self._release_waiters()
+
+    def _stop_if_idle(self) -> None:
+        self._stop_handle = None
+        if not self._waiters and self._reader:
+            self._reader.cancel()
+            self._reader = None
+            self._connected = False
+
+    async def close(self) -> None:
+        """Stop the stream and wake remaining waiters"""
+        if self._stop_handle:
+            self._stop_handle.cancel()
+            self._stop_handle = None
+        if self._reader:
+            self._reader.cancel()
+            self._reader = None
+        self._connected = False
+        self._release_waiters()
+        self._waiters.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get stream statistics"""
+        return {
+            "available": self.available,
+            "connected": self._connected,
+            "waiting_tasks": len(self._waiters),
+        }
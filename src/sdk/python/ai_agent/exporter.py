@@ -0,0 +1,472 @@
+"""
+OpenMetrics exporter for client metrics
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Tuple
+
+from .circuit import BACKEND_SEPARATOR
+from .compression import CompressionStats
+from .histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Histogram bucket bounds in seconds
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+CIRCUIT_STATES = ("CLOSED", "OPEN", "HALF_OPEN")
+
+# Label value used once an unbounded label exceeds its cardinality budget
+OTHER = "other"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{key}="{_escape(str(value))}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _number(value: Any) -> str:
+    if value is None:
+        return "NaN"
+    if isinstance(value, float):
+        if value == float("inf"):
+            return "+Inf"
+        return repr(value)
+    return str(int(value))
+
+
+class MetricsExporter:
+    """Render AgentClient metrics in OpenMetrics text format
+
+    ``render()`` can back any scrape endpoint; ``start()`` serves it from
+    an in-process aiohttp server running on the client's event loop.
+    Endpoint labels come from path templates and are capped at
+    ``max_endpoints`` distinct values, the rest reported as ``other``.
+    """
+
+    def __init__(
+        self,
+        client,
+        namespace: str = "ai_agent_client",
+        max_endpoints: int = 50,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        self.client = client
+        self.namespace = namespace
+        self.max_endpoints = max_endpoints
+        self.buckets = buckets
+        self._runner = None
+
+    def _name(self, name: str) -> str:
+        return f"{self.namespace}_{name}"
+
+    def _bounded(self, histograms: Dict[str, LatencyHistogram]) -> Dict[str, LatencyHistogram]:
+        """Fold label values beyond the cardinality budget into ``other``"""
+        if len(histograms) <= self.max_endpoints:
+            return histograms
+
+        ranked = sorted(histograms.items(), key=lambda item: -item[1].count)
+        bounded = dict(ranked[: self.max_endpoints - 1])
+        bounded[OTHER] = LatencyHistogram.merged(
+            (histogram for _, histogram in ranked[self.max_endpoints - 1 :]),
+            ranked[0][1].precision,
+        )
+        return bounded
+
+    def _bounded_compression(
+        self, stats: Dict[str, CompressionStats]
+    ) -> Dict[str, CompressionStats]:
+        """Fold endpoints beyond the cardinality budget into ``other``"""
+        if len(stats) <= self.max_endpoints:
+            return stats
+
+        ranked = sorted(
+            stats.items(),
+            key=lambda item: -(item[1].request_bytes + item[1].response_bytes),
+        )
+        bounded = dict(ranked[: self.max_endpoints - 1])
+        bounded[OTHER] = CompressionStats.merged(
+            item for _, item in ranked[self.max_endpoints - 1 :]
+        )
+        return bounded
+
+    def render(self) -> str:
+        """Render all metrics as OpenMetrics text"""
+        metrics = self.client.get_metrics()
+        lines: List[str] = []
+
+        def family(
+            name: str,
+            kind: str,
+            help_text: str,
+            samples: Iterable[Tuple[str, Dict[str, str], Any]],
+        ) -> None:
+            full_name = self._name(name)
+            lines.append(f"# TYPE {full_name} {kind}")
+            lines.append(f"# HELP {full_name} {help_text}")
+            for suffix, labels, value in samples:
+                lines.append(f"{full_name}{suffix}{_labels(labels)} {_number(value)}")
+
+        family(
+            "requests",
+            "counter",
+            "Requests completed, including their retries.",
+            [
+                ("_total", {"outcome": "success"}, metrics.successful_requests),
+                ("_total", {"outcome": "failure"}, metrics.failed_requests),
+            ],
+        )
+        family(
+            "responses",
+            "counter",
+            "Requests by final response status.",
+            [
+                ("_total", {"status": status}, histogram.count)
+                for status, histogram in sorted(metrics.status_latency.items())
+            ],
+        )
+
+        duration_samples: List[Tuple[str, Dict[str, str], Any]] = []
+        for endpoint, histogram in sorted(self._bounded(metrics.endpoint_latency).items()):
+            counts = histogram.cumulative_counts(bound * 1000 for bound in self.buckets)
+            for bound, count in zip(self.buckets, counts):
+                duration_samples.append(
+                    ("_bucket", {"endpoint": endpoint, "le": repr(bound)}, count)
+                )
+            duration_samples.append(
+                ("_bucket", {"endpoint": endpoint, "le": "+Inf"}, histogram.count)
+            )
+            duration_samples.append(("_count", {"endpoint": endpoint}, histogram.count))
+            duration_samples.append(("_sum", {"endpoint": endpoint}, histogram.sum / 1000))
+        family(
+            "request_duration_seconds",
+            "histogram",
+            "End-to-end request latency by endpoint template.",
+            duration_samples,
+        )
+
+        family(
+            "retry_attempts",
+            "counter",
+            "Retries scheduled after failed attempts.",
+            [("_total", {}, metrics.retry_attempts)],
+        )
+        family(
+            "retry_backoff_seconds",
+            "counter",
+            "Time spent sleeping between retries.",
+            [("_total", {}, metrics.total_backoff_time / 1000)],
+        )
+        family(
+            "connections_opened",
+            "counter",
+            "Sockets opened by the connector.",
+            [("_total", {}, metrics.connections_created)],
+        )
+        family(
+            "connections_reused",
+            "counter",
+            "Requests served on a kept-alive socket.",
+            [("_total", {}, metrics.connections_reused)],
+        )
+
+        family(
+            "codec_bytes",
+            "counter",
+            "JSON bytes encoded and decoded.",
+            [
+                ("_total", {"direction": "encode"}, metrics.encoded_bytes),
+                ("_total", {"direction": "decode"}, metrics.decoded_bytes),
+            ],
+        )
+        family(
+            "codec_seconds",
+            "counter",
+            "Time spent encoding and decoding JSON.",
+            [
+                ("_total", {"direction": "encode"}, metrics.encode_time / 1000),
+                ("_total", {"direction": "decode"}, metrics.decode_time / 1000),
+            ],
+        )
+
+        compression_bodies: List[Tuple[str, Dict[str, str], Any]] = []
+        compression_bytes: List[Tuple[str, Dict[str, str], Any]] = []
+        compression_seconds: List[Tuple[str, Dict[str, str], Any]] = []
+        for endpoint, stats in sorted(
+            self._bounded_compression(metrics.endpoint_compression).items()
+        ):
+            for direction, bodies, raw, wire, elapsed in (
+                (
+                    "request",
+                    stats.compressed_requests,
+                    stats.request_bytes,
+                    stats.request_wire_bytes,
+                    stats.compress_time,
+                ),
+                (
+                    "response",
+                    stats.compressed_responses,
+                    stats.response_bytes,
+                    stats.response_wire_bytes,
+                    stats.decompress_time,
+                ),
+            ):
+                labels = {"endpoint": endpoint, "direction": direction}
+                compression_bodies.append(("_total", labels, bodies))
+                compression_bytes.append(("_total", {**labels, "stage": "raw"}, raw))
+                compression_bytes.append(("_total", {**labels, "stage": "wire"}, wire))
+                compression_seconds.append(("_total", labels, elapsed / 1000))
+        family(
+            "compressed_bodies",
+            "counter",
+            "Request and response bodies sent or received compressed.",
+            compression_bodies,
+        )
+        family(
+            "compression_bytes",
+            "counter",
+            "Sizes of compressed bodies before (raw) and after (wire) compression.",
+            compression_bytes,
+        )
+        family(
+            "compression_seconds",
+            "counter",
+            "Time spent compressing requests and decompressing responses.",
+            compression_seconds,
+        )
+
+        family(
+            "coalesced_requests",
+            "counter",
+            "GETs that joined an identical request already in flight.",
+            [("_total", {}, metrics.coalesced_requests)],
+        )
+        family(
+            "hedged_requests",
+            "counter",
+            "Duplicate attempts sent for slow requests.",
+            [("_total", {}, metrics.hedged_requests)],
+        )
+        family(
+            "hedge_wins",
+            "counter",
+            "Hedged attempts that answered first.",
+            [("_total", {}, metrics.hedge_wins)],
+        )
+        family(
+            "hedges_cancelled",
+            "counter",
+            "Losing attempts cancelled after a hedge race.",
+            [("_total", {}, metrics.hedges_cancelled)],
+        )
+        family(
+            "agent_cache_lookups",
+            "counter",
+            "Agent cache lookups by result, coalesced fetches count as hits.",
+            [
+                ("_total", {"result": "hit"}, metrics.agent_cache_hits),
+                ("_total", {"result": "miss"}, metrics.agent_cache_misses),
+            ],
+        )
+
+        pool = self.client.pool.get_stats()
+        family(
+            "pool_slots_in_use",
+            "gauge",
+            "Pool slots held by requests in flight.",
+            [("", {}, pool["in_use"])],
+        )
+        family(
+            "pool_max_slots",
+            "gauge",
+            "Pool slot limit, also the connector's socket limit.",
+            [("", {}, self.client.pool.config.max_connections)],
+        )
+        family(
+            "pool_waiting",
+            "gauge",
+            "Callers waiting for a pool slot.",
+            [("", {}, pool["waiting"])],
+        )
+        family(
+            "pool_checkouts",
+            "counter",
+            "Pool slot requests by result.",
+            [
+                ("_total", {"result": "immediate"}, pool["immediate"]),
+                ("_total", {"result": "waited"}, pool["waited"]),
+                ("_total", {"result": "timeout"}, pool["timeouts"]),
+                ("_total", {"result": "cancelled"}, pool["cancelled"]),
+            ],
+        )
+        family(
+            "pool_wait_seconds",
+            "counter",
+            "Time spent waiting for pool slots.",
+            [("_total", {}, pool["total_wait_time"] / 1000)],
+        )
+
+        family(
+            "in_flight_requests",
+            "gauge",
+            "Requests holding a concurrency slot.",
+            [("", {}, metrics.in_flight_requests)],
+        )
+        family(
+            "queued_requests",
+            "gauge",
+            "Requests waiting for a concurrency slot.",
+            [("", {}, metrics.queued_requests)],
+        )
+        family(
+            "rejected_requests",
+            "counter",
+            "Requests shed by the concurrency limiter.",
+            [("_total", {}, metrics.rejected_requests)],
+        )
+        family(
+            "rate_limit_requests_per_second",
+            "gauge",
+            "Current client-side rate limit, NaN when unlimited.",
+            [("", {}, metrics.current_rate_limit)],
+        )
+        family(
+            "rate_limited_responses",
+            "counter",
+            "429 responses received.",
+            [("_total", {}, metrics.rate_limited_requests)],
+        )
+
+        # Stateset samples carry the state under the family's own name
+        state_label = self._name("circuit_state")
+        circuit_samples: List[Tuple[str, Dict[str, str], Any]] = []
+        # Tripped circuits are the ones worth keeping when over budget
+        states = sorted(
+            metrics.circuit_states.items(),
+            key=lambda item: (item[1] == CIRCUIT_STATES[0], item[0]),
+        )[: self.max_endpoints]
+        for key, current in sorted(states):
+            # Per-backend breakers when load balancing
+            endpoint, _, backend = key.partition(BACKEND_SEPARATOR)
+            labels = {"endpoint": endpoint}
+            if backend:
+                labels["backend"] = backend
+            for state in CIRCUIT_STATES:
+                circuit_samples.append(
+                    ("", {**labels, state_label: state}, int(state == current))
+                )
+        family(
+            "circuit_state",
+            "stateset",
+            "Circuit breaker state by endpoint template and backend.",
+            circuit_samples,
+        )
+        family(
+            "circuit_transitions",
+            "counter",
+            "Circuit breaker state transitions.",
+            [("_total", {}, metrics.circuit_transitions)],
+        )
+
+        # Backends are configured URLs, so their label needs no budget
+        if metrics.backends:
+            backends = sorted(metrics.backends.items())
+            backend_duration: List[Tuple[str, Dict[str, str], Any]] = []
+            for url, backend in backends:
+                labels = {"backend": url}
+                histogram = backend.latency
+                counts = histogram.cumulative_counts(
+                    bound * 1000 for bound in self.buckets
+                )
+                for bound, count in zip(self.buckets, counts):
+                    backend_duration.append(
+                        ("_bucket", {**labels, "le": repr(bound)}, count)
+                    )
+                backend_duration.append(
+                    ("_bucket", {**labels, "le": "+Inf"}, histogram.count)
+                )
+                backend_duration.append(("_count", labels, histogram.count))
+                backend_duration.append(("_sum", labels, histogram.sum / 1000))
+            family(
+                "backend_attempts",
+                "counter",
+                "Attempts sent to each load balanced backend by outcome.",
+                [
+                    sample
+                    for url, backend in backends
+                    for sample in (
+                        (
+                            "_total",
+                            {"backend": url, "outcome": "success"},
+                            backend.requests - backend.failures,
+                        ),
+                        (
+                            "_total",
+                            {"backend": url, "outcome": "failure"},
+                            backend.failures,
+                        ),
+                    )
+                ],
+            )
+            family(
+                "backend_attempt_duration_seconds",
+                "histogram",
+                "Latency of attempts that got an answer, by backend.",
+                backend_duration,
+            )
+            family(
+                "backend_outstanding_requests",
+                "gauge",
+                "Attempts in flight to each backend.",
+                [("", {"backend": url}, b.outstanding) for url, b in backends],
+            )
+            family(
+                "backend_ejected",
+                "gauge",
+                "1 while a backend is ejected for failing.",
+                [("", {"backend": url}, int(b.ejected)) for url, b in backends],
+            )
+            family(
+                "backend_ejections",
+                "counter",
+                "Times each backend was ejected.",
+                [("_total", {"backend": url}, b.ejections) for url, b in backends],
+            )
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    async def start(
+        self, host: str = "127.0.0.1", port: int = 9464, path: str = "/metrics"
+    ) -> None:
+        """Serve metrics from an in-process HTTP endpoint"""
+        from aiohttp import web
+
+        async def handle(request: "web.Request") -> "web.Response":
+            return web.Response(
+                body=self.render().encode("utf-8"),
+                headers={"Content-Type": CONTENT_TYPE},
+            )
+
+        app = web.Application()
+        app.router.add_get(path, handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host, port).start()
+        logger.info(f"Serving client metrics on http://{host}:{port}{path}")
+
+    async def stop(self) -> None:
+        """Stop the metrics endpoint"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,123 @@
+"""
+Hedged requests for tail latency
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from .histogram import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class HedgeConfig:
+    """Request hedging configuration"""
+
+    def __init__(
+        self,
+        delay: Optional[int] = None,
+        percentile: float = 95.0,
+        min_samples: int = 100,
+        min_delay: int = 5,
+        max_hedge_ratio: float = 0.1,
+        methods: Tuple[str, ...] = ("GET", "HEAD"),
+    ):
+        # Fixed delay (ms) before hedging, None uses the percentile of the
+        # endpoint's single-attempt latency
+        self.delay = delay
+        self.percentile = percentile
+        # Attempt latency samples an endpoint needs before percentile hedging
+        # starts
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        # Hedges allowed per request, e.g. 0.1 adds at most 10% extra load
+        self.max_hedge_ratio = max_hedge_ratio
+        self.methods = methods
+
+
+class Hedger:
+    """Send a duplicate of a slow idempotent request, first success wins
+
+    Hedges are paid for from a budget that earns ``max_hedge_ratio``
+    tokens per request, so a slow backend can't make the client double
+    its own load.
+    """
+
+    # Unused budget carried over, limits bursts after quiet periods
+    MAX_TOKENS = 10.0
+
+    def __init__(self, config: Optional[HedgeConfig] = None):
+        self.config = config or HedgeConfig()
+        self.hedged = 0
+        self.wins = 0
+        self.cancelled = 0
+        self.budget_exhausted = 0
+        self._tokens = 0.0
+
+    def delay_for(self, histogram: Optional[LatencyHistogram]) -> Optional[float]:
+        """Get the hedge delay (ms) from an endpoint's attempt latency
+
+        Returns None to not hedge yet. End-to-end latency would count
+        queueing, retries and backoff, which a hedge doesn't race.
+        """
+        self._tokens = min(self._tokens + self.config.max_hedge_ratio, self.MAX_TOKENS)
+
+        if self.config.delay is not None:
+            return float(self.config.delay)
+        if histogram is None or histogram.count < self.config.min_samples:
+            return None
+        return max(histogram.percentile(self.config.percentile), self.config.min_delay)
+
+    async def run(self, send: Callable[[], Awaitable[T]], delay: float) -> T:
+        """Run ``send``, racing a second copy if it's slower than ``delay`` ms"""
+        primary = asyncio.ensure_future(send())
+        tasks = [primary]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay / 1000.0)
+            if done:
+                return primary.result()
+            if self._tokens < 1:
+                self.budget_exhausted += 1
+                return await primary
+
+            self._tokens -= 1
+            self.hedged += 1
+            hedge = asyncio.ensure_future(send())
+            tasks.append(hedge)
+
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.wins += 1
+                        return task.result()
+            # Both failed, report the original attempt's error
+            return primary.result()
+        finally:
+            for task in tasks:
+                if task.done():
+                    # Retrieved so a losing attempt's error doesn't warn
+                    if not task.cancelled():
+                        task.exception()
+                else:
+                    task.cancel()
+                    self.cancelled += 1
+                    # It may still end in an error rather than cancelled
+                    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hedging statistics"""
+        return {
+            "hedged": self.hedged,
+            "wins": self.wins,
+            "cancelled": self.cancelled,
+            "budget_exhausted": self.budget_exhausted,
+            "tokens": self._tokens,
+        }
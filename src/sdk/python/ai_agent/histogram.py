@@ -0,0 +1,149 @@
+"""
+Bounded-memory latency histogram
+"""
+
+import math
+from typing import Dict, Iterable, List, Optional
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram
+
+    Values (ms) fall into buckets whose bounds grow by ``1 + precision``,
+    so any percentile is reported within ``precision`` relative error while
+    memory stays bounded by the value range rather than the sample count
+    (about 900 buckets for 1us..100s at 2%). Histograms with the same
+    precision can be merged, e.g. across endpoints, clients or processes.
+    """
+
+    __slots__ = ("precision", "count", "sum", "min", "max", "buckets", "_log_base")
+
+    # Values at or below this (ms) share the first bucket
+    MIN_VALUE = 0.001
+
+    def __init__(self, precision: float = 0.02) -> None:
+        self.precision = precision
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets: Dict[int, int] = {}
+        self._log_base = math.log1p(precision)
+
+    def record(self, value: float) -> None:
+        """Record a latency in milliseconds"""
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+        index = (
+            int(math.log(value / self.MIN_VALUE) / self._log_base)
+            if value > self.MIN_VALUE
+            else 0
+        )
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def percentile(self, percentile: float) -> float:
+        """Get the latency (ms) at a percentile between 0 and 100"""
+        if not self.count:
+            return 0.0
+
+        rank = max(math.ceil(self.count * percentile / 100.0), 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                # Bucket midpoint, clamped to what was actually observed
+                value = self.MIN_VALUE * math.exp((index + 0.5) * self._log_base)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def cumulative_counts(self, bounds: Iterable[float]) -> List[int]:
+        """Count samples at or below each bound (ms), for fixed-bucket export"""
+        counts = []
+        items = sorted(self.buckets.items())
+        for bound in bounds:
+            total = 0
+            for index, count in items:
+                if self.MIN_VALUE * math.exp((index + 0.5) * self._log_base) > bound:
+                    break
+                total += count
+            counts.append(total)
+        return counts
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Add another histogram's samples into this one"""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge histograms with different precision")
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        return self
+
+    @classmethod
+    def merged(
+        cls, histograms: Iterable["LatencyHistogram"], precision: float = 0.02
+    ) -> "LatencyHistogram":
+        """Merge several histograms into a new one"""
+        result = cls(precision)
+        for histogram in histograms:
+            result.merge(histogram)
+        return result
+
+    def snapshot(self) -> "LatencyHistogram":
+        """Get an independent copy"""
+        return LatencyHistogram(self.precision).merge(self)
+
+    def reset(self) -> None:
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        self.buckets.clear()
+
+    def to_dict(self) -> Dict[str, object]:
+        """Serialize for transport, see ``from_dict``"""
+        return {
+            "precision": self.precision,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max,
+            "buckets": {str(index): count for index, count in self.buckets.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, object]) -> "LatencyHistogram":
+        histogram = cls(float(data["precision"]))
+        histogram.count = int(data["count"])
+        histogram.sum = float(data["sum"])
+        histogram.min = float(data["min"]) if data.get("min") is not None else math.inf
+        histogram.max = float(data["max"])
+        histogram.buckets = {
+            int(index): int(count) for index, count in dict(data["buckets"]).items()
+        }
+        return histogram
+
+    def summary(self, percentiles: Optional[Iterable[float]] = None) -> Dict[str, float]:
+        """Get count, mean and the common percentiles"""
+        percentiles = percentiles or (50, 90, 99, 99.9)
+        result = {"count": float(self.count), "mean": self.mean}
+        for percentile in percentiles:
+            result[f"p{percentile:g}".replace(".", "")] = self.percentile(percentile)
+        return result
+
+    def __repr__(self) -> str:
+        return (
+            f"LatencyHistogram(count={self.count}, p50={self.percentile(50):.2f}, "
+            f"p99={self.percentile(99):.2f}, max={self.max:.2f})"
+        )
@@ -0,0 +1,135 @@
+"""
+Concurrency limiting and backpressure for client requests
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from .errors import OverloadedError
+from .types import RequestPriority
+
+# Lower rank is served first
+PRIORITY_RANKS: Dict[str, int] = {"INTERACTIVE": 0, "NORMAL": 1, "BULK": 2}
+
+
+class LimiterConfig:
+    """Concurrency limiter configuration"""
+
+    def __init__(
+        self,
+        max_concurrency: int = 100,
+        max_queue_size: Optional[int] = None,
+        queue_timeout: Optional[int] = None,
+    ):
+        self.max_concurrency = max_concurrency
+        # Requests beyond this many queued callers fail fast, None is unbounded
+        self.max_queue_size = max_queue_size
+        # Max time (ms) a request may wait in the queue, None waits forever
+        self.queue_timeout = queue_timeout
+
+
+class ConcurrencyLimiter:
+    """Priority-aware semaphore for in-flight requests
+
+    Callers beyond ``max_concurrency`` queue by priority (interactive before
+    normal before bulk, FIFO within a priority). When the queue is full or a
+    caller waits longer than ``queue_timeout`` an ``OverloadedError`` is
+    raised so overloaded clients shed load instead of timing out en masse.
+    """
+
+    def __init__(self, config: Optional[LimiterConfig] = None):
+        self.config = config or LimiterConfig()
+        self.in_flight = 0
+        self.queued = 0
+        self.peak_queued = 0
+        self.rejected = 0
+        self.total_queued = 0
+        self.total_queue_time = 0.0
+
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    async def acquire(self, priority: RequestPriority = "NORMAL") -> None:
+        """Take a slot, queueing by priority when all are busy"""
+        if self.in_flight < self.config.max_concurrency and not self.queued:
+            self.in_flight += 1
+            return
+
+        max_queue = self.config.max_queue_size
+        if max_queue is not None and self.queued >= max_queue:
+            self.rejected += 1
+            raise OverloadedError(
+                f"Request queue is full ({self.queued} waiting)", self.queued
+            )
+
+        future = asyncio.get_event_loop().create_future()
+        heapq.heappush(
+            self._waiters,
+            (PRIORITY_RANKS.get(priority, 1), next(self._sequence), future),
+        )
+        self.queued += 1
+        self.total_queued += 1
+        self.peak_queued = max(self.peak_queued, self.queued)
+        start_time = time.monotonic()
+
+        timeout = self.config.queue_timeout
+        try:
+            await asyncio.wait_for(
+                future, timeout / 1000.0 if timeout is not None else None
+            )
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                # Handed a slot as the wait timed out, release() dequeued us
+                return
+            self.queued -= 1
+            self.rejected += 1
+            raise OverloadedError(
+                f"Request waited more than {timeout}ms for a slot", self.queued
+            ) from None
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just before cancellation
+                self.release()
+            else:
+                self.queued -= 1
+            raise
+        finally:
+            self.total_queue_time += time.monotonic() - start_time
+
+    def release(self) -> None:
+        """Hand the slot to the next waiter or free it"""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                self.queued -= 1
+                future.set_result(None)
+                return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: RequestPriority = "NORMAL") -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block"""
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get limiter statistics"""
+        return {
+            "max_concurrency": self.config.max_concurrency,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "peak_queued": self.peak_queued,
+            "rejected": self.rejected,
+            "average_queue_time": (
+                self.total_queue_time * 1000 / self.total_queued
+                if self.total_queued
+                else 0.0
+            ),
+        }
@@ -4,19 +4,55 @@ Managers for agents and tasks
 
 import asyncio
 import logging
-from typing import List, Optional, Dict, Any
-
-from .types import Agent, AgentCreateParams, Task, TaskSubmitParams, TaskStatus
-from .errors import TimeoutError as ClientTimeoutError
+from typing import AsyncIterator, List, Optional, Dict, Any, Sequence, Tuple, Union
+from urllib.parse import quote
+
+from .types import (
+    Agent,
+    AgentCreateParams,
+    Task,
+    TaskError,
+    TaskResult,
+    TaskSubmitParams,
+    TaskStatus,
+    TERMINAL_TASK_STATUSES,
+    LAZY_TASK_FIELDS,
+)
+from .errors import (
+    AgentClientError,
+    DeadlineExceededError,
+    NotFoundError,
+    StreamError,
+    TimeoutError as ClientTimeoutError,
+)
+from .cache import CacheConfig, NOT_MODIFIED, TTLCache
+from .deadline import get_deadline
+from .events import TaskEventStream
+from .pagination import paginate
+from .polling import PollConfig, TaskPoller
+from .streaming import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_MAX_MEMORY,
+    RESULT_OUTPUT_PATH,
+    ResultBuffer,
+    item_parser,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class AgentsManager:
-    """Manage agent operations"""
+    """Manage agent operations
+
+    With a ``CacheConfig``, ``get`` and the status/capability helpers read
+    through an LRU/TTL cache that ``update`` and ``delete`` invalidate.
+    """
 
-    def __init__(self, client):
+    def __init__(self, client, cache_config: Optional[CacheConfig] = None):
         self.client = client
+        self.cache: Optional[TTLCache[Agent]] = (
+            TTLCache(cache_config) if cache_config else None
+        )
 
     async def create(self, params: AgentCreateParams) -> Agent:
         """Create a new agent"""
@@ -27,12 +63,35 @@ class AgentsManager:
             **({"metadata": params.metadata} if params.metadata else {}),
         }
         result = await self.client.request("POST", "/agents", data)
-        return self._to_agent(result)
+        agent = self._to_agent(result)
+        if self.cache is not None:
+            self.cache.put(agent.id, agent)
+        return agent
 
-    async def get(self, agent_id: str) -> Agent:
+    async def get(self, agent_id: str, use_cache: bool = True) -> Agent:
         """Get agent by ID"""
-        result = await self.client.request("GET", f"/agents/{agent_id}")
-        return self._to_agent(result)
+        if self.cache is None:
+            agent, _ = await self._fetch(agent_id)
+            return agent
+        if not use_cache:
+            self.cache.invalidate(agent_id)
+        return await self.cache.get(agent_id, lambda etag: self._fetch(agent_id, etag))
+
+    async def _fetch(
+        self, agent_id: str, etag: Optional[str] = None
+    ) -> Tuple[Any, Optional[str]]:
+        """Fetch an agent, conditionally when given an ETag"""
+        info: Dict[str, Any] = {}
+        result = await self.client.request(
+            "GET",
+            f"/agents/{agent_id}",
+            headers={"If-None-Match": etag} if etag else None,
+            response_info=info,
+        )
+        new_etag = info["headers"].get("ETag")
+        if info["status"] == 304:
+            return NOT_MODIFIED, new_etag
+        return self._to_agent(result), new_etag
 
     async def list(
         self,
@@ -40,26 +99,71 @@ class AgentsManager:
         limit: int = 10,
         agent_type: Optional[str] = None,
         status: Optional[str] = None,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """List agents"""
-        params = [f"page={page}", f"limit={limit}"]
+        path = self._list_path(page, limit, agent_type, status, cursor)
+        result = await self.client.request("GET", path)
+        return result
+
+    async def iter_all(
+        self,
+        limit: int = 100,
+        agent_type: Optional[str] = None,
+        status: Optional[str] = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Agent]:
+        """Iterate over every agent, fetching pages as needed"""
+
+        async def fetch(page: int, cursor: Optional[str]) -> Any:
+            path = self._list_path(page, limit, agent_type, status, cursor)
+            return await self.client.request("GET", path, envelope=True)
+
+        async for agent in paginate(fetch, self._to_agent, limit, prefetch):
+            yield agent
+
+    @staticmethod
+    def _list_path(
+        page: int = 1,
+        limit: int = 10,
+        agent_type: Optional[str] = None,
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+    ) -> str:
+        """Build the agent list path"""
+        # Keyset cursors replace page numbers when the server hands them out
+        params = [
+            f"cursor={quote(cursor, safe='')}" if cursor else f"page={page}",
+            f"limit={limit}",
+        ]
         if agent_type:
             params.append(f"type={agent_type}")
         if status:
             params.append(f"status={status}")
 
         query = "&".join(params)
-        result = await self.client.request("GET", f"/agents?{query}")
-        return result
+        return f"/agents?{query}"
 
     async def update(self, agent_id: str, updates: Dict[str, Any]) -> Agent:
         """Update agent"""
+        if self.cache is not None:
+            self.cache.invalidate(agent_id)
         result = await self.client.request("PUT", f"/agents/{agent_id}", updates)
-        return self._to_agent(result)
+        agent = self._to_agent(result)
+        if self.cache is not None:
+            self.cache.put(agent_id, agent)
+        return agent
 
     async def delete(self, agent_id: str) -> None:
         """Delete agent"""
-        await self.client.request("DELETE", f"/agents/{agent_id}")
+        if self.cache is not None:
+            self.cache.invalidate(agent_id)
+        try:
+            await self.client.request("DELETE", f"/agents/{agent_id}")
+        finally:
+            if self.cache is not None:
+                # Drop anything fetched while the delete was in flight
+                self.cache.invalidate(agent_id)
 
     async def get_status(self, agent_id: str) -> str:
         """Get agent status"""
@@ -93,28 +197,33 @@ class AgentsManager:
 class TasksManager:
     """Manage task operations"""
 
-    def __init__(self, client):
+    def __init__(self, client, poll_config: Optional[PollConfig] = None):
         self.client = client
-        self.poll_interval = 1  # 1 second
+        self.poll_interval = 1  # 1 second, initial per-task interval
         self.max_poll_wait = 3600  # 1 hour
+        # "auto" uses the event stream when available, else polling
+        self.completion_mode = "auto"
+        self.events = TaskEventStream(client)
+        self.poller = TaskPoller(self, poll_config)
+        self.batch_chunk_size = 100
+        self.batch_concurrency = 4
+        # None until the first batch tells us whether POST /tasks/batch exists
+        self._bulk_supported: Optional[bool] = None
+        # Likewise for GET /tasks/{id}/result
+        self._result_route: Optional[bool] = None
 
     async def submit(self, params: TaskSubmitParams) -> Task:
         """Submit a task"""
-        data = {
-            "name": params.name,
-            "type": params.type,
-            "payload": params.payload,
-            **({"description": params.description} if params.description else {}),
-            **({"priority": params.priority} if params.priority else {}),
-            **({"config": params.config} if params.config else {}),
-            **({"metadata": params.metadata} if params.metadata else {}),
-        }
-        result = await self.client.request("POST", "/tasks", data)
+        result = await self.client.request(
+            "POST", "/tasks", self._submit_data(params), lazy=LAZY_TASK_FIELDS
+        )
         return self._to_task(result)
 
     async def get(self, task_id: str) -> Task:
         """Get task by ID"""
-        result = await self.client.request("GET", f"/tasks/{task_id}")
+        result = await self.client.request(
+            "GET", f"/tasks/{task_id}", lazy=LAZY_TASK_FIELDS
+        )
         return self._to_task(result)
 
     async def list(
@@ -123,17 +232,56 @@ class TasksManager:
         limit: int = 10,
         status: Optional[str] = None,
         agent_id: Optional[str] = None,
+        ids: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """List tasks"""
-        params = [f"page={page}", f"limit={limit}"]
+        path = self._list_path(page, limit, status, agent_id, ids, cursor)
+        result = await self.client.request("GET", path)
+        return result
+
+    async def iter_all(
+        self,
+        limit: int = 100,
+        status: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[Task]:
+        """Iterate over every task, fetching pages as needed"""
+
+        async def fetch(page: int, cursor: Optional[str]) -> Any:
+            path = self._list_path(page, limit, status, agent_id, cursor=cursor)
+            return await self.client.request(
+                "GET", path, lazy=LAZY_TASK_FIELDS, envelope=True
+            )
+
+        async for task in paginate(fetch, self._to_task, limit, prefetch):
+            yield task
+
+    @staticmethod
+    def _list_path(
+        page: int = 1,
+        limit: int = 10,
+        status: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        ids: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+    ) -> str:
+        """Build the task list path"""
+        params = [
+            f"cursor={quote(cursor, safe='')}" if cursor else f"page={page}",
+            f"limit={limit}",
+        ]
         if status:
             params.append(f"status={status}")
         if agent_id:
             params.append(f"agentId={agent_id}")
+        if ids:
+            # Commas separate the ids, so ones inside an id are escaped
+            params.append(f"ids={','.join(quote(str(id_), safe='') for id_ in ids)}")
 
         query = "&".join(params)
-        result = await self.client.request("GET", f"/tasks?{query}")
-        return result
+        return f"/tasks?{query}"
 
     async def get_status(self, task_id: str) -> TaskStatus:
         """Get task status"""
@@ -141,63 +289,421 @@ class TasksManager:
         return task.status
 
     async def wait_for_completion(
-        self, task_id: str, timeout: Optional[int] = None
+        self,
+        task_id: str,
+        timeout: Optional[int] = None,
+        mode: Optional[str] = None,
     ) -> Task:
-        """Wait for task completion"""
-        start_time = asyncio.get_event_loop().time()
+        """Wait for task completion
+
+        ``mode`` is ``"push"`` (task event stream only), ``"poll"`` or
+        ``"auto"`` (stream with polling fallback), defaulting to
+        ``completion_mode``. Never waits past the caller's ``deadline()``.
+        """
+        loop = asyncio.get_event_loop()
         effective_timeout = timeout or self.max_poll_wait
+        deadline = loop.time() + effective_timeout
+        caller_deadline = get_deadline()
+        if caller_deadline is not None and caller_deadline < deadline:
+            deadline = caller_deadline
+            effective_timeout = max(deadline - loop.time(), 0)
+        mode = mode or self.completion_mode
+
+        if mode != "poll" and self.events.available is not False:
+            try:
+                return await self._wait_push(task_id, deadline, effective_timeout)
+            except StreamError as error:
+                if mode == "push":
+                    raise
+                logger.debug(f"Falling back to polling for task {task_id}: {error}")
+
+        return await self._wait_poll(task_id, deadline, effective_timeout)
+
+    async def _wait_push(
+        self, task_id: str, deadline: float, effective_timeout: float
+    ) -> Task:
+        """Wait for the task's terminal event on the shared stream"""
+        loop = asyncio.get_event_loop()
 
         while True:
-            task = await self.get(task_id)
-
-            # Task completed or failed
-            if task.status in [
-                "COMPLETED",
-                "FAILED",
-                "CANCELLED",
-                "TIMED_OUT",
-            ]:
-                return task
-
-            # Check timeout
-            elapsed = asyncio.get_event_loop().time() - start_time
-            if elapsed > effective_timeout:
-                raise ClientTimeoutError(
-                    f"Task {task_id} did not complete within {effective_timeout}s",
-                    int(effective_timeout * 1000),
-                )
+            future = self.events.subscribe(task_id)
+            try:
+                remaining = deadline - loop.time()
+                try:
+                    await asyncio.wait_for(self.events.connect(), max(remaining, 0))
+                except asyncio.TimeoutError:
+                    raise self._completion_timeout(
+                        task_id, effective_timeout, deadline
+                    ) from None
+
+                # Check after subscribing so a completion between submit and
+                # subscribe isn't missed
+                task = await self.get(task_id)
+                if task.status in TERMINAL_TASK_STATUSES:
+                    return task
+
+                try:
+                    data = await asyncio.wait_for(
+                        future, max(deadline - loop.time(), 0)
+                    )
+                except asyncio.TimeoutError:
+                    raise self._completion_timeout(
+                        task_id, effective_timeout, deadline
+                    ) from None
+            finally:
+                self.events.unsubscribe(task_id, future)
+
+            # None means the stream reconnected, so re-check the task
+            if data is not None:
+                try:
+                    return self._to_task(data)
+                except KeyError:
+                    # Event only carried id and status
+                    return await self.get(task_id)
+
+    async def _wait_poll(
+        self, task_id: str, deadline: float, effective_timeout: float
+    ) -> Task:
+        """Wait on the shared poll scheduler"""
+        remaining = deadline - asyncio.get_event_loop().time()
+        try:
+            return await asyncio.wait_for(self.poller.wait(task_id), max(remaining, 0))
+        except asyncio.TimeoutError:
+            raise self._completion_timeout(
+                task_id, effective_timeout, deadline
+            ) from None
 
-            # Wait before next poll
-            await asyncio.sleep(self.poll_interval)
+    @staticmethod
+    def _completion_timeout(
+        task_id: str, timeout: float, deadline: float
+    ) -> ClientTimeoutError:
+        if deadline == get_deadline():
+            return DeadlineExceededError(
+                f"Task {task_id} did not complete before the deadline",
+                int(timeout * 1000),
+            )
+        return ClientTimeoutError(
+            f"Task {task_id} did not complete within {timeout}s",
+            int(timeout * 1000),
+        )
 
     async def cancel(self, task_id: str, reason: Optional[str] = None) -> Task:
         """Cancel a task"""
         data = {"reason": reason or "Cancelled by client"}
         result = await self.client.request(
-            "POST", f"/tasks/{task_id}/cancel", data
+            "POST", f"/tasks/{task_id}/cancel", data, lazy=LAZY_TASK_FIELDS
         )
         return self._to_task(result)
 
     async def retry(self, task_id: str) -> Task:
         """Retry a task"""
-        result = await self.client.request("POST", f"/tasks/{task_id}/retry")
+        result = await self.client.request(
+            "POST", f"/tasks/{task_id}/retry", lazy=LAZY_TASK_FIELDS
+        )
         return self._to_task(result)
 
-    async def get_result(self, task_id: str) -> Optional[Dict[str, Any]]:
-        """Get task result"""
+    async def get_result(self, task_id: str) -> Optional[TaskResult]:
+        """Get task result
+
+        Reads ``GET /tasks/{id}/result``, or the task itself on servers
+        without that route. Returns None while the task has no result; once
+        the route has answered, its 404s are taken to mean just that. Use
+        ``iter_result_items`` or ``download_result`` for results too large to
+        hold in memory.
+        """
+        if self._result_route is not False:
+            try:
+                result = await self.client.request("GET", self._result_path(task_id))
+            except AgentClientError as error:
+                if self._result_route and isinstance(error, NotFoundError):
+                    # The route has answered before, the task has no result yet
+                    return None
+                task = await self._result_fallback(task_id, error)
+                return task.result
+            self._result_route = True
+            if not isinstance(result, dict):
+                return None
+            return TaskResult.from_dict(result, task_id)
         task = await self.get(task_id)
         return task.result
 
-    async def get_error(self, task_id: str) -> Optional[Dict[str, Any]]:
+    async def stream_result(
+        self,
+        task_id: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        response_info: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[bytes]:
+        """Stream the ``GET /tasks/{id}/result`` body in chunks
+
+        The body is the JSON response envelope, decompressed, and
+        ``response_info`` receives the response's ``status`` and
+        ``headers`` as with ``AgentClient.request``. On servers without the
+        route the result is read from the task and re-encoded in the same
+        shape, which holds it in memory.
+        """
+        if self._result_route is not False:
+            chunks = self.client.stream(
+                "GET",
+                self._result_path(task_id),
+                chunk_size,
+                response_info=response_info,
+            )
+            try:
+                try:
+                    first = await chunks.__anext__()
+                except StopAsyncIteration:
+                    self._result_route = True
+                    return
+                except AgentClientError as error:
+                    task = await self._result_fallback(task_id, error)
+                    if task.result is None:
+                        # Nothing to stream yet, report the route's answer
+                        raise error
+                else:
+                    self._result_route = True
+                    yield first
+                    async for chunk in chunks:
+                        yield chunk
+                    return
+            finally:
+                await chunks.aclose()
+        else:
+            task = await self.get(task_id)
+
+        body = self.client.serializer.dumps(
+            {"success": True, "data": self._result_data(task)}
+        )
+        for start in range(0, len(body), chunk_size):
+            yield body[start : start + chunk_size]
+
+    async def iter_result_items(
+        self,
+        task_id: str,
+        path: Sequence[str] = RESULT_OUTPUT_PATH,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> AsyncIterator[Any]:
+        """Decode a task result incrementally, item by item
+
+        Yields the elements of the array at ``path`` in the result body
+        (``data.output`` by default), or the value there if it isn't an
+        array, holding only the item being read in memory. Newline-delimited
+        JSON bodies yield one item per line.
+        """
+        response_info: Dict[str, Any] = {}
+        parser = None
+        chunks = self.stream_result(task_id, chunk_size, response_info)
+        try:
+            async for chunk in chunks:
+                if parser is None:
+                    headers = response_info.get("headers") or {}
+                    parser = item_parser(
+                        headers.get("Content-Type"), path, self.client.serializer.loads
+                    )
+                for item in parser.feed(chunk):
+                    yield item
+        finally:
+            await chunks.aclose()
+        if parser is not None:
+            for item in parser.close():
+                yield item
+
+    async def download_result(
+        self,
+        task_id: str,
+        max_memory: int = DEFAULT_MAX_MEMORY,
+        directory: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> ResultBuffer:
+        """Download a task result body into a ResultBuffer
+
+        Bodies past ``max_memory`` bytes are spilled to a temporary file in
+        ``directory`` and can be memory-mapped with ``ResultBuffer.view``.
+        """
+        response_info: Dict[str, Any] = {}
+        buffer = ResultBuffer(
+            self.client.serializer.loads, max_memory=max_memory, directory=directory
+        )
+        try:
+            async for chunk in self.stream_result(task_id, chunk_size, response_info):
+                buffer.write(chunk)
+        except BaseException:
+            buffer.close()
+            raise
+        headers = response_info.get("headers") or {}
+        buffer.content_type = headers.get("Content-Type")
+        return buffer
+
+    @staticmethod
+    def _result_path(task_id: str) -> str:
+        return f"/tasks/{task_id}/result"
+
+    async def _result_fallback(self, task_id: str, error: AgentClientError) -> Task:
+        """Read the task after the result route failed with ``error``
+
+        A 404 also means a pending task has no result yet, so the task
+        decides: one that has a result shows the route is missing, unless
+        the route has answered before. Other errors are re-raised.
+        """
+        if not self._is_missing_route(error):
+            raise error
+        task = await self.get(task_id)
+        if self._result_route is None and (
+            task.result is not None or not isinstance(error, NotFoundError)
+        ):
+            self._result_route = False
+            logger.info("Task result route unavailable, reading results from tasks")
+        return task
+
+    @staticmethod
+    def _result_data(task: Task) -> Optional[Dict[str, Any]]:
+        """A task's result in the shape of the result route's ``data``"""
+        result = task.result
+        if result is None:
+            return None
+        return {
+            "taskId": result.task_id or task.id,
+            "status": result.status,
+            "output": result.output,
+            "completedAt": result.completed_at,
+        }
+
+    async def get_error(self, task_id: str) -> Optional[TaskError]:
         """Get task error"""
         task = await self.get(task_id)
         return task.error
 
-    async def submit_batch(self, task_params: List[TaskSubmitParams]) -> List[Task]:
-        """Submit multiple tasks"""
-        return await asyncio.gather(
-            *[self.submit(params) for params in task_params]
+    async def submit_batch(
+        self,
+        task_params: List[TaskSubmitParams],
+        chunk_size: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        return_exceptions: bool = False,
+    ) -> List[Union[Task, Exception]]:
+        """Submit multiple tasks
+
+        Tasks are sent in chunks to ``POST /tasks/batch`` with at most
+        ``max_concurrency`` chunks in flight, falling back to per-task
+        submits when the server has no bulk route. Results are returned in
+        input order; with ``return_exceptions`` failed entries hold their
+        error, otherwise the first failure is raised.
+        """
+        chunk_size = chunk_size or self.batch_chunk_size
+        semaphore = asyncio.Semaphore(max_concurrency or self.batch_concurrency)
+        results: List[Union[Task, Exception]] = []
+
+        async def submit_chunk(start: int) -> List[Union[Task, Exception]]:
+            async with semaphore:
+                return await self._submit_chunk(task_params[start : start + chunk_size])
+
+        chunks = await asyncio.gather(
+            *[submit_chunk(start) for start in range(0, len(task_params), chunk_size)]
         )
+        for chunk in chunks:
+            results.extend(chunk)
+
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+        return results
+
+    async def _submit_chunk(
+        self, chunk: List[TaskSubmitParams]
+    ) -> List[Union[Task, Exception]]:
+        """Submit one chunk through the bulk route or per-task fallback"""
+        if self._bulk_supported is not False:
+            try:
+                result = await self.client.request(
+                    "POST",
+                    "/tasks/batch",
+                    {"tasks": [self._submit_data(params) for params in chunk]},
+                    priority="BULK",
+                    # A batch retried after a timeout or plain 5xx could
+                    # create the tasks twice
+                    idempotent=False,
+                )
+            except AgentClientError as error:
+                if not self._is_missing_route(error):
+                    return [error] * len(chunk)
+                self._bulk_supported = False
+                logger.info("Bulk task route unavailable, submitting tasks one by one")
+            else:
+                self._bulk_supported = True
+                return self._from_bulk_result(result, len(chunk))
+
+        async def submit_one(params: TaskSubmitParams) -> Union[Task, Exception]:
+            try:
+                result = await self.client.request(
+                    "POST",
+                    "/tasks",
+                    self._submit_data(params),
+                    priority="BULK",
+                    lazy=LAZY_TASK_FIELDS,
+                    idempotent=False,
+                )
+                return self._to_task(result)
+            except Exception as error:
+                return error
+
+        return await asyncio.gather(*[submit_one(params) for params in chunk])
+
+    @staticmethod
+    def _is_missing_route(error: AgentClientError) -> bool:
+        """Check if an error means the server lacks the route"""
+        return isinstance(error, NotFoundError) or error.status_code in (405, 501)
+
+    def _from_bulk_result(
+        self, result: Any, expected: int
+    ) -> List[Union[Task, Exception]]:
+        """Convert a bulk submit response into per-task results"""
+        items = result
+        if isinstance(result, dict):
+            items = result.get("results", result.get("tasks"))
+
+        if not isinstance(items, list) or len(items) != expected:
+            error = AgentClientError(
+                f"Bulk submit returned an unexpected response for {expected} tasks",
+                "INVALID_RESPONSE",
+            )
+            return [error] * expected
+
+        converted: List[Union[Task, Exception]] = []
+        for item in items:
+            if not isinstance(item, dict):
+                converted.append(
+                    AgentClientError(
+                        "Bulk submit returned an invalid entry", "INVALID_RESPONSE"
+                    )
+                )
+                continue
+            if item.get("success") is False or ("error" in item and "id" not in item):
+                error = item.get("error") or {}
+                if not isinstance(error, dict):
+                    error = {"message": str(error)}
+                converted.append(
+                    AgentClientError(
+                        error.get("message", "Unknown error"),
+                        error.get("code", "UNKNOWN"),
+                        item.get("status"),
+                        error.get("details"),
+                    )
+                )
+                continue
+            try:
+                converted.append(self._to_task(item.get("data", item)))
+            except (KeyError, TypeError, ValueError) as error:
+                converted.append(
+                    AgentClientError(
+                        f"Bulk submit returned an invalid task: {error!r}",
+                        "INVALID_RESPONSE",
+                    )
+                )
+        return converted
+
+    async def close(self) -> None:
+        """Stop the task event stream and poller"""
+        await self.events.close()
+        await self.poller.close()
 
     async def wait_for_all(
         self, task_ids: List[str], timeout: Optional[int] = None
@@ -207,9 +713,22 @@ class TasksManager:
             *[self.wait_for_completion(task_id, timeout) for task_id in task_ids]
         )
 
+    @staticmethod
+    def _submit_data(params: TaskSubmitParams) -> Dict[str, Any]:
+        """Build the request body for a task submission"""
+        return {
+            "name": params.name,
+            "type": params.type,
+            "payload": params.payload,
+            **({"description": params.description} if params.description else {}),
+            **({"priority": params.priority} if params.priority else {}),
+            **({"config": params.config} if params.config else {}),
+            **({"metadata": params.metadata} if params.metadata else {}),
+        }
+
     @staticmethod
     def _to_task(data: Dict[str, Any]) -> Task:
-        """Convert dict to Task"""
+        """Convert dict to Task, nested result/error are converted on access"""
         return Task(
             id=data["id"],
             name=data["name"],
@@ -0,0 +1,100 @@
+"""
+Async iteration over paginated list endpoints
+"""
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Pagination fields servers use for the next keyset cursor
+CURSOR_FIELDS = ("nextCursor", "next_cursor", "cursor")
+
+
+def parse_page(result: Any) -> Tuple[List[Any], Dict[str, Any]]:
+    """Split a list response (or its whole envelope) into records and pagination"""
+    if isinstance(result, list):
+        return result, {}
+    if not isinstance(result, dict):
+        return [], {}
+
+    pagination = dict(result.get("pagination") or {})
+    for key in CURSOR_FIELDS:
+        if key in result and key not in pagination:
+            pagination[key] = result[key]
+    items = result.get("data")
+    if isinstance(items, dict):
+        # Response envelope around a page object
+        items, inner = parse_page(items)
+        pagination = {**inner, **pagination}
+    elif items is None:
+        items = result.get("items", [])
+    return items, pagination
+
+
+def next_cursor(pagination: Dict[str, Any]) -> Optional[str]:
+    for key in CURSOR_FIELDS:
+        if pagination.get(key):
+            return str(pagination[key])
+    return None
+
+
+def has_more(pagination: Dict[str, Any], page: int, count: int, limit: int) -> bool:
+    """Check if another page follows, from whatever the server reported"""
+    for key in ("hasNext", "hasMore", "has_more"):
+        if key in pagination:
+            return bool(pagination[key])
+    if next_cursor(pagination):
+        return True
+    if pagination.get("pages") is not None:
+        return page < int(pagination["pages"])
+    if pagination.get("total") is not None:
+        return page * limit < int(pagination["total"])
+    # Nothing reported, a short page is the last one
+    return count >= limit
+
+
+async def paginate(
+    fetch: Callable[[int, Optional[str]], Awaitable[Any]],
+    convert: Callable[[Dict[str, Any]], T],
+    limit: int,
+    prefetch: bool = True,
+) -> AsyncIterator[T]:
+    """Yield converted records page by page
+
+    ``fetch(page, cursor)`` loads one page as the whole response envelope,
+    so its ``pagination`` decides when to stop; a cursor from the server
+    takes over from page numbers once seen. With ``prefetch`` the next page
+    is requested while the current one is being consumed.
+    """
+    page = 1
+    pending: Optional[asyncio.Future] = asyncio.ensure_future(fetch(page, None))
+    try:
+        while True:
+            items, pagination = parse_page(await pending)
+            pending = None
+
+            more = bool(items) and has_more(pagination, page, len(items), limit)
+            if more:
+                cursor = next_cursor(pagination)
+                page += 1
+                if prefetch:
+                    pending = asyncio.ensure_future(fetch(page, cursor))
+
+            for item in items:
+                yield convert(item)
+
+            if not more:
+                return
+            if pending is None:
+                pending = asyncio.ensure_future(fetch(page, cursor))
+    finally:
+        # The consumer stopped early, don't leave the prefetch running
+        if pending is not None:
+            if not pending.done():
+                pending.cancel()
+            elif not pending.cancelled():
+                pending.exception()
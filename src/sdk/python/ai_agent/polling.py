@@ -0,0 +1,271 @@
+"""
+Batched, adaptive task status polling
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from .deadline import clear_deadline
+from .errors import AgentClientError, NotFoundError
+from .pagination import parse_page
+from .types import Task, TERMINAL_TASK_STATUSES, LAZY_TASK_FIELDS
+
+logger = logging.getLogger(__name__)
+
+
+class PollConfig:
+    """Adaptive polling configuration"""
+
+    def __init__(
+        self,
+        max_interval: int = 5000,
+        runtime_factor: float = 0.1,
+        batch_size: int = 100,
+    ):
+        # Cap (ms) on a task's poll interval, which never drops below
+        # TasksManager.poll_interval
+        self.max_interval = max_interval
+        # Fraction of the task's observed runtime used as the poll interval
+        self.runtime_factor = runtime_factor
+        self.batch_size = batch_size
+
+
+class _PollEntry:
+    """Polling state for one task"""
+
+    __slots__ = ("futures", "first_seen", "next_poll", "interval")
+
+    def __init__(self, now: float, interval: float) -> None:
+        self.futures: List[asyncio.Future] = []
+        self.first_seen = now
+        self.next_poll = now
+        self.interval = interval
+
+
+class TaskPoller:
+    """Shared poll scheduler for task completion
+
+    Outstanding task ids are coalesced into ``GET /tasks?ids=...`` lookups
+    of up to ``batch_size`` ids. Each task backs off on its own schedule,
+    proportional to how long it has been running, and is dropped as soon
+    as it reaches a terminal status. Servers that ignore the id filter are
+    detected and polled per task instead.
+    """
+
+    def __init__(self, manager, config: Optional[PollConfig] = None):
+        self.manager = manager
+        self.config = config or PollConfig()
+        # None until the first batch tells us whether ids= is honoured
+        self.batch_supported: Optional[bool] = None
+
+        self._entries: Dict[str, _PollEntry] = {}
+        self._runner: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self.polls = 0
+        self.requests = 0
+
+    async def wait(self, task_id: str) -> Task:
+        """Wait until the task reaches a terminal status"""
+        loop = asyncio.get_event_loop()
+        entry = self._entries.get(task_id)
+        if entry is None:
+            entry = _PollEntry(loop.time(), self.manager.poll_interval)
+            self._entries[task_id] = entry
+
+        future = loop.create_future()
+        entry.futures.append(future)
+        self._ensure_running()
+
+        try:
+            return await future
+        finally:
+            if self._entries.get(task_id) is entry and future in entry.futures:
+                entry.futures.remove(future)
+                if not entry.futures:
+                    del self._entries[task_id]
+
+    def _ensure_running(self) -> None:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.ensure_future(self._run())
+        else:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        """Poll due tasks until none are outstanding"""
+        # Started by whichever waiter came first, its deadline isn't ours
+        clear_deadline()
+        try:
+            await self._poll_due()
+        except Exception as error:
+            # Waiters would otherwise hang until their own timeout
+            logger.exception("Task poller failed")
+            for task_id in list(self._entries):
+                self._settle(task_id, error=error)
+
+    async def _poll_due(self) -> None:
+        loop = asyncio.get_event_loop()
+        while self._entries:
+            now = loop.time()
+            due = [
+                task_id
+                for task_id, entry in self._entries.items()
+                if entry.next_poll <= now
+            ]
+
+            size = self.config.batch_size
+            await asyncio.gather(
+                *[self._poll(due[i : i + size]) for i in range(0, len(due), size)]
+            )
+
+            if not self._entries:
+                break
+            next_poll = min(entry.next_poll for entry in self._entries.values())
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), max(next_poll - loop.time(), 0)
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll(self, task_ids: List[str]) -> None:
+        """Fetch statuses for a batch of tasks and settle terminal ones"""
+        self.polls += 1
+        tasks: Dict[str, Any] = {}
+
+        try:
+            if self.batch_supported is not False and len(task_ids) > 1:
+                try:
+                    tasks = await self._fetch_batch(task_ids)
+                except AgentClientError as error:
+                    if not self.manager._is_missing_route(error):
+                        raise
+                    self.batch_supported = False
+            missing = [task_id for task_id in task_ids if task_id not in tasks]
+            if missing:
+                tasks.update(await self._fetch_each(missing))
+        except AgentClientError as error:
+            logger.debug(f"Task status poll failed: {error}")
+
+        now = asyncio.get_event_loop().time()
+        for task_id in task_ids:
+            entry = self._entries.get(task_id)
+            if entry is None:
+                continue
+
+            task = tasks.get(task_id)
+            if isinstance(task, Exception):
+                self._settle(task_id, error=task)
+            elif task is not None and task.status in TERMINAL_TASK_STATUSES:
+                self._settle(task_id, task=task)
+            else:
+                self._reschedule(entry, now)
+
+    async def _fetch_batch(self, task_ids: List[str]) -> Dict[str, Any]:
+        """Look up several tasks with one list request"""
+        self.requests += 1
+        # Payloads are skipped over, only statuses matter until completion
+        page = await self.manager.client.request(
+            "GET",
+            self.manager._list_path(limit=len(task_ids), ids=task_ids),
+            lazy=LAZY_TASK_FIELDS,
+        )
+        items, _ = parse_page(page)
+        if not items:
+            # The tasks exist, so the server doesn't know the id filter
+            self.batch_supported = False
+            logger.info("Task list returned none of the ids, polling tasks one by one")
+            return {}
+
+        requested = set(task_ids)
+        tasks = {}
+        incomplete = False
+        for item in items:
+            if not isinstance(item, dict) or item.get("id") not in requested:
+                # The server ignored the id filter
+                self.batch_supported = False
+                logger.info("Task list ignores the ids filter, polling tasks one by one")
+                return {}
+            try:
+                tasks[item["id"]] = self.manager._to_task(item)
+            except (KeyError, TypeError, ValueError) as error:
+                # Left out here, so it is fetched on its own
+                logger.debug(f"Incomplete task {item['id']!r} in list: {error!r}")
+                incomplete = True
+
+        # A list without full tasks would cost a lookup per task on top
+        self.batch_supported = not incomplete
+        if incomplete:
+            logger.info("Task list items are incomplete, polling tasks one by one")
+        return tasks
+
+    async def _fetch_each(self, task_ids: List[str]) -> Dict[str, Any]:
+        """Look up tasks individually"""
+        self.requests += len(task_ids)
+
+        async def fetch(task_id: str) -> Any:
+            try:
+                return await self.manager.get(task_id)
+            except NotFoundError as error:
+                return error
+            except AgentClientError:
+                return None
+            except Exception as error:
+                # A malformed task won't read any better on the next poll
+                return AgentClientError(
+                    f"Invalid task {task_id!r}: {error!r}", "INVALID_RESPONSE"
+                )
+
+        results = await asyncio.gather(*[fetch(task_id) for task_id in task_ids])
+        return {
+            task_id: result
+            for task_id, result in zip(task_ids, results)
+            if result is not None
+        }
+
+    def _reschedule(self, entry: _PollEntry, now: float) -> None:
+        """Back off based on the task's observed runtime"""
+        runtime = now - entry.first_seen
+        entry.interval = min(
+            max(self.manager.poll_interval, runtime * self.config.runtime_factor),
+            max(self.manager.poll_interval, self.config.max_interval / 1000.0),
+        )
+        entry.next_poll = now + entry.interval
+
+    def _settle(
+        self,
+        task_id: str,
+        task: Optional[Task] = None,
+        error: Optional[Exception] = None,
+    ) -> None:
+        entry = self._entries.pop(task_id)
+        for future in entry.futures:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(task)
+
+    async def close(self) -> None:
+        """Stop polling"""
+        if self._runner:
+            self._runner.cancel()
+            self._runner = None
+        for entry in self._entries.values():
+            for future in entry.futures:
+                if not future.done():
+                    future.cancel()
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get poller statistics"""
+        return {
+            "outstanding": len(self._entries),
+            "polls": self.polls,
+            "requests": self.requests,
+            "batch_supported": self.batch_supported,
+        }
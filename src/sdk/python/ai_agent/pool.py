@@ -4,62 +4,251 @@ Connection pool for managing HTTP connections
 
 import asyncio
 import logging
-from typing import Optional
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
 import aiohttp
 
+from .errors import ConnectionError, PoolTimeoutError
+
 logger = logging.getLogger(__name__)
 
 
 class PoolConfig:
     """Connection pool configuration"""
 
-    def __init__(self, max_connections: int = 10, max_idle_time: int = 60000):
+    def __init__(
+        self,
+        max_connections: int = 10,
+        max_idle_time: int = 60000,
+        max_connections_per_host: int = 0,
+        acquire_timeout: Optional[int] = 30000,
+        keepalive_timeout: Optional[int] = None,
+        use_dns_cache: bool = True,
+        dns_cache_ttl: Optional[int] = 10000,
+        happy_eyeballs_delay: Optional[int] = None,
+    ):
+        # Requests in flight at once, also the connector's socket limit
         self.max_connections = max_connections
+        # Time (ms) the connector keeps an idle socket open
         self.max_idle_time = max_idle_time
+        # 0 means no per-host limit beyond max_connections
+        self.max_connections_per_host = max_connections_per_host
+        # Max time (ms) to wait for a free slot, None waits forever
+        self.acquire_timeout = acquire_timeout
+        # HTTP/1.1 keep-alive (ms), defaults to max_idle_time
+        self.keepalive_timeout = keepalive_timeout
+        # DNS cache TTL (ms), None caches resolved hosts forever
+        self.use_dns_cache = use_dns_cache
+        self.dns_cache_ttl = dns_cache_ttl
+        # RFC 8305 connection attempt delay (ms), None keeps aiohttp's default
+        self.happy_eyeballs_delay = happy_eyeballs_delay
+
+    def connector_kwargs(self) -> Dict[str, Any]:
+        """Build aiohttp.TCPConnector arguments"""
+        keepalive = (
+            self.keepalive_timeout
+            if self.keepalive_timeout is not None
+            else self.max_idle_time
+        )
+        kwargs: Dict[str, Any] = {
+            "limit": self.max_connections,
+            "limit_per_host": self.max_connections_per_host,
+            "keepalive_timeout": keepalive / 1000.0,
+            "use_dns_cache": self.use_dns_cache,
+            "ttl_dns_cache": (
+                self.dns_cache_ttl / 1000.0 if self.dns_cache_ttl is not None else None
+            ),
+        }
+        # Only supported by aiohttp >= 3.10
+        if self.happy_eyeballs_delay is not None:
+            kwargs["happy_eyeballs_delay"] = self.happy_eyeballs_delay / 1000.0
+        return kwargs
+
+
+class PoolSlot:
+    """Permission to run one request, checked out from the pool
+
+    A slot is not a socket: the aiohttp connector owns the sockets and
+    picks a kept-alive one or opens a new one for each request.
+    """
+
+    __slots__ = ("host", "session", "acquired_at")
+
+    def __init__(self, host: str, session: aiohttp.ClientSession) -> None:
+        self.host = host
+        self.session = session
+        self.acquired_at = time.monotonic()
 
 
 class ConnectionPool:
-    """Async connection pool"""
+    """Async connection pool
+
+    Owns the shared aiohttp session and its connector, and bounds the
+    requests in flight with ``max_connections`` slots (per host too with
+    ``max_connections_per_host``). Callers waiting for a slot are served
+    first in, first out: a released slot is handed straight to the oldest
+    waiter that may take it. Socket reuse is measured from connector trace
+    events by the client, not here.
+    """
 
     def __init__(
         self,
         base_url: str,
         headers: dict,
         config: PoolConfig,
+        trace_configs: Optional[List[aiohttp.TraceConfig]] = None,
+        auto_decompress: bool = True,
     ):
         self.base_url = base_url
         self.headers = headers
         self.config = config
-        self.connector = aiohttp.TCPConnector(limit=config.max_connections)
+        self.trace_configs = trace_configs
+        self.auto_decompress = auto_decompress
+        self.default_host = urlsplit(base_url).netloc
+        self.connector = aiohttp.TCPConnector(**config.connector_kwargs())
         self.session: Optional[aiohttp.ClientSession] = None
         self._closed = False
 
+        self._in_use: Dict[str, int] = {}
+        self._total_in_use = 0
+        self._waiters: Deque[Tuple[str, asyncio.Future]] = deque()
+
+        self._checkouts = 0
+        self._discarded = 0
+        # Acquires served at once, after waiting, or given up on
+        self._immediate = 0
+        self._waited = 0
+        self._cancelled = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._total_wait_time = 0.0
+
     async def initialize(self) -> None:
         """Initialize the pool"""
         if self.session is None:
             self.session = aiohttp.ClientSession(
-                connector=self.connector, headers=self.headers
+                connector=self.connector,
+                headers=self.headers,
+                trace_configs=self.trace_configs,
+                auto_decompress=self.auto_decompress,
             )
             logger.debug("Connection pool initialized")
 
-    async def acquire(self) -> aiohttp.ClientSession:
-        """Get a session from the pool"""
+    async def acquire(
+        self, host: Optional[str] = None, timeout: Optional[int] = None
+    ) -> PoolSlot:
+        """Check out a slot, waiting up to ``timeout`` ms"""
         if self.session is None:
             await self.initialize()
-        return self.session
+        if self._closed:
+            raise ConnectionError("Connection pool is closed")
+
+        host = host or self.default_host
+        # Free slots only exist while nobody eligible waits, so this can't
+        # overtake a queued caller
+        if self._can_checkout(host):
+            self._immediate += 1
+            return self._checkout(host)
+
+        wait_ms = self.config.acquire_timeout if timeout is None else timeout
+        self._waits += 1
+        start_time = time.monotonic()
+        waiter = asyncio.get_event_loop().create_future()
+        self._waiters.append((host, waiter))
+        try:
+            slot = await asyncio.wait_for(
+                waiter, wait_ms / 1000.0 if wait_ms is not None else None
+            )
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled() and not waiter.exception():
+                self._waited += 1
+                return waiter.result()
+            self._timeouts += 1
+            raise PoolTimeoutError(
+                f"No connection to {host} available within {wait_ms}ms", wait_ms
+            ) from None
+        except asyncio.CancelledError:
+            self._cancelled += 1
+            # Handed a slot just as the wait was cancelled, pass it on
+            if waiter.done() and not waiter.cancelled() and not waiter.exception():
+                self.release(waiter.result())
+            raise
+        finally:
+            self._remove_waiter(waiter)
+            self._total_wait_time += time.monotonic() - start_time
+        self._waited += 1
+        return slot
+
+    def release(self, slot: PoolSlot, discard: bool = False) -> None:
+        """Return a slot, ``discard`` counts one whose request broke"""
+        host = slot.host
+        self._in_use[host] -= 1
+        self._total_in_use -= 1
+        if discard:
+            self._discarded += 1
+        if not self._closed:
+            self._hand_off()
+
+    def _can_checkout(self, host: str) -> bool:
+        """Check pool-wide and per-host limits for a new checkout"""
+        if self._total_in_use >= self.config.max_connections:
+            return False
+        per_host = self.config.max_connections_per_host
+        return not per_host or self._in_use.get(host, 0) < per_host
+
+    def _checkout(self, host: str) -> PoolSlot:
+        self._checkouts += 1
+        self._in_use[host] = self._in_use.get(host, 0) + 1
+        self._total_in_use += 1
+        return PoolSlot(host, self.session)
+
+    def _hand_off(self) -> None:
+        """Give free slots to the oldest waiters that may take them"""
+        for host, waiter in list(self._waiters):
+            if self._total_in_use >= self.config.max_connections:
+                break
+            if waiter.done() or not self._can_checkout(host):
+                continue
+            self._remove_waiter(waiter)
+            waiter.set_result(self._checkout(host))
+
+    def _remove_waiter(self, waiter: asyncio.Future) -> None:
+        for entry in self._waiters:
+            if entry[1] is waiter:
+                self._waiters.remove(entry)
+                break
 
     async def close(self) -> None:
         """Close the pool"""
+        self._closed = True
+        for _, waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_exception(ConnectionError("Connection pool is closed"))
+        self._waiters.clear()
         if self.session:
             await self.session.close()
-            self._closed = True
             logger.debug("Connection pool closed")
 
     def get_stats(self) -> dict:
-        """Get pool statistics"""
+        """Get slot statistics"""
         return {
             "connector_limit": self.connector.limit,
-            "connector_limited_semaphore": self.connector._limit_sem._value
-            if self.connector._limit_sem
-            else None,
+            "connector_limit_per_host": self.connector.limit_per_host,
+            "in_use": self._total_in_use,
+            "waiting": len(self._waiters),
+            "checkouts": self._checkouts,
+            "immediate": self._immediate,
+            "waited": self._waited,
+            "cancelled": self._cancelled,
+            "discarded": self._discarded,
+            "waits": self._waits,
+            "timeouts": self._timeouts,
+            "total_wait_time": self._total_wait_time * 1000,
+            "average_wait_time": (
+                self._total_wait_time * 1000 / self._waits if self._waits else 0.0
+            ),
+            "hosts": {host: count for host, count in self._in_use.items() if count},
         }
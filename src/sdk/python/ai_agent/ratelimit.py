@@ -0,0 +1,168 @@
+"""
+Client-side rate limiting with adaptive (AIMD) token bucket
+"""
+
+import asyncio
+import email.utils
+import logging
+import math
+import time
+from typing import Any, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitConfig:
+    """Rate limiter configuration"""
+
+    def __init__(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[int] = None,
+        min_rate: float = 1.0,
+        max_rate: Optional[float] = None,
+        additive_increase: float = 1.0,
+        decrease_factor: float = 0.5,
+    ):
+        # Requests per second, None is unlimited until the first 429
+        self.rate = rate
+        # Bucket size, defaults to one second worth of tokens
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        # Requests per second gained per second of successful requests
+        self.additive_increase = additive_increase
+        # Multiplier applied to the rate on every 429
+        self.decrease_factor = decrease_factor
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP-date) into seconds"""
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        # "nan" and "inf" parse as floats but aren't delays
+        return max(seconds, 0.0) if math.isfinite(seconds) else None
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at is None:
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class RateLimiter:
+    """Shared token bucket for outgoing requests
+
+    Every request attempt takes a token. A 429 pauses all requests for the
+    server's ``Retry-After`` window and multiplies the rate by
+    ``decrease_factor``; successful responses grow it back additively.
+    Without a configured rate the bucket is unlimited until the first 429,
+    which then starts it from the observed request rate.
+    """
+
+    def __init__(self, config: Optional[RateLimitConfig] = None):
+        self.config = config or RateLimitConfig()
+        self.rate: Optional[float] = self.config.rate
+        self.rate_limited = 0
+        self.total_wait_time = 0.0
+
+        now = time.monotonic()
+        self._tokens = float(self._capacity())
+        self._last_refill = now
+        self._paused_until = 0.0
+        self._hold_until = 0.0
+        self._window_start = now
+        self._window_count = 0
+        self._observed_rate = 0.0
+
+    def _capacity(self) -> float:
+        if self.config.burst is not None:
+            return float(self.config.burst)
+        return max(self.rate or 1.0, 1.0)
+
+    async def acquire(self) -> None:
+        """Wait for a token and any active Retry-After pause"""
+        start_time = time.monotonic()
+        while True:
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+
+            if self.rate is None:
+                break
+
+            self._refill(now)
+            if self._tokens >= 1:
+                self._tokens -= 1
+                break
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+        self._record(now)
+        self.total_wait_time += now - start_time
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self._tokens + (now - self._last_refill) * self.rate, self._capacity()
+        )
+        self._last_refill = now
+
+    def _record(self, now: float) -> None:
+        """Track the observed request rate over one-second windows"""
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            self._observed_rate = self._window_count / elapsed
+            self._window_start = now
+            self._window_count = 0
+        self._window_count += 1
+
+    def on_success(self) -> None:
+        """Additively increase the rate after a successful response"""
+        if self.rate is None:
+            return
+        # Adding increase/rate per request gains ~increase per second
+        self.rate += self.config.additive_increase / self.rate
+        if self.config.max_rate is not None:
+            self.rate = min(self.rate, self.config.max_rate)
+
+    def on_rate_limited(self, retry_after: Optional[float] = None) -> None:
+        """Pause all requests and multiplicatively decrease the rate"""
+        self.rate_limited += 1
+        now = time.monotonic()
+
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+
+        # Responses already in flight when the first 429 arrived belong to
+        # the same congestion event, so only decrease once per window
+        if now < self._hold_until:
+            return
+        self._hold_until = now + max(retry_after or 0.0, 1.0)
+
+        current = self.rate
+        if current is None:
+            current = max(self._observed_rate, self._window_count, self.config.min_rate)
+        self.rate = max(current * self.config.decrease_factor, self.config.min_rate)
+        self._tokens = min(self._tokens, self._capacity())
+        self._last_refill = now
+        logger.debug(
+            f"Rate limited, pausing {retry_after or 0}s and lowering rate to {self.rate:.2f}/s"
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get rate limiter statistics"""
+        return {
+            "rate": self.rate,
+            "paused_for": max(self._paused_until - time.monotonic(), 0.0),
+            "rate_limited": self.rate_limited,
+            "total_wait_time": self.total_wait_time * 1000,
+        }
@@ -4,10 +4,40 @@ Retry logic with exponential backoff
 
 import asyncio
 import logging
-from typing import Awaitable, Callable, Optional, TypeVar, Any
+import random
+import time
+from typing import Awaitable, Callable, Optional, Tuple, TypeVar, Any
+
+import aiohttp
+
+from .errors import (
+    AgentClientError,
+    AuthenticationError,
+    AuthorizationError,
+    CircuitOpenError,
+    ConnectionError,
+    DeadlineExceededError,
+    NetworkError,
+    NotFoundError,
+    OverloadedError,
+    PoolTimeoutError,
+    RateLimitError,
+    ServerError,
+    TimeoutError,
+    ValidationError,
+)
 
 T = TypeVar("T")
 
+# Backoff jitter strategies
+JITTER_MODES = ("none", "full", "equal", "decorrelated")
+
+# Status codes worth retrying when the error type alone doesn't say
+RETRYABLE_STATUS_CODES = (408, 425, 429, 500, 502, 503, 504)
+
+# Error codes raised without a status code that are transient
+RETRYABLE_ERROR_CODES = ("HTTP_ERROR", "NETWORK_ERROR", "CONNECTION_ERROR", "TIMEOUT")
+
 
 class RetryConfig:
     """Retry configuration"""
@@ -18,11 +48,20 @@ class RetryConfig:
         initial_delay: int = 100,
         max_delay: int = 10000,
         backoff_multiplier: float = 2.0,
+        jitter: str = "full",
+        retry_on_status: Tuple[int, ...] = RETRYABLE_STATUS_CODES,
+        max_elapsed: Optional[int] = None,
     ):
+        if jitter not in JITTER_MODES:
+            raise ValueError(f"jitter must be one of {', '.join(JITTER_MODES)}")
         self.max_retries = max_retries
         self.initial_delay = initial_delay
         self.max_delay = max_delay
         self.backoff_multiplier = backoff_multiplier
+        self.jitter = jitter
+        self.retry_on_status = retry_on_status
+        # Total time budget (ms) across all attempts, None is unbounded
+        self.max_elapsed = max_elapsed
 
 
 def calculate_delay(
@@ -30,10 +69,22 @@ def calculate_delay(
     initial_delay: int,
     max_delay: int,
     backoff_multiplier: float,
+    jitter: str = "none",
+    previous_delay: Optional[int] = None,
 ) -> int:
     """Calculate delay for retry attempt"""
-    delay = int(initial_delay * (backoff_multiplier ** (attempt - 1)))
-    return min(delay, max_delay)
+    if jitter == "decorrelated":
+        # Grows from the previous delay rather than the attempt number
+        previous = previous_delay or initial_delay
+        upper = max(previous * 3, initial_delay)
+        return int(min(random.uniform(initial_delay, upper), max_delay))
+
+    delay = min(initial_delay * (backoff_multiplier ** (attempt - 1)), max_delay)
+    if jitter == "full":
+        return int(random.uniform(0, delay))
+    if jitter == "equal":
+        return int(delay / 2 + random.uniform(0, delay / 2))
+    return int(delay)
 
 
 async def retry(
@@ -41,11 +92,28 @@ async def retry(
     config: RetryConfig,
     on_retry: Optional[Callable[[int, int, Exception], None]] = None,
     *args: Any,
+    should_retry: Optional[Callable[[Exception], bool]] = None,
+    deadline: Optional[float] = None,
     **kwargs: Any,
 ) -> T:
-    """Retry a function with exponential backoff"""
+    """Retry a function with exponential backoff
+
+    Only errors accepted by ``should_retry`` (``is_retryable_error`` by
+    default) are retried. ``deadline`` is an absolute ``time.monotonic()``
+    budget; no retry is scheduled that would start after it.
+    """
     logger = logging.getLogger(__name__)
     last_error: Optional[Exception] = None
+    previous_delay: Optional[int] = None
+
+    if should_retry is None:
+
+        def should_retry(error: Exception) -> bool:
+            return is_retryable_error(error, config.retry_on_status)
+
+    if config.max_elapsed is not None:
+        budget = time.monotonic() + config.max_elapsed / 1000.0
+        deadline = budget if deadline is None else min(deadline, budget)
 
     for attempt in range(config.max_retries + 1):
         try:
@@ -53,15 +121,27 @@ async def retry(
         except Exception as error:
             last_error = error
 
-            if attempt == config.max_retries:
-                raise last_error
+            if attempt == config.max_retries or not should_retry(error):
+                raise
 
             delay = calculate_delay(
                 attempt + 1,
                 config.initial_delay,
                 config.max_delay,
                 config.backoff_multiplier,
+                config.jitter,
+                previous_delay,
             )
+            previous_delay = delay
+
+            # Never come back before the server said we may
+            retry_after = getattr(error, "retry_after", None)
+            if retry_after:
+                delay = max(delay, int(retry_after * 1000))
+
+            if deadline is not None and time.monotonic() + delay / 1000.0 >= deadline:
+                logger.debug(f"Retry budget exhausted after {attempt + 1} attempt(s)")
+                raise
 
             if on_retry:
                 on_retry(attempt + 1, delay, error)
@@ -74,30 +154,50 @@ async def retry(
     raise last_error
 
 
-def is_retryable_error(error: Exception) -> bool:
+def is_retryable_error(
+    error: Exception, retry_on_status: Tuple[int, ...] = RETRYABLE_STATUS_CODES
+) -> bool:
     """Check if error is retryable"""
-    message = str(error).lower()
-
-    # Network errors are retryable
-    if any(
-        x in message
-        for x in ["connection refused", "connection reset", "timeout", "not found"]
+    # Caller mistakes and deliberate load shedding never succeed on retry,
+    # and a saturated pool only grows its queue when waiters retry
+    if isinstance(
+        error,
+        (
+            ValidationError,
+            AuthenticationError,
+            AuthorizationError,
+            NotFoundError,
+            OverloadedError,
+            CircuitOpenError,
+            DeadlineExceededError,
+            PoolTimeoutError,
+        ),
     ):
-        return True
+        return False
 
-    # 5xx errors are retryable
-    if "5" in message or "server error" in message:
+    # Rate limits, timeouts and transport failures are transient
+    if isinstance(error, (RateLimitError, TimeoutError, NetworkError, ConnectionError)):
         return True
 
-    # 429 (rate limit) is retryable
-    if "429" in message or "rate limit" in message:
-        return True
+    if isinstance(error, AgentClientError):
+        if error.status_code is not None:
+            return error.status_code in retry_on_status
+        return error.code in RETRYABLE_ERROR_CODES
+
+    return isinstance(
+        error, (asyncio.TimeoutError, aiohttp.ClientConnectionError, OSError)
+    )
 
-    # 503 (service unavailable) is retryable
-    if "503" in message or "service unavailable" in message:
-        return True
 
-    return False
+def is_unprocessed_error(error: Exception) -> bool:
+    """Check if an error shows the server turned the request away unprocessed
+
+    Only these are safe to retry for requests that aren't idempotent: a 429,
+    or a 5xx (e.g. 503) that says when to come back with Retry-After.
+    """
+    if isinstance(error, RateLimitError):
+        return True
+    return isinstance(error, ServerError) and error.retry_after is not None
 
 
 class RetryPresets:
@@ -0,0 +1,185 @@
+"""
+Pluggable JSON serializers
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Preference order for "auto", msgspec first as it can defer heavy fields
+SERIALIZER_NAMES = ("msgspec", "orjson", "json")
+
+
+class LazyJSON:
+    """Undecoded JSON value, decoded by ``decode()``"""
+
+    __slots__ = ("raw", "_loads")
+
+    def __init__(self, raw: Any, loads: Callable[[Any], Any]) -> None:
+        self.raw = raw
+        self._loads = loads
+
+    def decode(self) -> Any:
+        return self._loads(self.raw)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "LazyJSON":
+        # Immutable, every decode() builds new objects
+        return self
+
+    def __repr__(self) -> str:
+        return f"LazyJSON({len(self.raw)} bytes)"
+
+
+class Serializer:
+    """JSON serializer working on UTF-8 bytes
+
+    ``dumps`` raises TypeError or ValueError for values it can't encode and
+    ``loads`` raises ValueError for invalid JSON, whatever the codec.
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    def loads_lazy(
+        self, data: Union[bytes, bytearray, memoryview, str], lazy: Tuple[str, ...]
+    ) -> Any:
+        """Decode a response, leaving ``lazy`` keys of its records as LazyJSON
+
+        Records are the objects in ``data`` (or the document itself when it
+        has no ``data``). Codecs that can't skip over values decode it all.
+        """
+        return self.loads(data)
+
+
+class OrjsonSerializer(Serializer):
+    """orjson-backed serializer"""
+
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+        self._encode_error = orjson.JSONEncodeError
+        # Non-str keys are stringified, as the stdlib does
+        self._options = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return self._dumps(obj, option=self._options)
+        except self._encode_error:
+            # e.g. integers over 64 bits, which the stdlib can still encode
+            return super().dumps(obj)
+
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        return self._loads(data)
+
+
+class MsgspecSerializer(Serializer):
+    """msgspec-backed serializer"""
+
+    name = "msgspec"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+        self._encode_error = msgspec.EncodeError
+        self._decode_error = msgspec.DecodeError
+        self._validation_error = msgspec.ValidationError
+        # Values stay Raw views into the response buffer until decoded
+        record = Dict[str, msgspec.Raw]
+        self._object_decoder = msgspec.json.Decoder(record)
+        self._records_decoder = msgspec.json.Decoder(Union[List[record], record])
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return self._encoder.encode(obj)
+        except self._encode_error as error:
+            raise ValueError(str(error)) from error
+
+    def loads(self, data: Union[bytes, bytearray, memoryview, str]) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._decode_error as error:
+            # Match json and orjson, whose decode errors are ValueErrors
+            raise ValueError(str(error)) from error
+
+    def loads_lazy(
+        self, data: Union[bytes, bytearray, memoryview, str], lazy: Tuple[str, ...]
+    ) -> Any:
+        try:
+            document = self._object_decoder.decode(data)
+        except self._validation_error:
+            return self.loads(data)
+        except self._decode_error as error:
+            raise ValueError(str(error)) from error
+
+        if "data" not in document:
+            if "success" in document:
+                # Error envelope, its "error" is the one the client reads
+                return {key: self._decoder.decode(raw) for key, raw in document.items()}
+            return self._record(document, lazy)
+
+        result = {
+            key: self._decoder.decode(raw) for key, raw in document.items() if key != "data"
+        }
+        try:
+            records = self._records_decoder.decode(document["data"])
+        except self._validation_error:
+            result["data"] = self._decoder.decode(document["data"])
+        else:
+            result["data"] = (
+                [self._record(record, lazy) for record in records]
+                if isinstance(records, list)
+                else self._record(records, lazy)
+            )
+        return result
+
+    def _record(self, record: Dict[str, Any], lazy: Tuple[str, ...]) -> Dict[str, Any]:
+        decode = self._decoder.decode
+        return {
+            key: LazyJSON(raw, decode) if key in lazy else decode(raw)
+            for key, raw in record.items()
+        }
+
+
+_SERIALIZERS = {
+    "orjson": OrjsonSerializer,
+    "msgspec": MsgspecSerializer,
+    "json": Serializer,
+}
+
+
+def get_serializer(serializer: Optional[Union[str, Serializer]] = "auto") -> Serializer:
+    """Resolve a serializer name, ``auto`` picking the fastest one installed"""
+    if isinstance(serializer, Serializer):
+        return serializer
+
+    name = serializer or "auto"
+    if name == "auto":
+        for candidate in SERIALIZER_NAMES:
+            try:
+                return _SERIALIZERS[candidate]()
+            except ImportError:
+                continue
+
+    if name not in _SERIALIZERS:
+        raise ValueError(
+            f"serializer must be one of auto, {', '.join(SERIALIZER_NAMES)}"
+        )
+    try:
+        return _SERIALIZERS[name]()
+    except ImportError as error:
+        raise ImportError(f"{name} serializer requested but {name} is not installed") from error
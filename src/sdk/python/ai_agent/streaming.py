@@ -0,0 +1,326 @@
+"""
+Incremental parsing and spooling of large response bodies
+"""
+
+import codecs
+import json
+import mmap
+import re
+import tempfile
+from typing import Any, BinaryIO, Callable, Iterator, List, Optional, Sequence, Union
+
+# Read and parse in chunks of this many bytes
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Bodies up to this size (bytes) stay in memory, larger ones go to a temp file
+DEFAULT_MAX_MEMORY = 8 * 1024 * 1024
+
+# Where the task result lives in a ``GET /tasks/{id}/result`` body
+RESULT_OUTPUT_PATH = ("data", "output")
+
+# Content types sent as one JSON document per line
+NDJSON_TYPES = ("application/x-ndjson", "application/jsonl", "application/json-seq")
+
+_STRUCTURE = re.compile(r'[\[\]{},:"]')
+# A string from its opening quote, group 1 is missing if it continues into
+# the next chunk
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*(")?', re.DOTALL)
+_WHITESPACE = re.compile(r"[ \t\r\n]*")
+# Characters that show a number was cut short, e.g. "1." or "1e"
+_NUMBER_TAIL = frozenset(".eE+-0123456789")
+
+
+class _Frame:
+    """An open object or array"""
+
+    __slots__ = ("is_object", "key", "expect_key")
+
+    def __init__(self, is_object: bool) -> None:
+        self.is_object = is_object
+        self.key: Optional[str] = None
+        self.expect_key = is_object
+
+
+class ItemParser:
+    """Decode the items at ``path`` of a JSON document fed in chunks
+
+    ``path`` is the object keys leading to a value, ``()`` for the whole
+    document. When that value is an array its elements are returned one by
+    one, otherwise the value itself is. Only the item being read is
+    buffered and the rest of the document is skipped once the value has
+    been read. Items are decoded with the standard library's C decoder, an
+    incomplete one is retried once its buffered text has doubled.
+    """
+
+    def __init__(self, path: Sequence[str] = ()):
+        self.path = tuple(path)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._chunks: List[str] = []
+        self._size = 0
+        self._text = ""
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        # Reached the value at ``path``, and whether it is an array
+        self._in_target = not self.path
+        self._in_array = False
+        # Buffered length needed before parsing again
+        self._retry_at = 0
+        self._done = False
+
+    def feed(self, data: bytes) -> List[Any]:
+        """Add the next chunk, returning the items it completes"""
+        if self._done:
+            return []
+        text = self._decoder.decode(data)
+        self._chunks.append(text)
+        self._size += len(text)
+        if self._size < self._retry_at:
+            return []
+        return self._parse(final=False)
+
+    def close(self) -> List[Any]:
+        """Finish the document, returning the items still buffered"""
+        if self._done:
+            return []
+        self._chunks.append(self._decoder.decode(b"", final=True))
+        return self._parse(final=True)
+
+    def _parse(self, final: bool) -> List[Any]:
+        self._text = self._text[self._pos :] + "".join(self._chunks)
+        self._chunks = []
+        self._pos = 0
+        items: List[Any] = []
+        waiting = self._read_items(items, final) if self._in_target else self._navigate()
+        while not waiting and not self._done:
+            waiting = self._read_items(items, final)
+        if final or self._done:
+            self._done = True
+            self._text = ""
+        else:
+            self._text = self._text[self._pos :]
+            self._pos = 0
+        self._size = len(self._text)
+        return items
+
+    def _navigate(self) -> bool:
+        """Scan to the value at ``path``, True if more input is needed first"""
+        text = self._text
+        stack = self._stack
+        pos = self._pos
+        while True:
+            match = _STRUCTURE.search(text, pos)
+            if match is None:
+                self._pos = len(text)
+                self._retry_at = 0
+                return True
+            pos = match.start()
+            char = text[pos]
+            if char == '"':
+                string = _STRING.match(text, pos)
+                if string.lastindex is None:
+                    # Keep the string for when the rest of it arrives
+                    self._pos = pos
+                    self._retry_at = 2 * (len(text) - pos)
+                    return True
+                frame = stack[-1] if stack else None
+                if (
+                    frame is not None
+                    and frame.expect_key
+                    and len(stack) <= len(self.path)
+                ):
+                    frame.key = json.loads(text[pos : string.end()])
+                pos = string.end()
+                continue
+            if char == ":":
+                frame = stack[-1]
+                frame.expect_key = False
+                if len(stack) == len(self.path) and self._matches():
+                    self._pos = pos + 1
+                    self._in_target = True
+                    return False
+            elif char == ",":
+                stack[-1].expect_key = stack[-1].is_object
+            elif char in "{[":
+                stack.append(_Frame(char == "{"))
+            else:
+                stack.pop()
+            pos += 1
+
+    def _matches(self) -> bool:
+        """Check whether the open objects' keys spell out ``path``"""
+        for frame, key in zip(self._stack, self.path):
+            if not frame.is_object or frame.key != key:
+                return False
+        return True
+
+    def _read_items(self, items: List[Any], final: bool) -> bool:
+        """Decode the target value or array items, True if more input is needed"""
+        text = self._text
+        size = len(text)
+        pos = self._pos
+        while True:
+            pos = _WHITESPACE.match(text, pos).end()
+            if pos == size:
+                self._pos = pos
+                self._retry_at = 0
+                if final:
+                    self._done = True
+                return True
+            if not self._in_array:
+                if text[pos] == "[":
+                    self._in_array = True
+                    pos += 1
+                    continue
+            elif text[pos] == "]":
+                self._done = True
+                return True
+            elif text[pos] == ",":
+                pos += 1
+                continue
+            try:
+                item, end = self._json.raw_decode(text, pos)
+            except ValueError as error:
+                if final:
+                    raise ValueError(f"Invalid JSON result: {error}") from error
+                end = size
+            # A number at the end of the buffer may continue in the next chunk
+            if not final and (end == size or text[end] in _NUMBER_TAIL):
+                self._pos = pos
+                self._retry_at = 2 * (size - pos)
+                return True
+            items.append(item)
+            pos = end
+            if not self._in_array:
+                self._done = True
+                return True
+
+
+class LineParser:
+    """Decode newline-delimited JSON fed in chunks, one item per line"""
+
+    def __init__(self, loads: Callable[[Any], Any]):
+        self._loads = loads
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[Any]:
+        """Add the next chunk, returning the lines it completes"""
+        self._buffer += data
+        end = self._buffer.rfind(b"\n")
+        if end < 0:
+            return []
+        lines = [line.strip(_LINE_SPACE) for line in self._buffer[:end].split(b"\n")]
+        del self._buffer[: end + 1]
+        return [self._loads(line) for line in lines if line]
+
+    def close(self) -> List[Any]:
+        """Return a last line without a trailing newline"""
+        line = self._buffer.strip(_LINE_SPACE)
+        self._buffer = bytearray()
+        return [self._loads(line)] if line else []
+
+
+# Blank around NDJSON lines, including json-seq record separators
+_LINE_SPACE = b" \t\r\x1e"
+
+
+def item_parser(
+    content_type: Optional[str], path: Sequence[str], loads: Callable[[Any], Any]
+) -> Union[ItemParser, LineParser]:
+    """Pick the parser for a body of ``content_type``"""
+    if content_type and content_type.split(";")[0].strip().lower() in NDJSON_TYPES:
+        return LineParser(loads)
+    return ItemParser(path)
+
+
+class ResultBuffer:
+    """A downloaded response body, kept in a temp file past ``max_memory``
+
+    ``view()`` gives zero-copy access (memory-mapped once spilled to disk)
+    and ``iter_items()`` parses it incrementally. Close it, or use it as a
+    context manager, to release the memory or delete the file.
+    """
+
+    def __init__(
+        self,
+        loads: Callable[[Any], Any],
+        max_memory: int = DEFAULT_MAX_MEMORY,
+        directory: Optional[str] = None,
+        content_type: Optional[str] = None,
+    ):
+        self.max_memory = max_memory
+        self.directory = directory
+        self.content_type = content_type
+        self.size = 0
+        self._loads = loads
+        self._memory = bytearray()
+        self._file: Optional[BinaryIO] = None
+        self._mmap: Optional[mmap.mmap] = None
+
+    @property
+    def spilled(self) -> bool:
+        """Whether the body went to a temp file"""
+        return self._file is not None
+
+    def write(self, data: bytes) -> None:
+        """Append a chunk, moving to a temp file once past ``max_memory``"""
+        if self._file is None and self.size + len(data) > self.max_memory:
+            self._file = tempfile.TemporaryFile(dir=self.directory)
+            self._file.write(self._memory)
+            self._memory = bytearray()
+        if self._file is not None:
+            self._file.write(data)
+        else:
+            self._memory += data
+        self.size += len(data)
+
+    def view(self) -> Union[memoryview, mmap.mmap]:
+        """Read-only access to the body without copying it"""
+        if self._file is None:
+            return memoryview(self._memory).toreadonly()
+        if self.size == 0:
+            return memoryview(b"")
+        if self._mmap is None:
+            self._file.flush()
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap
+
+    def read(self) -> bytes:
+        """The whole body as bytes"""
+        return bytes(self.view())
+
+    def iter_items(
+        self,
+        path: Sequence[str] = RESULT_OUTPUT_PATH,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[Any]:
+        """Decode the items at ``path`` one by one (see ``ItemParser``)
+
+        Newline-delimited bodies yield one item per line.
+        """
+        parser = item_parser(self.content_type, path, self._loads)
+        view = self.view()
+        for start in range(0, len(view), chunk_size):
+            yield from parser.feed(view[start : start + chunk_size])
+        yield from parser.close()
+
+    def close(self) -> None:
+        """Release the buffer and delete the temp file"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._memory = bytearray()
+        self.size = 0
+
+    def __enter__(self) -> "ResultBuffer":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        where = "file" if self.spilled else "memory"
+        return f"ResultBuffer({self.size} bytes in {where})"
@@ -0,0 +1,163 @@
+"""
+Blocking facade over AgentClient for synchronous code
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+import threading
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Iterator,
+    Optional,
+    Sequence,
+    TypeVar,
+    Union,
+)
+
+from .client import AgentClient
+from .types import ClientMetrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _SyncProxy:
+    """Expose an object's coroutine methods as blocking calls"""
+
+    def __init__(self, target: Any, run: Callable[[Awaitable[Any]], Any]):
+        self._target = target
+        self._run = run
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._target, name)
+        if inspect.iscoroutinefunction(attr):
+
+            @functools.wraps(attr)
+            def call(*args: Any, **kwargs: Any) -> Any:
+                return self._run(attr(*args, **kwargs))
+
+            return call
+
+        if inspect.isasyncgenfunction(attr):
+
+            @functools.wraps(attr)
+            def iterate(*args: Any, **kwargs: Any) -> Iterator[Any]:
+                return self._iterate(attr(*args, **kwargs))
+
+            return iterate
+
+        return attr
+
+    def _iterate(self, agen: Any) -> Iterator[Any]:
+        try:
+            while True:
+                try:
+                    item = self._run(agen.__anext__())
+                except StopAsyncIteration:
+                    return
+                yield item
+        finally:
+            self._run(agen.aclose())
+
+
+class SyncAgentClient:
+    """Blocking Agent Client
+
+    Runs one AgentClient on a long-lived event loop in a background thread,
+    so every call reuses the same pooled session instead of paying for a
+    new loop and session per ``asyncio.run``. Safe to share between
+    threads; concurrent calls run concurrently on the loop. Takes the same
+    arguments as AgentClient.
+    """
+
+    def __init__(
+        self, api_url: Union[str, Sequence[str]], api_key: str, **kwargs: Any
+    ) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="ai-agent-client", daemon=True
+        )
+        self._thread.start()
+        self._closed = False
+
+        async def create() -> AgentClient:
+            client = AgentClient(api_url, api_key, **kwargs)
+            await client.initialize()
+            return client
+
+        try:
+            self.client: AgentClient = self._run(create())
+        except BaseException:
+            self._stop_loop()
+            raise
+
+        self.agents = _SyncProxy(self.client.agents, self._run)
+        self.tasks = _SyncProxy(self.client.tasks, self._run)
+
+    def _run_loop(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    def _run(self, coro: Awaitable[T]) -> T:
+        """Run a coroutine on the client loop and wait for its result"""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError(
+                "SyncAgentClient cannot be called from its own event loop"
+            )
+        future = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        try:
+            return future.result()
+        except BaseException:
+            # e.g. KeyboardInterrupt, don't leave the request running
+            future.cancel()
+            raise
+
+    def request(
+        self, method: str, path: str, data: Optional[Any] = None, **kwargs: Any
+    ) -> Any:
+        """Make HTTP request"""
+        return self._run(self.client.request(method, path, data, **kwargs))
+
+    def health(self) -> Any:
+        """Check health status"""
+        return self._run(self.client.health())
+
+    def get_metrics(self) -> ClientMetrics:
+        """Get client metrics"""
+
+        async def snapshot() -> ClientMetrics:
+            return self.client.get_metrics()
+
+        return self._run(snapshot())
+
+    def serve_metrics(
+        self, host: str = "127.0.0.1", port: int = 9464, path: str = "/metrics"
+    ) -> Any:
+        """Expose metrics for Prometheus scraping until the client closes"""
+        return self._run(self.client.serve_metrics(host, port, path))
+
+    def close(self) -> None:
+        """Close the client and stop its event loop"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._run(self.client.close())
+        finally:
+            self._stop_loop()
+
+    def _stop_loop(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self) -> "SyncAgentClient":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
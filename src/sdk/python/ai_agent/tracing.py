@@ -0,0 +1,261 @@
+"""
+Request tracing hooks with per-phase timings
+"""
+
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Timed phases of a request, in ms, summed over attempts
+PHASES = (
+    "queue",  # waiting for a concurrency limiter slot
+    "rate_limit",  # waiting for the client-side rate limiter
+    "pool",  # waiting for a connection slot
+    "dns",
+    "connect",  # opening a socket (including TLS), excluding DNS
+    "server",  # request sent until response headers, server time plus network
+    "read",  # reading the response body
+    "decompress",
+    "decode",
+    "backoff",  # sleeping between retries
+)
+
+
+class RequestTrace:
+    """Timings and outcome of one ``AgentClient.request`` call
+
+    ``headers`` set by ``on_request_start`` hooks are sent with every
+    attempt, ``context`` is free for hooks to keep their own state.
+    """
+
+    __slots__ = (
+        "method",
+        "path",
+        "endpoint",
+        "request_id",
+        "headers",
+        "context",
+        "phases",
+        "attempts",
+        "status",
+        "error",
+        "bytes_received",
+        "start_time",
+        "duration",
+    )
+
+    def __init__(self, method: str, path: str, endpoint: str, request_id: str) -> None:
+        self.method = method
+        self.path = path
+        # Endpoint template, e.g. "GET /tasks/{id}"
+        self.endpoint = endpoint
+        self.request_id = request_id
+        self.headers: Dict[str, str] = {}
+        self.context: Dict[str, Any] = {}
+        self.phases: Dict[str, float] = {}
+        self.attempts = 0
+        self.status: Optional[int] = None
+        self.error: Optional[BaseException] = None
+        self.bytes_received = 0
+        self.start_time = time.perf_counter()
+        self.duration = 0.0
+
+    def add(self, phase: str, elapsed: float) -> None:
+        """Add ``elapsed`` ms to a phase"""
+        self.phases[phase] = self.phases.get(phase, 0.0) + elapsed
+
+    def since(self, phase: str, start: float) -> None:
+        """Add the ms since ``start`` (``time.perf_counter()``) to a phase"""
+        self.add(phase, (time.perf_counter() - start) * 1000)
+
+    def __repr__(self) -> str:
+        phases = ", ".join(f"{name}={value:.2f}" for name, value in self.phases.items())
+        return (
+            f"RequestTrace({self.endpoint}, status={self.status}, "
+            f"duration={self.duration:.2f}ms, {phases})"
+        )
+
+
+class _Attempt:
+    """One attempt's marks, passed to aiohttp as ``trace_request_ctx``"""
+
+    __slots__ = ("trace", "dns_start", "dns_time", "connect_start", "sent")
+
+    def __init__(self, trace: RequestTrace) -> None:
+        self.trace = trace
+        self.dns_start = 0.0
+        self.dns_time = 0.0
+        self.connect_start = 0.0
+        self.sent = time.perf_counter()
+
+
+StartHook = Callable[[RequestTrace], Awaitable[None]]
+ChunkHook = Callable[[RequestTrace, bytes], Awaitable[None]]
+EndHook = Callable[[RequestTrace], Awaitable[None]]
+
+
+class TraceHooks:
+    """Request lifecycle callbacks, in the style of ``aiohttp.TraceConfig``
+
+    Append coroutine functions to the lists: ``on_request_start(trace)``
+    before the first attempt, ``on_chunk(trace, chunk)`` as response body
+    bytes arrive (as received, before decompression) and
+    ``on_request_end(trace)`` once the call succeeded or failed.
+    """
+
+    def __init__(self) -> None:
+        self.on_request_start: List[StartHook] = []
+        self.on_chunk: List[ChunkHook] = []
+        self.on_request_end: List[EndHook] = []
+
+
+class Tracer:
+    """Dispatch hooks and time the phases of traced requests"""
+
+    def __init__(self, hooks: Sequence[TraceHooks]) -> None:
+        self.hooks = list(hooks)
+
+    async def start(
+        self, method: str, path: str, endpoint: str, request_id: str
+    ) -> RequestTrace:
+        trace = RequestTrace(method, path, endpoint, request_id)
+        for hooks in self.hooks:
+            await self._call(hooks.on_request_start, trace)
+        return trace
+
+    async def end(self, trace: RequestTrace) -> None:
+        trace.duration = (time.perf_counter() - trace.start_time) * 1000
+        for hooks in self.hooks:
+            await self._call(hooks.on_request_end, trace)
+
+    @staticmethod
+    def attempt(trace: RequestTrace) -> _Attempt:
+        trace.attempts += 1
+        return _Attempt(trace)
+
+    @staticmethod
+    async def _call(callbacks: List[Callable[..., Awaitable[None]]], *args: Any) -> None:
+        for callback in callbacks:
+            try:
+                await callback(*args)
+            except Exception:
+                # A broken hook must not fail the request it observes
+                logger.exception("Trace hook %r failed", callback)
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Build the aiohttp trace config timing connection phases"""
+        trace_config = aiohttp.TraceConfig()
+
+        async def on_dns_resolvehost_start(session, context, params) -> None:
+            attempt = context.trace_request_ctx
+            if isinstance(attempt, _Attempt):
+                attempt.dns_start = time.perf_counter()
+
+        async def on_dns_resolvehost_end(session, context, params) -> None:
+            attempt = context.trace_request_ctx
+            if isinstance(attempt, _Attempt):
+                elapsed = (time.perf_counter() - attempt.dns_start) * 1000
+                attempt.dns_time += elapsed
+                attempt.trace.add("dns", elapsed)
+
+        async def on_connection_create_start(session, context, params) -> None:
+            attempt = context.trace_request_ctx
+            if isinstance(attempt, _Attempt):
+                attempt.connect_start = time.perf_counter()
+                attempt.dns_time = 0.0
+
+        async def on_connection_create_end(session, context, params) -> None:
+            attempt = context.trace_request_ctx
+            if isinstance(attempt, _Attempt):
+                elapsed = (time.perf_counter() - attempt.connect_start) * 1000
+                attempt.trace.add("connect", elapsed - attempt.dns_time)
+
+        async def on_request_headers_sent(session, context, params) -> None:
+            attempt = context.trace_request_ctx
+            if isinstance(attempt, _Attempt):
+                attempt.sent = time.perf_counter()
+
+        async def on_request_end(session, context, params) -> None:
+            # Sent once the response headers have been read
+            attempt = context.trace_request_ctx
+            if isinstance(attempt, _Attempt):
+                attempt.trace.since("server", attempt.sent)
+                attempt.trace.status = params.response.status
+
+        async def on_response_chunk_received(session, context, params) -> None:
+            attempt = context.trace_request_ctx
+            if isinstance(attempt, _Attempt):
+                attempt.trace.bytes_received += len(params.chunk)
+                for hooks in self.hooks:
+                    await self._call(hooks.on_chunk, attempt.trace, params.chunk)
+
+        trace_config.on_dns_resolvehost_start.append(on_dns_resolvehost_start)
+        trace_config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+        trace_config.on_connection_create_start.append(on_connection_create_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        # Older aiohttp lacks it, server time then starts at the request
+        if hasattr(trace_config, "on_request_headers_sent"):
+            trace_config.on_request_headers_sent.append(on_request_headers_sent)
+        trace_config.on_request_end.append(on_request_end)
+        trace_config.on_response_chunk_received.append(on_response_chunk_received)
+        return trace_config
+
+
+class OpenTelemetryHooks(TraceHooks):
+    """Emit an OpenTelemetry client span per request
+
+    The span's context is propagated to the server in the ``traceparent``
+    header (or whatever the configured propagators write), and phase
+    timings are recorded as ``ai_agent.phase.<name>_ms`` attributes.
+    Requires ``opentelemetry-api``.
+    """
+
+    def __init__(self, tracer_provider: Optional[Any] = None) -> None:
+        super().__init__()
+        try:
+            from opentelemetry import propagate, trace
+        except ImportError as error:
+            raise ImportError(
+                "OpenTelemetry tracing requested but opentelemetry-api is not installed"
+            ) from error
+
+        self._propagate = propagate
+        self._trace = trace
+        self.tracer = trace.get_tracer("ai_agent", tracer_provider=tracer_provider)
+        self.on_request_start.append(self._start_span)
+        self.on_request_end.append(self._end_span)
+
+    async def _start_span(self, trace: RequestTrace) -> None:
+        span = self.tracer.start_span(
+            trace.endpoint,
+            kind=self._trace.SpanKind.CLIENT,
+            attributes={
+                "http.request.method": trace.method,
+                "url.path": trace.path,
+                "ai_agent.endpoint": trace.endpoint,
+                "ai_agent.request_id": trace.request_id,
+            },
+        )
+        trace.context["otel_span"] = span
+        self._propagate.inject(
+            trace.headers, context=self._trace.set_span_in_context(span)
+        )
+
+    async def _end_span(self, trace: RequestTrace) -> None:
+        span = trace.context.pop("otel_span", None)
+        if span is None:
+            return
+        if trace.status is not None:
+            span.set_attribute("http.response.status_code", trace.status)
+        span.set_attribute("ai_agent.attempts", trace.attempts)
+        span.set_attribute("ai_agent.bytes_received", trace.bytes_received)
+        for name, value in trace.phases.items():
+            span.set_attribute(f"ai_agent.phase.{name}_ms", value)
+        if trace.error is not None:
+            span.record_exception(trace.error)
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, str(trace.error)))
+        span.end()
@@ -2,10 +2,15 @@
 Type definitions for AI Agent SDK
 """
 
-from typing import Any, Dict, List, Optional, Literal
-from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Literal, Type, TypeVar
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 
+from .balancer import Backend
+from .compression import CompressionStats
+from .histogram import LatencyHistogram
+from .serializer import LazyJSON
+
 # Agent types
 AgentType = Literal[
     "ORCHESTRATOR", "WORKER", "BRAINSTORMER", "SPECIALIST", "REVIEWER", "MONITOR", "CUSTOM"
@@ -30,13 +35,67 @@ TaskStatus = Literal[
     "RETRYING",
 ]
 
+# Statuses after which a task no longer changes
+TERMINAL_TASK_STATUSES = ("COMPLETED", "FAILED", "CANCELLED", "TIMED_OUT")
+
+# Heavy task fields left undecoded until read, where the serializer allows
+LAZY_TASK_FIELDS = ("payload", "result", "error")
+
 # Task priority
 TaskPriority = Literal["LOW", "NORMAL", "HIGH", "CRITICAL"]
 
+# Client-side request priority, served in this order when queued
+RequestPriority = Literal["INTERACTIVE", "NORMAL", "BULK"]
+
 # Task result status
 TaskResultStatus = Literal["SUCCESS", "FAILURE", "PARTIAL", "ERROR"]
 
+_T = TypeVar("_T")
+
+
+def _slotted(
+    cls: Optional[Type[_T]] = None,
+    *,
+    lazy: Optional[Dict[str, Optional[Callable[[Any, Any], Any]]]] = None,
+) -> Any:
+    """Rebuild a dataclass with ``__slots__`` (``slots=True`` before Python 3.10)
+
+    ``lazy`` fields may hold LazyJSON, decoded on first access and then
+    passed to their converter (if any) with the instance.
+    """
+    if cls is None:
+        return lambda cls: _slotted(cls, lazy=lazy)
+
+    lazy = lazy or {}
+    names = tuple(item.name for item in fields(cls))
+    namespace = {key: value for key, value in cls.__dict__.items() if key not in names}
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = tuple(
+        f"_{name}" if name in lazy else name for name in names
+    )
+    for name, convert in lazy.items():
+        namespace[name] = _lazy_field(f"_{name}", convert)
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+def _lazy_field(slot: str, convert: Optional[Callable[[Any, Any], Any]]) -> property:
+    def getter(self: Any) -> Any:
+        value = getattr(self, slot)
+        if isinstance(value, LazyJSON):
+            value = value.decode()
+        if convert is not None:
+            value = convert(self, value)
+        setattr(self, slot, value)
+        return value
 
+    def setter(self: Any, value: Any) -> None:
+        setattr(self, slot, value)
+
+    return property(getter, setter)
+
+
+@_slotted
 @dataclass
 class Agent:
     """Agent model"""
@@ -60,6 +119,7 @@ class AgentCreateParams:
     metadata: Optional[Dict[str, Any]] = None
 
 
+@_slotted
 @dataclass
 class TaskResult:
     """Task result"""
@@ -69,7 +129,17 @@ class TaskResult:
     output: Optional[Any] = None
     completed_at: Optional[str] = None
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], task_id: str = "") -> "TaskResult":
+        return cls(
+            task_id=data.get("taskId", task_id),
+            status=str(data.get("status", "SUCCESS")).upper(),
+            output=data.get("output"),
+            completed_at=data.get("completedAt"),
+        )
 
+
+@_slotted
 @dataclass
 class TaskError:
     """Task error"""
@@ -80,10 +150,34 @@ class TaskError:
     timestamp: Optional[str] = None
     retryable: bool = False
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TaskError":
+        return cls(
+            code=data.get("code", "UNKNOWN"),
+            message=data.get("message", ""),
+            details=data.get("details"),
+            timestamp=data.get("timestamp"),
+            retryable=bool(data.get("retryable", False)),
+        )
+
 
+def _task_result(task: "Task", value: Any) -> Any:
+    return TaskResult.from_dict(value, task.id) if isinstance(value, dict) else value
+
+
+def _task_error(task: "Task", value: Any) -> Any:
+    return TaskError.from_dict(value) if isinstance(value, dict) else value
+
+
+@_slotted(lazy={"payload": None, "result": _task_result, "error": _task_error})
 @dataclass
 class Task:
-    """Task model"""
+    """Task model
+
+    ``payload``, ``result`` and ``error`` may be given undecoded (LazyJSON)
+    or as raw response dicts; they are decoded and converted to TaskResult /
+    TaskError on first access, so listings only pay for what is read.
+    """
 
     id: str
     name: str
@@ -138,6 +232,49 @@ class ClientMetrics:
     failed_requests: int = 0
     total_errors: int = 0
     average_latency: float = 0.0
+    latency_p50: float = 0.0
+    latency_p90: float = 0.0
+    latency_p99: float = 0.0
+    latency_p999: float = 0.0
     success_rate: float = 0.0
     error_rate: float = 0.0
+    connections_created: int = 0
+    connections_reused: int = 0
+    connection_reuse_rate: float = 0.0
+    in_flight_requests: int = 0
+    queued_requests: int = 0
+    peak_queued_requests: int = 0
+    rejected_requests: int = 0
+    average_queue_time: float = 0.0
+    current_rate_limit: Optional[float] = None
+    rate_limited_requests: int = 0
+    retry_attempts: int = 0
+    total_backoff_time: float = 0.0
+    circuit_transitions: int = 0
+    circuit_rejections: int = 0
+    circuit_states: Dict[str, str] = field(default_factory=dict)
+    coalesced_requests: int = 0
+    hedged_requests: int = 0
+    hedge_wins: int = 0
+    hedges_cancelled: int = 0
+    agent_cache_hits: int = 0
+    agent_cache_misses: int = 0
+    agent_cache_hit_ratio: float = 0.0
+    # JSON codec in use and the bytes and time (ms) spent in it
+    serializer: str = "json"
+    encoded_bytes: int = 0
+    decoded_bytes: int = 0
+    encode_time: float = 0.0
+    decode_time: float = 0.0
+    # Body compression bytes and time (ms) by endpoint template
+    endpoint_compression: Dict[str, CompressionStats] = field(default_factory=dict)
+    # Latency (ms) histograms, overall and by endpoint template / status code
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)
+    endpoint_latency: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    status_latency: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    # Latency (ms) of single answered attempts by endpoint template, from
+    # sending to the response body, which hedge delays are based on
+    attempt_latency: Dict[str, LatencyHistogram] = field(default_factory=dict)
+    # Load balanced backends by URL, empty with a single api_url
+    backends: Dict[str, Backend] = field(default_factory=dict)
     last_error: Optional[Dict[str, str]] = None
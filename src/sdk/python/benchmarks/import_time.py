@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the ai_agent package
+
+Imports the package in fresh interpreters and fails if the median import
+time exceeds the budget, or if a bare ``import ai_agent`` pulls in modules
+that should only load on first use.
+
+Usage: python benchmarks/import_time.py [--runs 20] [--max-ms 50]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+SDK_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must not be imported by ``import ai_agent`` alone
+DEFERRED_MODULES = ("aiohttp", "ai_agent.client", "orjson", "msgspec")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = (time.perf_counter() - start) * 1000
+print(json.dumps({{"ms": elapsed, "modules": sorted(sys.modules)}}))
+"""
+
+
+def measure(statement: str) -> Dict[str, Any]:
+    """Time ``statement`` in a fresh interpreter"""
+    env = dict(os.environ, PYTHONPATH=SDK_ROOT)
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(statement=statement)],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def run(statement: str, runs: int) -> Dict[str, Any]:
+    """Time ``statement`` over several fresh interpreters"""
+    # Warm-up run so the measured runs read a compiled bytecode cache
+    measure(statement)
+    samples: List[float] = []
+    modules: List[str] = []
+    for _ in range(runs):
+        result = measure(statement)
+        samples.append(result["ms"])
+        modules = result["modules"]
+    return {
+        "statement": statement,
+        "median_ms": round(statistics.median(samples), 2),
+        "min_ms": round(min(samples), 2),
+        "max_ms": round(max(samples), 2),
+        "modules": modules,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument(
+        "--max-ms", type=float, default=50.0, help="budget for a bare import ai_agent"
+    )
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    bare = run("import ai_agent", args.runs)
+    client = run("from ai_agent import AgentClient", args.runs)
+    eager = [module for module in DEFERRED_MODULES if module in bare["modules"]]
+
+    if args.json:
+        for result in (bare, client):
+            del result["modules"]
+        print(json.dumps({"results": [bare, client], "eager": eager}, indent=2))
+    else:
+        for result in (bare, client):
+            print(
+                f"  {result['statement']:<36} median {result['median_ms']:>7.2f} ms"
+                f"  (min {result['min_ms']:.2f}, max {result['max_ms']:.2f})"
+            )
+
+    failed = False
+    if eager:
+        print(f"FAIL: import ai_agent loaded {', '.join(eager)}", file=sys.stderr)
+        failed = True
+    if bare["median_ms"] > args.max_ms:
+        print(
+            f"FAIL: import ai_agent took {bare['median_ms']} ms "
+            f"(budget {args.max_ms} ms)",
+            file=sys.stderr,
+        )
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
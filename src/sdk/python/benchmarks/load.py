@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Load generator and benchmark suite for the Python SDK
+
+Runs AgentClient against an in-process stub server (see stub_server.py)
+and measures request throughput and latency under a mixed workload, SDK
+memory per 1k in-flight task waits, submit_batch / wait_for_all scaling
+and the memory used to read a large task result whole versus streamed.
+Results use the format of benchmarks/compare.js:
+
+    python benchmarks/load.py --output results.json
+    node ../../../benchmarks/compare.js results.json --baseline baseline.json
+
+Record a baseline on the machine that runs the comparison with
+``--baseline-out baseline.json``. The stub runs in the same process, so
+``memory`` (peak RSS) includes it; ``in_flight_memory`` is SDK-only.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+SDK_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SDK_ROOT)
+
+from ai_agent import (  # noqa: E402
+    AgentClient,
+    AgentClientError,
+    LatencyHistogram,
+    PoolConfig,
+    TaskSubmitParams,
+)
+from stub_server import StubConfig, StubServer  # noqa: E402
+
+# Share of the mixed workload taken by each operation
+WORKLOAD = (
+    ("get_task", 0.5),
+    ("get_agent", 0.2),
+    ("list_tasks", 0.1),
+    ("submit_task", 0.1),
+    ("health", 0.1),
+)
+
+
+def _params(index: int) -> TaskSubmitParams:
+    return TaskSubmitParams(name=f"bench-{index}", type="bench", payload={"n": index})
+
+
+def _operations(
+    client: AgentClient, server: StubServer
+) -> Dict[str, Callable[[], Awaitable[Any]]]:
+    task_ids = server.task_ids
+    agent_ids = server.agent_ids
+    counter = iter(range(sys.maxsize))
+
+    return {
+        "get_task": lambda: client.tasks.get(random.choice(task_ids)),
+        "get_agent": lambda: client.agents.get(random.choice(agent_ids)),
+        "list_tasks": lambda: client.tasks.list(page=random.randint(1, 10), limit=10),
+        "submit_task": lambda: client.tasks.submit(_params(next(counter))),
+        "health": client.health,
+    }
+
+
+async def run_load(
+    client: AgentClient, server: StubServer, duration: float, concurrency: int
+) -> Dict[str, Any]:
+    """Drive the mixed workload from ``concurrency`` workers for ``duration`` s"""
+    operations = _operations(client, server)
+    names = [name for name, _ in WORKLOAD]
+    weights = [weight for _, weight in WORKLOAD]
+
+    overall = LatencyHistogram()
+    by_operation = {name: LatencyHistogram() for name in names}
+    errors: Dict[str, int] = {}
+    stop_at = time.perf_counter() + duration
+
+    async def worker() -> None:
+        while time.perf_counter() < stop_at:
+            name = random.choices(names, weights)[0]
+            start = time.perf_counter()
+            try:
+                await operations[name]()
+            except AgentClientError as error:
+                errors[error.code] = errors.get(error.code, 0) + 1
+            elapsed = (time.perf_counter() - start) * 1000
+            overall.record(elapsed)
+            by_operation[name].record(elapsed)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+
+    failed = sum(errors.values())
+    return {
+        "total_requests": overall.count,
+        "successful_requests": overall.count - failed,
+        "failed_requests": failed,
+        "error_rate": _round(failed / overall.count * 100 if overall.count else 0.0),
+        "response_time": _latency(overall),
+        "throughput": {"value": _round(overall.count / elapsed), "unit": "req/sec"},
+        "errors": errors,
+        "operations": {
+            name: {"count": histogram.count, **_latency(histogram)}
+            for name, histogram in by_operation.items()
+        },
+    }
+
+
+async def measure_in_flight_memory(
+    client: AgentClient, server: StubServer, count: int
+) -> Dict[str, Any]:
+    """SDK memory held by ``count`` concurrent wait_for_completion calls"""
+    task_duration = server.config.task_duration
+    # Long enough that every wait is still pending when measured
+    server.config.task_duration = max(task_duration, 2000.0)
+    try:
+        tasks = await client.tasks.submit_batch([_params(i) for i in range(count)])
+        task_ids = [task.id for task in tasks]
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            waiter = asyncio.ensure_future(client.tasks.wait_for_all(task_ids))
+            # Let every wait subscribe and the first poll go out
+            await asyncio.sleep(0.2)
+            during = tracemalloc.get_traced_memory()[0]
+            started = time.perf_counter()
+            await waiter
+            drained = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    finally:
+        server.config.task_duration = task_duration
+
+    in_flight = (during - before) / (1024 * 1024)
+    return {
+        "tasks": count,
+        "in_flight_mb": _round(in_flight),
+        "per_1k_in_flight_mb": _round(in_flight * 1000 / count),
+        "peak_mb": _round((peak - before) / (1024 * 1024)),
+        "drain_seconds": _round(drained),
+    }
+
+
+async def measure_batch_scaling(
+    client: AgentClient, sizes: List[int]
+) -> List[Dict[str, Any]]:
+    """Time submit_batch and wait_for_all at increasing batch sizes"""
+    results = []
+    for size in sizes:
+        start = time.perf_counter()
+        tasks = await client.tasks.submit_batch([_params(i) for i in range(size)])
+        submitted = time.perf_counter() - start
+
+        start = time.perf_counter()
+        await client.tasks.wait_for_all([task.id for task in tasks])
+        waited = time.perf_counter() - start
+
+        results.append(
+            {
+                "tasks": size,
+                "submit_seconds": _round(submitted),
+                "submit_tasks_per_second": _round(size / submitted),
+                "wait_seconds": _round(waited),
+                "wait_tasks_per_second": _round(size / waited),
+            }
+        )
+    return results
+
+
+async def measure_result_streaming(
+    client: AgentClient, server: StubServer, items: int
+) -> Dict[str, Any]:
+    """Peak SDK memory reading a large result whole, item by item and spooled"""
+    task_id = server.large_result(items)
+
+    async def whole() -> int:
+        result = await client.tasks.get_result(task_id)
+        return len(result.output)
+
+    async def streamed() -> int:
+        count = 0
+        async for _ in client.tasks.iter_result_items(task_id):
+            count += 1
+        return count
+
+    async def spooled() -> int:
+        buffer = await client.tasks.download_result(task_id, max_memory=1024 * 1024)
+        with buffer:
+            return sum(1 for _ in buffer.iter_items())
+
+    results: Dict[str, Any] = {"items": items}
+    readers = (
+        ("get_result", whole),
+        ("iter_result_items", streamed),
+        ("download_result", spooled),
+    )
+    for name, read in readers:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            start = time.perf_counter()
+            count = await read()
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        results[name] = {
+            "items": count,
+            "seconds": _round(elapsed),
+            "peak_mb": _round(peak / (1024 * 1024)),
+        }
+    return results
+
+
+def _latency(histogram: LatencyHistogram) -> Dict[str, Any]:
+    return {
+        "p50": _round(histogram.percentile(50)),
+        "p95": _round(histogram.percentile(95)),
+        "p99": _round(histogram.percentile(99)),
+        "max": _round(histogram.max),
+        "unit": "ms",
+    }
+
+
+def _round(value: float) -> float:
+    return round(value, 2)
+
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, KiB elsewhere
+    return _round(rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    server = StubServer(
+        StubConfig(
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            task_duration=args.task_duration,
+        )
+    )
+    await server.start()
+    server.seed(agents=100, tasks=1000)
+
+    client = AgentClient(
+        server.url,
+        "benchmark",
+        serializer=args.serializer,
+        pool_config=PoolConfig(max_connections=args.connections),
+    )
+    try:
+        await client.initialize()
+        # Warm up connections and per-endpoint state
+        await run_load(client, server, min(1.0, args.duration), args.concurrency)
+
+        results = await run_load(client, server, args.duration, args.concurrency)
+        scenarios: Dict[str, Any] = {}
+        if args.in_flight:
+            scenarios["in_flight_memory"] = await measure_in_flight_memory(
+                client, server, args.in_flight
+            )
+        if args.batch_sizes:
+            scenarios["batch_scaling"] = await measure_batch_scaling(
+                client, args.batch_sizes
+            )
+        if args.result_items:
+            scenarios["result_streaming"] = await measure_result_streaming(
+                client, server, args.result_items
+            )
+
+        metrics = client.get_metrics()
+        results.update(
+            {
+                "memory": _peak_rss_mb(),
+                "connections": metrics.connections_created,
+                "retry_attempts": metrics.retry_attempts,
+                "server_requests": server.requests,
+                "injected_errors": server.injected_errors,
+                "scenarios": scenarios,
+            }
+        )
+    finally:
+        await client.close()
+        await server.stop()
+
+    results["metadata"] = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "serializer": client.serializer.name,
+        "config": {
+            "duration": args.duration,
+            "concurrency": args.concurrency,
+            "connections": args.connections,
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "error_rate": args.error_rate,
+            "task_duration": args.task_duration,
+        },
+    }
+    return results
+
+
+def to_baseline(results: Dict[str, Any], args: argparse.Namespace) -> Dict[str, Any]:
+    """Wrap results as a baseline file compare.js can compare against"""
+    keys = (
+        "total_requests",
+        "successful_requests",
+        "failed_requests",
+        "error_rate",
+        "response_time",
+        "throughput",
+    )
+    return {
+        "metadata": {
+            "version": "1.0.0",
+            "timestamp": results["metadata"]["timestamp"],
+            "environment": "python-sdk-stub",
+            "description": "Python SDK against the in-process stub server",
+            "config": results["metadata"]["config"],
+        },
+        "load_test_baseline": {
+            "phase": "python_sdk_stub",
+            "duration_seconds": args.duration,
+            "virtual_users_max": args.concurrency,
+            "results": {key: results[key] for key in keys},
+        },
+        "scenario_results": results["scenarios"],
+    }
+
+
+def _sizes(value: str) -> List[int]:
+    return [int(size) for size in value.split(",") if size]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--concurrency", type=int, default=50, help="concurrent workers")
+    parser.add_argument("--connections", type=int, default=50, help="pool size")
+    parser.add_argument("--latency", type=float, default=1.0, help="stub latency (ms)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="stub jitter (ms)")
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="fraction of stub 503s"
+    )
+    parser.add_argument(
+        "--task-duration", type=float, default=100.0, help="stub task runtime (ms)"
+    )
+    parser.add_argument(
+        "--in-flight", type=int, default=1000, help="task waits for the memory scenario"
+    )
+    parser.add_argument(
+        "--batch-sizes", type=_sizes, default=[100, 1000, 5000], help="e.g. 100,1000"
+    )
+    parser.add_argument(
+        "--result-items", type=int, default=100000, help="records in the large result"
+    )
+    parser.add_argument("--serializer", default="auto")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline-out", help="also write the results as a baseline")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    if args.baseline_out:
+        with open(args.baseline_out, "w", encoding="utf-8") as fh:
+            json.dump(to_baseline(results, args), fh, indent=2)
+            fh.write("\n")
+
+    summary: Tuple[Any, ...] = (
+        results["throughput"]["value"],
+        results["response_time"]["p50"],
+        results["response_time"]["p99"],
+        results["error_rate"],
+    )
+    print(
+        "%.0f req/s, p50 %.2f ms, p99 %.2f ms, %.2f%% errors" % summary,
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
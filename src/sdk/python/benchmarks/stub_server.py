@@ -0,0 +1,281 @@
+"""
+In-process stub of the orchestrator API for SDK benchmarks
+
+Implements ``/health``, ``/agents`` and ``/tasks`` (including the bulk,
+``ids`` batch and result routes) in memory, with configurable latency and
+error injection. Tasks complete ``task_duration`` ms after they are
+submitted.
+"""
+
+import asyncio
+import itertools
+import json
+import random
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+
+class StubConfig:
+    """Stub server behaviour"""
+
+    def __init__(
+        self,
+        latency: float = 1.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        task_duration: float = 100.0,
+        payload_size: int = 256,
+    ):
+        # Added to every response (ms), plus up to ``jitter`` ms at random
+        self.latency = latency
+        self.jitter = jitter
+        # Fraction of requests answered with a 503
+        self.error_rate = error_rate
+        # Time (ms) from submit until a task reports COMPLETED
+        self.task_duration = task_duration
+        # Size (bytes) of the text in each completed task's result
+        self.payload_size = payload_size
+
+
+class StubServer:
+    """Orchestrator API stub running on the current event loop"""
+
+    def __init__(self, config: Optional[StubConfig] = None, host: str = "127.0.0.1"):
+        self.config = config or StubConfig()
+        self.host = host
+        self.port: Optional[int] = None
+        self.requests = 0
+        self.injected_errors = 0
+
+        self._agents: Dict[str, Dict[str, Any]] = {}
+        self._tasks: Dict[str, Dict[str, Any]] = {}
+        self._ids = itertools.count(1)
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        app.router.add_get("/health", self.health)
+        app.router.add_get("/agents", self.list_agents)
+        app.router.add_post("/agents", self.create_agent)
+        app.router.add_get("/agents/{id}", self.get_agent)
+        app.router.add_put("/agents/{id}", self.update_agent)
+        app.router.add_delete("/agents/{id}", self.delete_agent)
+        # No event stream, clients fall back to polling
+        app.router.add_get("/tasks/events", self.not_found)
+        app.router.add_get("/tasks", self.list_tasks)
+        app.router.add_post("/tasks", self.submit_task)
+        app.router.add_post("/tasks/batch", self.submit_batch)
+        app.router.add_get("/tasks/{id}", self.get_task)
+        app.router.add_get("/tasks/{id}/result", self.get_result)
+        return app
+
+    async def start(self, port: int = 0) -> "StubServer":
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        return self
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def seed(self, agents: int = 0, tasks: int = 0) -> None:
+        """Create agents and already-completed tasks to read back"""
+        for _ in range(agents):
+            self._new_agent({"name": "agent", "type": "WORKER", "capabilities": ["bench"]})
+        for _ in range(tasks):
+            task = self._new_task({"name": "task", "type": "bench", "payload": {}})
+            task["_done_at"] = 0.0
+
+    @property
+    def agent_ids(self) -> List[str]:
+        return list(self._agents)
+
+    @property
+    def task_ids(self) -> List[str]:
+        return list(self._tasks)
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler: Any) -> web.StreamResponse:
+        self.requests += 1
+        config = self.config
+        delay = config.latency + (random.random() * config.jitter if config.jitter else 0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000.0)
+        if config.error_rate and random.random() < config.error_rate:
+            self.injected_errors += 1
+            return _error(503, "SERVICE_UNAVAILABLE", "Injected error")
+        return await handler(request)
+
+    async def health(self, request: web.Request) -> web.Response:
+        return _ok({"status": "UP", "checks": {"stub": "UP"}})
+
+    async def not_found(self, request: web.Request) -> web.Response:
+        return _error(404, "NOT_FOUND", "Not found")
+
+    async def list_agents(self, request: web.Request) -> web.Response:
+        items = list(self._agents.values())
+        return _page(request, items)
+
+    async def create_agent(self, request: web.Request) -> web.Response:
+        return _ok(self._new_agent(await request.json()), status=201)
+
+    async def get_agent(self, request: web.Request) -> web.Response:
+        agent = self._agents.get(request.match_info["id"])
+        if agent is None:
+            return _error(404, "NOT_FOUND", "Agent not found")
+        return _ok(agent)
+
+    async def update_agent(self, request: web.Request) -> web.Response:
+        agent = self._agents.get(request.match_info["id"])
+        if agent is None:
+            return _error(404, "NOT_FOUND", "Agent not found")
+        agent.update(await request.json())
+        agent["updatedAt"] = _now()
+        return _ok(agent)
+
+    async def delete_agent(self, request: web.Request) -> web.Response:
+        if self._agents.pop(request.match_info["id"], None) is None:
+            return _error(404, "NOT_FOUND", "Agent not found")
+        return _ok(None)
+
+    async def list_tasks(self, request: web.Request) -> web.Response:
+        ids = request.query.get("ids")
+        if ids:
+            items = [self._view(self._tasks[i]) for i in ids.split(",") if i in self._tasks]
+            return _ok(items)
+        return _page(request, [self._view(task) for task in self._tasks.values()])
+
+    async def submit_task(self, request: web.Request) -> web.Response:
+        return _ok(self._view(self._new_task(await request.json())), status=201)
+
+    async def submit_batch(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        results = [self._view(self._new_task(data)) for data in body["tasks"]]
+        return _ok({"results": results}, status=201)
+
+    async def get_task(self, request: web.Request) -> web.Response:
+        task = self._tasks.get(request.match_info["id"])
+        if task is None:
+            return _error(404, "NOT_FOUND", "Task not found")
+        return _ok(self._view(task))
+
+    async def get_result(self, request: web.Request) -> web.StreamResponse:
+        task = self._tasks.get(request.match_info["id"])
+        if task is None:
+            return _error(404, "NOT_FOUND", "Task not found")
+        body = task.get("_result_body") or self._result_body(self._view(task))
+        if body is None:
+            return _error(404, "NOT_FOUND", "Task has no result yet")
+        # Chunked like a server streaming a large result
+        response = web.StreamResponse(headers={"Content-Type": "application/json"})
+        response.enable_compression()
+        await response.prepare(request)
+        try:
+            for start in range(0, len(body), 64 * 1024):
+                await response.write(body[start : start + 64 * 1024])
+            await response.write_eof()
+        except ConnectionResetError:
+            # The client stopped reading early
+            pass
+        return response
+
+    def large_result(self, items: int, item_size: int = 100) -> str:
+        """Create a completed task whose output is a list of ``items`` records"""
+        task = self._new_task({"name": "large", "type": "bench", "payload": {}})
+        task.update(
+            status="COMPLETED",
+            result={
+                "output": [{"index": i, "text": "x" * item_size} for i in range(items)],
+                "completedAt": task["updatedAt"],
+            },
+        )
+        # Encoded up front so benchmarks only measure the client
+        task["_result_body"] = self._result_body(task)
+        return task["id"]
+
+    @staticmethod
+    def _result_body(task: Dict[str, Any]) -> Optional[bytes]:
+        result = task.get("result")
+        if result is None:
+            return None
+        data = {"taskId": task["id"], "status": "SUCCESS", **result}
+        return json.dumps({"success": True, "data": data}).encode()
+
+    def _new_agent(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        now = _now()
+        agent = {
+            "id": f"agent-{next(self._ids)}",
+            "name": data["name"],
+            "type": data["type"],
+            "status": "READY",
+            "capabilities": data.get("capabilities", []),
+            "createdAt": now,
+            "updatedAt": now,
+        }
+        self._agents[agent["id"]] = agent
+        return agent
+
+    def _new_task(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        now = _now()
+        task = {
+            "id": f"task-{next(self._ids)}",
+            "name": data["name"],
+            "type": data["type"],
+            "status": "RUNNING",
+            "priority": data.get("priority", "NORMAL"),
+            "payload": data.get("payload"),
+            "createdAt": now,
+            "updatedAt": now,
+            "_done_at": time.monotonic() + self.config.task_duration / 1000.0,
+        }
+        self._tasks[task["id"]] = task
+        return task
+
+    def _view(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """Public representation, completing the task once it is due"""
+        if task["status"] == "RUNNING" and time.monotonic() >= task["_done_at"]:
+            task["status"] = "COMPLETED"
+            task["updatedAt"] = _now()
+            task["result"] = {
+                "output": "x" * self.config.payload_size,
+                "completedAt": task["updatedAt"],
+            }
+        return {key: value for key, value in task.items() if not key.startswith("_")}
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
+
+
+def _ok(data: Any, status: int = 200) -> web.Response:
+    return web.json_response({"success": True, "data": data}, status=status)
+
+
+def _error(status: int, code: str, message: str) -> web.Response:
+    return web.json_response(
+        {"success": False, "error": {"code": code, "message": message}}, status=status
+    )
+
+
+def _page(request: web.Request, items: List[Dict[str, Any]]) -> web.Response:
+    page = int(request.query.get("page", 1))
+    limit = int(request.query.get("limit", 10))
+    start = (page - 1) * limit
+    return web.json_response(
+        {
+            "success": True,
+            "data": items[start : start + limit],
+            "pagination": {"page": page, "limit": limit, "total": len(items)},
+        }
+    )
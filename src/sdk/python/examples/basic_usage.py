@@ -59,17 +59,14 @@ async def example2():
         api_url="http://localhost:3000", api_key="your-api-key"
     ) as client:
         try:
-            # List all agents
-            agents_response = await client.agents.list()
-            print(f"Found {agents_response['pagination']['total']} agents")
-
-            # Check agent statuses
-            for agent_data in agents_response["data"]:
-                agent = await client.agents.get(agent_data["id"])
-                capabilities = await client.agents.get_capabilities(agent.id)
+            # Stream every agent, the next page loads while this one prints
+            count = 0
+            async for agent in client.agents.iter_all():
+                count += 1
                 print(
-                    f"{agent.name}: {agent.status} - capabilities: {', '.join(capabilities)}"
+                    f"{agent.name}: {agent.status} - capabilities: {', '.join(agent.capabilities)}"
                 )
+            print(f"Found {count} agents")
         except Exception as error:
             print(f"Error: {error}")
 
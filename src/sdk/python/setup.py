@@ -29,10 +29,12 @@ setup(
     python_requires=">=3.8",
     install_requires=[
         "aiohttp>=3.8.0",
-        "pydantic>=1.9.0",
-        "python-dateutil>=2.8.0",
     ],
     extras_require={
+        "fast": ["orjson>=3.6.0"],
+        "msgspec": ["msgspec>=0.18.0"],
+        "zstd": ["zstandard>=0.18.0"],
+        "otel": ["opentelemetry-api>=1.0.0"],
         "dev": [
             "pytest>=7.0.0",
             "pytest-asyncio>=0.18.0",
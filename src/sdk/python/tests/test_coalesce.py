@@ -0,0 +1,108 @@
+"""
+Tests for single-flight coalescing
+"""
+
+import asyncio
+import copy
+
+import pytest
+
+from ai_agent.coalesce import SingleFlight
+
+
+class Call:
+    """A call that completes when told to and records its cancellation"""
+
+    def __init__(self):
+        self.started = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.started += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return {"items": [1, 2]}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_others():
+    flight = SingleFlight()
+    call = Call()
+    first = asyncio.ensure_future(flight.do("key", call))
+    second = asyncio.ensure_future(flight.do("key", call))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    await asyncio.sleep(0)
+    call.release.set()
+
+    assert await second == {"items": [1, 2]}
+    assert first.cancelled()
+    assert not call.cancelled
+    assert call.started == 1
+    assert flight.get_stats()["coalesced"] == 1
+
+
+@pytest.mark.asyncio
+async def test_call_is_cancelled_once_every_caller_has_gone():
+    flight = SingleFlight()
+    call = Call()
+    callers = [asyncio.ensure_future(flight.do("key", call)) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    for caller in callers:
+        caller.cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert call.cancelled
+    assert flight.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_caller_after_cancellation_starts_a_new_call():
+    flight = SingleFlight()
+    call = Call()
+    abandoned = asyncio.ensure_future(flight.do("key", call))
+    await asyncio.sleep(0)
+    abandoned.cancel()
+    await asyncio.sleep(0)
+
+    fresh = asyncio.ensure_future(flight.do("key", call))
+    await asyncio.sleep(0)
+    call.release.set()
+
+    assert await fresh == {"items": [1, 2]}
+    assert call.started == 2
+    assert flight.get_stats()["calls"] == 2
+
+
+@pytest.mark.asyncio
+async def test_joined_callers_each_get_a_copy():
+    flight = SingleFlight()
+    call = Call()
+    callers = [
+        asyncio.ensure_future(flight.do("key", call, copy.deepcopy))
+        for _ in range(2)
+    ]
+    await asyncio.sleep(0)
+    call.release.set()
+
+    first, second = await asyncio.gather(*callers)
+    first["items"].append(3)
+    assert second == {"items": [1, 2]}
+
+
+@pytest.mark.asyncio
+async def test_lone_caller_is_not_copied():
+    flight = SingleFlight()
+    result = {"items": []}
+
+    async def call():
+        return result
+
+    assert await flight.do("key", call, copy.deepcopy) is result
@@ -0,0 +1,105 @@
+"""
+Tests for hedged requests
+"""
+
+import asyncio
+
+import pytest
+
+from ai_agent.hedging import HedgeConfig, Hedger
+from ai_agent.histogram import LatencyHistogram
+
+
+class Attempts:
+    """Send function whose attempts take the given times (s) and fail on None"""
+
+    def __init__(self, *durations):
+        self.durations = list(durations)
+        self.started = []
+        self.cancelled = []
+
+    async def __call__(self):
+        attempt = len(self.started)
+        self.started.append(asyncio.get_event_loop().time())
+        duration = self.durations[attempt]
+        try:
+            await asyncio.sleep(duration if duration is not None else 0)
+        except asyncio.CancelledError:
+            self.cancelled.append(attempt)
+            raise
+        if duration is None:
+            raise ConnectionError(f"attempt {attempt} failed")
+        return attempt
+
+
+def funded_hedger(**kwargs):
+    hedger = Hedger(HedgeConfig(delay=20, max_hedge_ratio=1.0, **kwargs))
+    hedger.delay_for(None)
+    return hedger
+
+
+@pytest.mark.asyncio
+async def test_fast_request_is_not_hedged():
+    hedger = funded_hedger()
+    send = Attempts(0.001)
+
+    assert await hedger.run(send, 20) == 0
+    assert len(send.started) == 1
+    assert hedger.hedged == 0
+
+
+@pytest.mark.asyncio
+async def test_hedge_waits_for_the_delay_and_cancels_the_loser():
+    hedger = funded_hedger()
+    send = Attempts(1.0, 0.001)
+
+    assert await hedger.run(send, 20) == 1
+    await asyncio.sleep(0)
+
+    assert send.started[1] - send.started[0] >= 0.015
+    assert send.cancelled == [0]
+    assert hedger.get_stats()["wins"] == 1
+    assert hedger.get_stats()["cancelled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_primary_win_cancels_the_hedge():
+    hedger = funded_hedger()
+    send = Attempts(0.04, 1.0)
+
+    assert await hedger.run(send, 20) == 0
+    await asyncio.sleep(0)
+
+    assert send.cancelled == [1]
+    assert hedger.wins == 0
+    assert hedger.hedged == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_attempt_waits_for_the_other():
+    hedger = funded_hedger()
+    send = Attempts(0.04, None)
+
+    assert await hedger.run(send, 20) == 0
+    assert send.cancelled == []
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_budget():
+    hedger = Hedger(HedgeConfig(delay=20, max_hedge_ratio=0.1))
+    hedger.delay_for(None)
+    send = Attempts(0.04)
+
+    assert await hedger.run(send, 20) == 0
+    assert len(send.started) == 1
+    assert hedger.budget_exhausted == 1
+
+
+def test_delay_follows_the_attempt_latency_percentile():
+    hedger = Hedger(HedgeConfig(min_samples=10, min_delay=5))
+    histogram = LatencyHistogram()
+
+    assert hedger.delay_for(histogram) is None
+    for _ in range(100):
+        histogram.record(50.0)
+    assert hedger.delay_for(histogram) == pytest.approx(50.0, rel=0.1)
@@ -0,0 +1,112 @@
+"""
+Tests for concurrency limiter slot hand-off
+"""
+
+import asyncio
+
+import pytest
+
+from ai_agent.errors import OverloadedError
+from ai_agent.limiter import ConcurrencyLimiter, LimiterConfig
+
+
+def hand_off_then(limiter, error):
+    """Fake wait_for that gets the slot handed over, then raises ``error``"""
+
+    async def wait_for(future, timeout):
+        limiter.release()
+        assert future.done()
+        raise error
+
+    return wait_for
+
+
+@pytest.mark.asyncio
+async def test_timed_out_waiter_does_not_hold_a_slot():
+    limiter = ConcurrencyLimiter(LimiterConfig(max_concurrency=1, queue_timeout=10))
+    await limiter.acquire()
+
+    with pytest.raises(OverloadedError):
+        await limiter.acquire()
+    limiter.release()
+
+    assert limiter.in_flight == 0
+    assert limiter.queued == 0
+    assert limiter.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_slot_handed_over_as_wait_times_out_is_kept(monkeypatch):
+    limiter = ConcurrencyLimiter(LimiterConfig(max_concurrency=1, queue_timeout=10))
+    await limiter.acquire()
+    monkeypatch.setattr(
+        "ai_agent.limiter.asyncio.wait_for",
+        hand_off_then(limiter, asyncio.TimeoutError()),
+    )
+
+    await limiter.acquire()
+
+    assert limiter.in_flight == 1
+    assert limiter.queued == 0
+    assert limiter.rejected == 0
+    limiter.release()
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_slot_handed_over_as_wait_is_cancelled_is_released(monkeypatch):
+    limiter = ConcurrencyLimiter(LimiterConfig(max_concurrency=1))
+    await limiter.acquire()
+    monkeypatch.setattr(
+        "ai_agent.limiter.asyncio.wait_for",
+        hand_off_then(limiter, asyncio.CancelledError()),
+    )
+
+    with pytest.raises(asyncio.CancelledError):
+        await limiter.acquire()
+
+    assert limiter.in_flight == 0
+    assert limiter.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_is_skipped_by_hand_off():
+    limiter = ConcurrencyLimiter(LimiterConfig(max_concurrency=1))
+    await limiter.acquire()
+    cancelled = asyncio.ensure_future(limiter.acquire())
+    waiting = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    assert limiter.queued == 1
+    limiter.release()
+
+    await asyncio.wait_for(waiting, 1)
+    assert limiter.in_flight == 1
+    assert limiter.queued == 0
+    limiter.release()
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_served_by_priority():
+    limiter = ConcurrencyLimiter(LimiterConfig(max_concurrency=1))
+    await limiter.acquire()
+    served = []
+
+    async def take(priority):
+        await limiter.acquire(priority)
+        served.append(priority)
+
+    tasks = [
+        asyncio.ensure_future(take(priority))
+        for priority in ("BULK", "NORMAL", "INTERACTIVE")
+    ]
+    await asyncio.sleep(0)
+    for _ in tasks:
+        limiter.release()
+        await asyncio.sleep(0)
+
+    await asyncio.gather(*tasks)
+    assert served == ["INTERACTIVE", "NORMAL", "BULK"]
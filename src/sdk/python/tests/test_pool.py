@@ -0,0 +1,95 @@
+"""
+Tests for connection pool slot hand-off
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from ai_agent.errors import PoolTimeoutError
+from ai_agent.pool import ConnectionPool, PoolConfig
+
+
+@pytest_asyncio.fixture
+async def pool():
+    pool = ConnectionPool("http://localhost:8080", {}, PoolConfig(max_connections=1))
+    yield pool
+    await pool.close()
+
+
+def hand_off_then(pool, slot, error):
+    """Fake wait_for that gets the slot handed over, then raises ``error``"""
+
+    async def wait_for(future, timeout):
+        pool.release(slot)
+        assert future.done()
+        raise error
+
+    return wait_for
+
+
+@pytest.mark.asyncio
+async def test_timed_out_waiter_does_not_hold_a_slot(pool):
+    slot = await pool.acquire()
+
+    with pytest.raises(PoolTimeoutError):
+        await pool.acquire(timeout=10)
+    pool.release(slot)
+
+    stats = pool.get_stats()
+    assert stats["in_use"] == 0
+    assert stats["waiting"] == 0
+    assert stats["timeouts"] == 1
+
+
+@pytest.mark.asyncio
+async def test_slot_handed_over_as_wait_times_out_is_kept(pool, monkeypatch):
+    slot = await pool.acquire()
+    monkeypatch.setattr(
+        "ai_agent.pool.asyncio.wait_for",
+        hand_off_then(pool, slot, asyncio.TimeoutError()),
+    )
+
+    handed = await pool.acquire(timeout=10)
+
+    stats = pool.get_stats()
+    assert handed.host == slot.host
+    assert stats["in_use"] == 1
+    assert stats["waited"] == 1
+    assert stats["timeouts"] == 0
+
+
+@pytest.mark.asyncio
+async def test_slot_handed_over_as_wait_is_cancelled_is_released(pool, monkeypatch):
+    slot = await pool.acquire()
+    monkeypatch.setattr(
+        "ai_agent.pool.asyncio.wait_for",
+        hand_off_then(pool, slot, asyncio.CancelledError()),
+    )
+
+    with pytest.raises(asyncio.CancelledError):
+        await pool.acquire(timeout=10)
+
+    stats = pool.get_stats()
+    assert stats["in_use"] == 0
+    assert stats["waiting"] == 0
+    assert stats["cancelled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_is_skipped_by_hand_off(pool):
+    slot = await pool.acquire()
+    cancelled = asyncio.ensure_future(pool.acquire())
+    waiting = asyncio.ensure_future(pool.acquire())
+    await asyncio.sleep(0)
+
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    pool.release(slot)
+
+    handed = await asyncio.wait_for(waiting, 1)
+    assert cancelled.cancelled()
+    assert pool.get_stats()["in_use"] == 1
+    pool.release(handed)
+    assert pool.get_stats()["in_use"] == 0
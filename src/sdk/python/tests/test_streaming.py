@@ -0,0 +1,109 @@
+"""
+Tests for incremental result parsing
+"""
+
+import json
+
+import pytest
+
+from ai_agent.streaming import (
+    RESULT_OUTPUT_PATH,
+    ItemParser,
+    LineParser,
+    item_parser,
+)
+
+DOCUMENT = json.dumps(
+    {
+        "success": True,
+        "note": 'braces } ] { [ and "quotes", \\ and : in a string',
+        "data": {
+            "output{": "a key like the target",
+            "meta": {"output": ["not", "this"]},
+            "output": [
+                1,
+                -2.5e-3,
+                "quote \" backslash \\ slash / newline \n tab \t",
+                "unicode é中\U0001f600 and escaped \\u00e9",
+                {"nested": [1, {"deep": "]"}], "empty": {}},
+                [],
+                None,
+                True,
+                123456789,
+            ],
+            "after": "ignored",
+        },
+    },
+    ensure_ascii=False,
+).encode("utf-8")
+
+EXPECTED = json.loads(DOCUMENT)["data"]["output"]
+
+
+def parse(parser, data, size):
+    items = []
+    for start in range(0, len(data), size):
+        items.extend(parser.feed(data[start : start + size]))
+    items.extend(parser.close())
+    return items
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 16, 64, len(DOCUMENT)])
+def test_items_survive_any_chunk_boundary(size):
+    assert parse(ItemParser(RESULT_OUTPUT_PATH), DOCUMENT, size) == EXPECTED
+
+
+def test_escaped_ascii_document():
+    value = "é\"\\\U0001f600"
+    document = json.dumps({"data": {"output": [value]}}).encode()
+    assert parse(ItemParser(RESULT_OUTPUT_PATH), document, 1) == [value]
+
+
+@pytest.mark.parametrize("size", [1, 2, 4])
+def test_numbers_split_across_chunks_are_not_cut_short(size):
+    document = b"[12345, 6.5e10, -0.25]"
+    assert parse(ItemParser(), document, size) == [12345, 6.5e10, -0.25]
+
+
+def test_value_that_is_not_an_array_is_returned_whole():
+    document = b'{"data": {"output": {"text": "done"}}}'
+    assert parse(ItemParser(RESULT_OUTPUT_PATH), document, 3) == [{"text": "done"}]
+
+
+def test_items_are_returned_as_they_complete():
+    parser = ItemParser(RESULT_OUTPUT_PATH)
+    assert parser.feed(b'{"data": {"output": [{"a": 1}, {"b"') == [{"a": 1}]
+    assert parser.feed(b": 2}]") == [{"b": 2}]
+    assert parser.feed(b', "rest": [1, 2, 3]}}') == []
+    assert parser.close() == []
+
+
+def test_missing_path_yields_nothing():
+    document = b'{"data": {"other": [1, 2]}}'
+    assert parse(ItemParser(RESULT_OUTPUT_PATH), document, 4) == []
+
+
+def test_truncated_document_raises():
+    parser = ItemParser(RESULT_OUTPUT_PATH)
+    parser.feed(b'{"data": {"output": [1, {"a": ')
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+@pytest.mark.parametrize("size", [1, 3, 100])
+def test_line_parser_splits_lines_across_chunks(size):
+    data = b'{"a": 1}\r\n\n{"b": "x\\ny"}\n\x1e{"c": 3}'
+    assert parse(LineParser(json.loads), data, size) == [
+        {"a": 1},
+        {"b": "x\ny"},
+        {"c": 3},
+    ]
+
+
+def test_item_parser_picks_by_content_type():
+    assert isinstance(
+        item_parser("application/x-ndjson; charset=utf-8", (), json.loads),
+        LineParser,
+    )
+    assert isinstance(item_parser("application/json", (), json.loads), ItemParser)
+    assert isinstance(item_parser(None, (), json.loads), ItemParser)